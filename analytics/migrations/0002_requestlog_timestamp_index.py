@@ -0,0 +1,18 @@
+# Generated by Django 5.1.7 on 2026-10-17 06:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0001_initial'),
+        ('servers', '0004_capability_search_vector'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='requestlog',
+            index=models.Index(fields=['timestamp'], name='analytics_r_timesta_d80d79_idx'),
+        ),
+    ]
@@ -82,6 +82,7 @@ class RequestLog(models.Model):
             models.Index(fields=['server', 'client_id']),
             models.Index(fields=['server', 'capability']),
             models.Index(fields=['server', 'is_error']),
+            models.Index(fields=['timestamp']),
         ]
 
 
@@ -2,12 +2,14 @@ from datetime import timedelta
 from collections import Counter
 from django.utils import timezone
 from django.shortcuts import get_object_or_404
-from django.db.models import Count, Avg, Sum, F, Q
+from django.db.models import Count, Avg, Sum, F, Q, Max
 from rest_framework import status, permissions, generics, views
 from rest_framework.response import Response
 from drf_spectacular.utils import extend_schema, OpenApiParameter
 from drf_spectacular.types import OpenApiTypes
 
+from common.conditional import conditional_response, make_etag, set_validators
+from common.pagination import EstimatedCountPagination
 from servers.models import Server
 from servers.views import IsOwnerOrReadOnly
 from discovery.models import ServerUsage
@@ -499,6 +501,8 @@ class RequestLogListView(generics.ListAPIView):
     """
     serializer_class = RequestLogSerializer
     permission_classes = [permissions.IsAuthenticated, IsOwnerOrReadOnly]
+    pagination_class = EstimatedCountPagination
+    keyset_ordering = ('-timestamp', 'id')
 
     def get_queryset(self):
         server_id = self.kwargs.get('server_id')
@@ -507,7 +511,7 @@ class RequestLogListView(generics.ListAPIView):
         # Check if the user is the server owner
         self.check_object_permissions(self.request, server)
 
-        return RequestLog.objects.filter(server=server).order_by('-timestamp')
+        return RequestLog.objects.filter(server=server).order_by('-timestamp', 'id')
 
 
 class RequestLogCreateView(generics.CreateAPIView):
@@ -640,4 +644,31 @@ class DailyAnalyticsListView(generics.ListAPIView):
         return ServerAnalytics.objects.filter(
             server=server,
             date__gte=start_date
-        ).order_by('-date')
\ No newline at end of file
+        ).order_by('-date')
+
+    def list(self, request, *args, **kwargs):
+        """
+        List the server's daily analytics.
+
+        Rows are only ever added or updated in place, so the newest
+        ``updated_at`` and the row count identify the result. Conditional
+        requests are answered from them before any row is serialized.
+        """
+        queryset = self.filter_queryset(self.get_queryset())
+        validators = queryset.aggregate(last_modified=Max('updated_at'), count=Count('id'))
+        etag = make_etag(
+            validators['last_modified'], validators['count'], request.build_absolute_uri(), weak=True
+        )
+        not_modified = conditional_response(request, etag, validators['last_modified'])
+        if not_modified is not None:
+            return not_modified
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            response = self.get_paginated_response(serializer.data)
+        else:
+            serializer = self.get_serializer(queryset, many=True)
+            response = Response(serializer.data)
+
+        return set_validators(response, etag, validators['last_modified'])
\ No newline at end of file
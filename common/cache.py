@@ -0,0 +1,150 @@
+import hashlib
+import json
+import logging
+import uuid
+from django.core.cache import cache
+from django.db import transaction
+from common.redis_client import get_redis_connection
+
+logger = logging.getLogger('mcp_nexus')
+
+# Version group bumped whenever servers, capabilities or verification change
+CATALOG_VERSION = 'catalog'
+
+
+def user_version(user_id):
+    """Name of the version group for data derived from one user's activity."""
+    return f'user:{user_id}'
+
+
+def _version_key(name):
+    return f'cache_version:{name}'
+
+
+def get_version_token(*names):
+    """
+    Get the combined version token for one or more version groups.
+
+    A group that has never been bumped (or whose token was evicted) is given
+    a fresh random token, which also invalidates anything cached under it.
+    """
+    keys = [_version_key(name) for name in names]
+    tokens = cache.get_many(keys)
+
+    for key in keys:
+        if key not in tokens:
+            cache.add(key, uuid.uuid4().hex, None)
+            tokens[key] = cache.get(key)
+
+    return '.'.join(str(tokens[key]) for key in keys)
+
+
+def current_version_token(*names):
+    """
+    Get the combined version token like ``get_version_token``, or None if
+    the cache is unavailable.
+
+    For tokens that only enable an optimization, such as an ETag, so a
+    cache outage degrades to full responses instead of failing the request.
+    """
+    try:
+        return get_version_token(*names)
+    except Exception as e:
+        logger.warning(f"Could not read cache version {', '.join(names)}: {str(e)}")
+        return None
+
+
+def bump_version(name):
+    """
+    Invalidate every cache entry that depends on a version group.
+
+    The bump is deferred until the current transaction commits so a
+    concurrent request cannot re-cache data that is about to change.
+    """
+    def _bump():
+        try:
+            cache.set(_version_key(name), uuid.uuid4().hex, None)
+        except Exception as e:
+            logger.error(f"Error bumping cache version {name}: {str(e)}", exc_info=True)
+
+    transaction.on_commit(_bump)
+
+
+class VersionedCache:
+    """
+    Cache for computed response payloads.
+
+    Keys are derived from normalized request parameters and the current
+    tokens of the version groups the cached data depends on, so invalidation
+    is a single version bump and stale entries simply expire. Hits and misses
+    are counted in Redis for TTL sizing. Cache failures are logged and
+    treated as misses; they never fail the request.
+    """
+
+    def __init__(self, namespace, timeout, versions=(CATALOG_VERSION,)):
+        self.namespace = namespace
+        self.timeout = timeout
+        self.versions = tuple(versions)
+
+    def make_key(self, params, versions=()):
+        """Build the cache key for a set of normalized parameters."""
+        token = get_version_token(*self.versions, *versions)
+        digest = hashlib.sha1(
+            json.dumps(params, sort_keys=True, default=str).encode('utf-8')
+        ).hexdigest()
+        version_digest = hashlib.sha1(token.encode('utf-8')).hexdigest()[:12]
+        return f'{self.namespace}:{version_digest}:{digest}'
+
+    def get(self, params, versions=()):
+        """Return the cached payload for ``params``, or None on a miss."""
+        try:
+            value = cache.get(self.make_key(params, versions))
+        except Exception as e:
+            logger.warning(f"Cache lookup failed for {self.namespace}: {str(e)}")
+            return None
+
+        self._record('hits' if value is not None else 'misses')
+        return value
+
+    def has(self, params, versions=()):
+        """Check for a cached payload without counting a hit or miss."""
+        try:
+            return cache.has_key(self.make_key(params, versions))
+        except Exception as e:
+            logger.warning(f"Cache lookup failed for {self.namespace}: {str(e)}")
+            return False
+
+    def set(self, params, value, versions=()):
+        """Store a payload for ``params``."""
+        try:
+            cache.set(self.make_key(params, versions), value, self.timeout)
+        except Exception as e:
+            logger.warning(f"Cache store failed for {self.namespace}: {str(e)}")
+
+    def stats(self):
+        """Get hit/miss counters for this cache."""
+        connection = get_redis_connection()
+        hits, misses = connection.mget(self._stats_key('hits'), self._stats_key('misses'))
+        hits = int(hits or 0)
+        misses = int(misses or 0)
+        total = hits + misses
+        return {
+            'namespace': self.namespace,
+            'timeout': self.timeout,
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': (hits / total) if total > 0 else 0,
+        }
+
+    def reset_stats(self):
+        """Reset hit/miss counters."""
+        get_redis_connection().delete(self._stats_key('hits'), self._stats_key('misses'))
+
+    def _stats_key(self, counter):
+        return f'cache_stats:{self.namespace}:{counter}'
+
+    def _record(self, counter):
+        try:
+            get_redis_connection().incr(self._stats_key(counter))
+        except Exception as e:
+            logger.warning(f"Could not record cache {counter} for {self.namespace}: {str(e)}")
@@ -0,0 +1,45 @@
+import hashlib
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+
+def make_etag(*parts, weak=False):
+    """
+    Build an ETag from the values a representation depends on.
+
+    Strong ETags promise a byte-identical body; weak ones only an
+    equivalent one, which is what paginated lists can guarantee.
+    """
+    digest = hashlib.sha1(
+        '|'.join(str(part) for part in parts).encode('utf-8')
+    ).hexdigest()
+    etag = quote_etag(digest)
+    return f'W/{etag}' if weak else etag
+
+
+def set_validators(response, etag=None, last_modified=None):
+    """Add ``ETag`` and ``Last-Modified`` headers to a response."""
+    if etag:
+        response['ETag'] = etag
+    if last_modified:
+        response['Last-Modified'] = http_date(last_modified.timestamp())
+    return response
+
+
+def conditional_response(request, etag=None, last_modified=None):
+    """
+    Answer a conditional GET from its validators alone.
+
+    Returns a 304 (or 412 for a failed ``If-Match``) carrying the
+    validators when the client's copy is current, otherwise None so the
+    view goes on to build the body. ``If-None-Match`` takes precedence
+    over ``If-Modified-Since``, as the HTTP spec requires.
+    """
+    response = get_conditional_response(
+        getattr(request, '_request', request),
+        etag=etag,
+        last_modified=int(last_modified.timestamp()) if last_modified else None
+    )
+    if response is None:
+        return None
+    return set_validators(response, etag, last_modified)
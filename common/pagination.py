@@ -1,6 +1,101 @@
-from rest_framework.pagination import PageNumberPagination
+import base64
+import json
+from django.core.paginator import EmptyPage, Page, PageNotAnInteger, Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination, _positive_int
 from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
 from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+
+def estimate_count(queryset):
+    """
+    Get the query planner's row estimate for ``queryset`` without running it.
+
+    Unfiltered querysets use the table's ``pg_class.reltuples`` statistic;
+    others use the top-level row estimate of ``EXPLAIN``. Returns None when
+    the table has never been analyzed or the estimate is unavailable.
+    """
+    connection = connections[queryset.db]
+    try:
+        with connection.cursor() as cursor:
+            if not queryset.query.where and not queryset.query.distinct:
+                cursor.execute(
+                    "SELECT reltuples FROM pg_class WHERE oid = %s::regclass",
+                    [queryset.model._meta.db_table]
+                )
+                row = cursor.fetchone()
+                estimate = row[0] if row else None
+            else:
+                sql, params = queryset.order_by().query.sql_with_params()
+                cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+                plan = cursor.fetchone()[0]
+                if isinstance(plan, str):
+                    plan = json.loads(plan)
+                estimate = plan[0]['Plan']['Plan Rows']
+    except Exception:
+        return None
+
+    # reltuples is -1 (or 0 on older servers) before the first ANALYZE
+    if estimate is None or estimate <= 0:
+        return None
+    return int(estimate)
+
+
+class EstimatedCountPage(Page):
+    """Page whose next page is known from its own size when the count is estimated."""
+
+    def has_next(self):
+        if self.paginator.count_is_approximate:
+            return len(self.object_list) == self.paginator.per_page
+        return super().has_next()
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator that uses the planner's estimate instead of COUNT(*) for
+    results larger than ``settings.PAGINATION_ESTIMATE_THRESHOLD`` rows.
+
+    ``count_is_approximate`` tells whether ``count`` (and so ``num_pages``)
+    is an estimate. Pages are then sliced without reference to the count,
+    so no rows become unreachable when the estimate is too low.
+    """
+    count_is_approximate = False
+
+    @cached_property
+    def count(self):
+        estimate = estimate_count(self.object_list)
+        if estimate is not None and estimate > settings.PAGINATION_ESTIMATE_THRESHOLD:
+            self.count_is_approximate = True
+            return estimate
+        return super().count
+
+    def validate_number(self, number):
+        # Evaluating the count first decides whether it is approximate
+        if not (self.count and self.count_is_approximate):
+            return super().validate_number(number)
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger(self.error_messages['invalid_page'])
+        if number < 1:
+            raise EmptyPage(self.error_messages['min_page'])
+        return number
+
+    def page(self, number):
+        number = self.validate_number(number)
+        if not self.count_is_approximate:
+            return super().page(number)
+        bottom = (number - 1) * self.per_page
+        return self._get_page(self.object_list[bottom:bottom + self.per_page], number, self)
+
+    def _get_page(self, *args, **kwargs):
+        return EstimatedCountPage(*args, **kwargs)
+
 
 class StandardResultsSetPagination(PageNumberPagination):
     """
@@ -38,4 +133,240 @@ class StandardResultsSetPagination(PageNumberPagination):
                 'next_page_url': self.get_next_link(),
                 'prev_page_url': self.get_previous_link(),
             }
-        })
\ No newline at end of file
+        })
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor (keyset) pagination for API results.
+
+    Pages are selected with a WHERE clause on the ordering columns instead of
+    an OFFSET, so every page costs the same however deep the client goes and
+    rows are never skipped or repeated when data changes between requests.
+
+    The ordering comes from the view's ``get_keyset_ordering()`` method or
+    ``keyset_ordering`` attribute (or ``ordering`` on this class). It must
+    end with a unique column, may refer to annotations, and must not contain
+    nullable or related fields.
+
+    Totals are not counted unless the client asks for them with
+    ``?include_total=true``.
+    """
+    page_size = getattr(settings, 'DEFAULT_PAGE_SIZE', 20)
+    page_size_query_param = 'limit'
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    include_total_query_param = 'include_total'
+    estimates_total = False
+    ordering = ('-created_at', 'id')
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.per_page = self.get_page_size(request)
+        ordering = self.get_ordering(view)
+
+        self.total = None
+        self.total_is_approximate = False
+        if request.query_params.get(self.include_total_query_param, '').lower() in ('1', 'true'):
+            self.total, self.total_is_approximate = self.get_total(queryset)
+
+        queryset = queryset.order_by(*ordering)
+        position = self.decode_cursor(request)
+        if position is not None:
+            if len(position) != len(ordering):
+                raise NotFound(self.invalid_cursor_message)
+            try:
+                queryset = queryset.filter(self.get_position_filter(ordering, position))
+            except (TypeError, ValueError, ValidationError):
+                # A cursor from a different ordering or a tampered one
+                raise NotFound(self.invalid_cursor_message)
+
+        # Fetch one extra row to find out whether there is a next page
+        rows = list(queryset[:self.per_page + 1])
+        self.has_next = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+
+        self.next_position = None
+        if self.has_next:
+            self.next_position = [
+                getattr(rows[-1], field.lstrip('-')) for field in ordering
+            ]
+
+        return rows
+
+    def get_total(self, queryset):
+        """Count ``queryset``; returns ``(total, is_approximate)``."""
+        return queryset.count(), False
+
+    def get_ordering(self, view):
+        if hasattr(view, 'get_keyset_ordering'):
+            return tuple(view.get_keyset_ordering())
+        return tuple(getattr(view, 'keyset_ordering', None) or self.ordering)
+
+    def get_page_size(self, request):
+        if self.page_size_query_param:
+            try:
+                return _positive_int(
+                    request.query_params[self.page_size_query_param],
+                    strict=True,
+                    cutoff=self.max_page_size
+                )
+            except (KeyError, ValueError):
+                pass
+        return self.page_size
+
+    def get_position_filter(self, ordering, position):
+        """
+        Build the filter selecting rows after ``position``.
+
+        For ordering (a, b, c) this is a > x OR (a = x AND b > y) OR
+        (a = x AND b = y AND c > z), with < for descending columns.
+        """
+        condition = Q()
+        for index, field in enumerate(ordering):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            term = Q(**{f'{name}__{lookup}': position[index]})
+            for previous, value in zip(ordering[:index], position[:index]):
+                term &= Q(**{previous.lstrip('-'): value})
+            condition |= term
+        return condition
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            position = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')).decode('utf-8'))
+        except (TypeError, ValueError, UnicodeError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(position, list):
+            raise NotFound(self.invalid_cursor_message)
+        return position
+
+    def encode_cursor(self, position):
+        # str() keeps full datetime precision, unlike DjangoJSONEncoder
+        data = json.dumps(position, default=str, separators=(',', ':'))
+        return base64.urlsafe_b64encode(data.encode('utf-8')).decode('ascii')
+
+    def get_next_cursor(self):
+        if self.next_position is None:
+            return None
+        return self.encode_cursor(self.next_position)
+
+    def get_next_link(self):
+        cursor = self.get_next_cursor()
+        if cursor is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def get_paginated_response(self, data):
+        """
+        Return a paginated response in the format:
+        {
+            "data": [...],
+            "pagination": {
+                "per_page": 20,
+                "next_cursor": "WzAuNSwiNGQ...",
+                "next_page_url": "https://api.example.com/items?cursor=WzAuNSwiNGQ..."
+            }
+        }
+
+        with ``"total"`` added to ``pagination`` when it was requested, and
+        ``"total_is_approximate"`` when the total may be an estimate.
+        """
+        pagination = {
+            'per_page': self.per_page,
+            'next_cursor': self.get_next_cursor(),
+            'next_page_url': self.get_next_link(),
+        }
+        if self.total is not None:
+            pagination['total'] = self.total
+            if self.estimates_total:
+                pagination['total_is_approximate'] = self.total_is_approximate
+        return Response({'data': data, 'pagination': pagination})
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                'name': self.cursor_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Opaque cursor from next_cursor of the previous page',
+                'schema': {'type': 'string'},
+            },
+            {
+                'name': self.page_size_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Results per page',
+                'schema': {'type': 'integer'},
+            },
+            {
+                'name': self.include_total_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Also count all matching results',
+                'schema': {'type': 'boolean'},
+            },
+        ]
+
+
+class OptionalKeysetPagination(StandardResultsSetPagination):
+    """
+    Page-number pagination that clients can switch to keyset pagination.
+
+    Requests with a ``cursor`` parameter (empty for the first page) are
+    paginated by KeysetPagination, which skips the COUNT(*) and the OFFSET.
+    Other requests keep the page-number behaviour, so existing clients are
+    unaffected. Views configure the keyset ordering as for KeysetPagination.
+    """
+    keyset_class = KeysetPagination
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = None
+        if self.keyset_class.cursor_query_param in request.query_params:
+            self.keyset = self.keyset_class()
+            return self.keyset.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def get_schema_operation_parameters(self, view):
+        parameters = super().get_schema_operation_parameters(view)
+        names = {parameter['name'] for parameter in parameters}
+        return parameters + [
+            parameter for parameter in self.keyset_class().get_schema_operation_parameters(view)
+            if parameter['name'] not in names
+        ]
+
+
+class EstimatedKeysetPagination(KeysetPagination):
+    """Keyset pagination whose optional totals are estimated for large results."""
+    estimates_total = True
+
+    def get_total(self, queryset):
+        paginator = EstimatedCountPaginator(queryset, self.per_page)
+        return paginator.count, paginator.count_is_approximate
+
+
+class EstimatedCountPagination(OptionalKeysetPagination):
+    """
+    OptionalKeysetPagination for very large tables.
+
+    Totals above ``settings.PAGINATION_ESTIMATE_THRESHOLD`` rows come from
+    the query planner instead of COUNT(*), and ``total_is_approximate`` in
+    the pagination block says whether that happened.
+    """
+    django_paginator_class = EstimatedCountPaginator
+    keyset_class = EstimatedKeysetPagination
+
+    def get_paginated_response(self, data):
+        response = super().get_paginated_response(data)
+        if self.keyset is None:
+            response.data['pagination']['total_is_approximate'] = self.page.paginator.count_is_approximate
+        return response
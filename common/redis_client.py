@@ -0,0 +1,16 @@
+import redis
+from django.conf import settings
+
+_connection = None
+
+def get_redis_connection():
+    """
+    Get a shared Redis client for the cache database.
+
+    Used for primitives the Django cache API does not expose (INCR on missing
+    keys, lists, hashes). Keys written here are not prefixed by Django.
+    """
+    global _connection
+    if _connection is None:
+        _connection = redis.Redis.from_url(settings.REDIS_URL)
+    return _connection
@@ -0,0 +1,80 @@
+from contextlib import contextmanager
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test.utils import CaptureQueriesContext
+
+
+def _format_queries(context):
+    return '\n'.join(
+        f"{index}. {query['sql']}" for index, query in enumerate(context.captured_queries, start=1)
+    )
+
+
+@contextmanager
+def assert_query_budget(budget, using=DEFAULT_DB_ALIAS):
+    """
+    Fail if the block runs more than ``budget`` SQL queries.
+
+    The failure message lists every captured query, so the N+1 that broke
+    the budget can be found from the CI log alone.
+    """
+    with CaptureQueriesContext(connections[using]) as context:
+        yield context
+
+    executed = len(context.captured_queries)
+    if executed > budget:
+        raise AssertionError(
+            f"{executed} queries executed, budget is {budget}:\n{_format_queries(context)}"
+        )
+
+
+def assert_constant_queries(create_rows, request, sizes=(1, 10), budget=None, using=DEFAULT_DB_ALIAS):
+    """
+    Fail if the queries ``request`` makes grow with the number of rows.
+
+    For each entry in ``sizes``, ``create_rows(size)`` adds that many rows
+    (for example servers with capabilities and parameters) and ``request()``
+    is called and its queries are counted. The counts must be equal for all
+    sizes and, if given, within ``budget``. Returns the query count.
+    """
+    counts = []
+    for size in sizes:
+        create_rows(size)
+        with CaptureQueriesContext(connections[using]) as context:
+            request()
+        counts.append((size, len(context.captured_queries), context))
+
+    first_size, first_count, _ = counts[0]
+    for size, count, context in counts[1:]:
+        if count != first_count:
+            raise AssertionError(
+                f"Query count grows with rows: {first_count} queries for {first_size}, "
+                f"{count} for {size}:\n{_format_queries(context)}"
+            )
+
+    if budget is not None and first_count > budget:
+        raise AssertionError(
+            f"{first_count} queries executed, budget is {budget}:\n{_format_queries(counts[-1][2])}"
+        )
+
+    return first_count
+
+
+class QueryBudgetMixin:
+    """
+    TestCase mixin exposing the query budget helpers as assertions.
+
+    ``query_budgets`` maps an endpoint name to its budget, so budgets for an
+    app live in one place and ``assertEndpointBudget`` can look them up.
+    """
+    query_budgets = {}
+
+    def assertQueryBudget(self, budget, using=DEFAULT_DB_ALIAS):
+        return assert_query_budget(budget, using=using)
+
+    def assertConstantQueries(self, create_rows, request, sizes=(1, 10), budget=None):
+        return assert_constant_queries(create_rows, request, sizes=sizes, budget=budget)
+
+    def assertEndpointBudget(self, endpoint, create_rows, request, sizes=(1, 10)):
+        return assert_constant_queries(
+            create_rows, request, sizes=sizes, budget=self.query_budgets[endpoint]
+        )
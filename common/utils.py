@@ -1,6 +1,8 @@
 import logging
 import uuid
 import requests
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
 from django.utils import timezone
 from django.conf import settings
 from rest_framework.views import exception_handler
@@ -74,11 +76,13 @@ def custom_exception_handler(exc, context):
     
     return response
 
-def validate_mcp_server_url(url):
+def validate_mcp_server_url(url, raise_transient=False):
     """
     Validate that a URL is actually pointing to an MCP server.
     
-    Performs a basic check by requesting the server's capabilities.
+    Performs a basic check by requesting the server's capabilities. With
+    ``raise_transient``, connection errors and timeouts are raised instead
+    of reported, for callers that retry them.
     """
     try:
         # TODO: Check for MCP specific headers instead of just README.md
@@ -86,9 +90,29 @@ def validate_mcp_server_url(url):
         if response.status_code == 200:
             return True, {"message": "Server is reachable", "response_time": response.elapsed.total_seconds()}
         return False, {"error": "Website is not reachable or does not return a valid response"}
+    except (requests.ConnectionError, requests.Timeout) as e:
+        if raise_transient:
+            raise
+        return False, {"error": str(e)}
     except requests.RequestException as e:
         return False, {"error": str(e)}
 
+def broadcast_status_update(data):
+    """
+    Send an update to every client connected to the status WebSocket.
+
+    Delivered through the ``status_updates`` channel group, which
+    common.consumers.StatusConsumer relays as a ``status_update`` message.
+    Failures are logged; a missed update must never fail the caller.
+    """
+    try:
+        async_to_sync(get_channel_layer().group_send)(
+            'status_updates',
+            {'type': 'status_update', 'data': data}
+        )
+    except Exception as e:
+        logger.warning(f"Could not broadcast status update: {str(e)}")
+
 def check_server_health(url):
     """
     Check if an MCP server is healthy and responding.
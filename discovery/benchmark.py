@@ -0,0 +1,371 @@
+import logging
+import random
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import timedelta
+import numpy as np
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+from analytics.models import RequestLog
+from common.cache import CATALOG_VERSION, bump_version, user_version
+from servers.models import CapabilityParameter, Server, ServerCapability, ServerRating
+from .models import ServerUsage, UserPreference
+
+logger = logging.getLogger('mcp_nexus')
+
+User = get_user_model()
+
+# Synthetic rows are recognizable by these prefixes so they can be removed
+SYNTHETIC_SLUG_PREFIX = 'synthetic-'
+SYNTHETIC_EMAIL_DOMAIN = 'synthetic.example.com'
+
+# Vocabulary shared by the generator and the benchmark query mix, so
+# benchmark queries match the generated catalog
+DOMAINS = [
+    'weather', 'github', 'slack', 'postgres', 'calendar', 'email', 'search',
+    'maps', 'finance', 'translation', 'filesystem', 'browser', 'jira', 'notion',
+    'spotify', 'kubernetes', 'docker', 'stripe', 'twitter', 'youtube', 'pdf',
+    'image', 'audio', 'vector', 'crm', 'analytics', 'logging', 'monitoring',
+]
+ACTIONS = [
+    'fetch', 'search', 'create', 'update', 'delete', 'list', 'summarize',
+    'translate', 'convert', 'query', 'upload', 'download', 'schedule', 'notify',
+]
+OBJECTS = [
+    'forecast', 'issue', 'message', 'table', 'event', 'document', 'file',
+    'page', 'record', 'invoice', 'channel', 'repository', 'container', 'playlist',
+]
+QUALIFIERS = [
+    'fast', 'secure', 'realtime', 'batch', 'open', 'cloud', 'local', 'smart',
+]
+PARAMETER_TYPES = ['string', 'integer', 'number', 'boolean', 'array', 'object']
+SERVER_TYPES = [choice for choice, _ in Server.SERVER_TYPE_CHOICES]
+
+
+def _uuid(rng):
+    """Draw a version 4 UUID from ``rng`` so ids are reproducible."""
+    return uuid.UUID(int=rng.getrandbits(128), version=4)
+
+
+def _zipf_weights(count, exponent=1.1):
+    """Weights for drawing ``count`` items with a long-tailed popularity."""
+    return (1.0 / np.arange(1, count + 1) ** exponent).tolist()
+
+
+@contextmanager
+def _explicit_timestamps(model, field_name):
+    """Let bulk inserts set an ``auto_now_add`` field to historical values."""
+    field = model._meta.get_field(field_name)
+    field.auto_now_add = False
+    try:
+        yield
+    finally:
+        field.auto_now_add = True
+
+
+def delete_synthetic_catalog():
+    """Remove previously generated servers and users with everything attached."""
+    servers, _ = Server.objects.filter(slug__startswith=SYNTHETIC_SLUG_PREFIX).delete()
+    users, _ = User.objects.filter(email__endswith=f'@{SYNTHETIC_EMAIL_DOMAIN}').delete()
+    return servers + users
+
+
+def generate_catalog(servers=1000, users=500, capabilities=5, parameters=3,
+                     usage=20, ratings=3, requests=50, days=60, seed=42, batch_size=5000):
+    """
+    Bulk-load a reproducible synthetic registry.
+
+    ``capabilities``, ``parameters``, ``usage``, ``ratings`` and ``requests``
+    are averages per server, capability, user, user and server respectively.
+    Server popularity follows a Zipf distribution, so usage, ratings and
+    request logs concentrate on a head of popular servers like real
+    traffic. Server rating aggregates are derived from the generated
+    ratings. The same ``seed`` always produces the same rows. Returns the
+    number of rows created per model.
+    """
+    rng = random.Random(seed)
+    now = timezone.now()
+    window = timedelta(days=days).total_seconds()
+
+    user_rows = [
+        User(
+            id=_uuid(rng),
+            email=f'user-{i}@{SYNTHETIC_EMAIL_DOMAIN}',
+            password='!',
+            is_active=True
+        )
+        for i in range(users)
+    ]
+
+    server_rows = []
+    capability_rows = []
+    parameter_rows = []
+    for i in range(servers):
+        domain = rng.choice(DOMAINS)
+        qualifier = rng.choice(QUALIFIERS)
+        obj = rng.choice(OBJECTS)
+        tags = sorted({domain, obj, *rng.sample(DOMAINS + QUALIFIERS, rng.randint(1, 4))})
+        server = Server(
+            id=_uuid(rng),
+            name=f'{qualifier.title()} {domain.title()} {obj.title()} {i}',
+            slug=f'{SYNTHETIC_SLUG_PREFIX}{i}',
+            description=(
+                f'{qualifier.title()} MCP server to {rng.choice(ACTIONS)} and '
+                f'{rng.choice(ACTIONS)} {domain} {obj}s. Works with '
+                f'{rng.choice(DOMAINS)} and {rng.choice(DOMAINS)} {rng.choice(OBJECTS)}s.'
+            ),
+            provider=f'{rng.choice(DOMAINS).title()} Labs',
+            url=f'https://{SYNTHETIC_SLUG_PREFIX}{i}.example.com/mcp',
+            types=sorted(set(rng.sample(SERVER_TYPES, rng.randint(1, 2)))),
+            tags=tags,
+            owner=rng.choice(user_rows),
+            verified=rng.random() < 0.3,
+            uptime=round(rng.uniform(95, 100), 2),
+            version=f'{rng.randint(0, 3)}.{rng.randint(0, 20)}.{rng.randint(0, 9)}',
+            is_active=rng.random() < 0.95,
+        )
+        server_rows.append(server)
+
+        capability_count = rng.randint(1, 2 * capabilities - 1) if capabilities else 0
+        for position in range(capability_count):
+            action, capability_obj = rng.choice(ACTIONS), rng.choice(OBJECTS)
+            capability = ServerCapability(
+                id=_uuid(rng),
+                server=server,
+                name=f'{action}_{domain}_{capability_obj}_{position}',
+                description=f'{action.title()} a {domain} {capability_obj} by id or by query.',
+                type=rng.choice(SERVER_TYPES),
+                examples=[f'{action} the latest {domain} {capability_obj}'],
+            )
+            capability_rows.append(capability)
+
+            for parameter_position in range(rng.randint(0, 2 * parameters)):
+                parameter_rows.append(CapabilityParameter(
+                    id=_uuid(rng),
+                    capability=capability,
+                    name=f'{rng.choice(OBJECTS)}_{parameter_position}',
+                    description=f'The {rng.choice(QUALIFIERS)} {rng.choice(OBJECTS)} to use.',
+                    type=rng.choice(PARAMETER_TYPES),
+                    required=rng.random() < 0.4,
+                ))
+
+    server_weights = _zipf_weights(len(server_rows))
+    usage_rows = []
+    for user in user_rows:
+        for server in rng.choices(server_rows, weights=server_weights, k=rng.randint(0, 2 * usage)):
+            usage_rows.append(ServerUsage(
+                id=_uuid(rng),
+                user=user,
+                server=server,
+                capability=None,
+                successful=rng.random() < 0.95,
+                response_time=round(rng.lognormvariate(4, 0.6), 2),
+                created_at=now - timedelta(seconds=rng.random() * window),
+            ))
+
+    # Each user rates a server at most once; a per-server quality skews the stars
+    quality = {server.id: rng.uniform(1, 5) for server in server_rows}
+    rating_rows = []
+    for user in user_rows:
+        rated = {
+            server.id: server
+            for server in rng.choices(server_rows, weights=server_weights, k=rng.randint(0, 2 * ratings))
+        }
+        for server in rated.values():
+            rating_rows.append(ServerRating(
+                id=_uuid(rng),
+                server=server,
+                user=user,
+                rating=min(max(round(rng.gauss(quality[server.id], 1)), 1), 5),
+                created_at=now - timedelta(seconds=rng.random() * window),
+            ))
+
+    request_rows = [
+        RequestLog(
+            id=_uuid(rng),
+            server=server,
+            client_id=f'client-{rng.randint(0, 99)}',
+            timestamp=now - timedelta(seconds=rng.random() * window),
+            status_code=200 if rng.random() < 0.97 else 500,
+            response_time_ms=round(rng.lognormvariate(4, 0.6), 2),
+        )
+        for server in rng.choices(server_rows, weights=server_weights, k=requests * len(server_rows))
+    ]
+    for row in request_rows:
+        row.is_error = row.status_code >= 500
+
+    preference_rows = [
+        UserPreference(
+            id=_uuid(rng),
+            user=user,
+            preferred_types=rng.sample(SERVER_TYPES, rng.randint(0, 2)),
+            preferred_tags=rng.sample(DOMAINS, rng.randint(0, 3)),
+        )
+        for user in user_rows
+    ]
+
+    # Usage counts follow from the generated usage records
+    usage_counts = {}
+    for row in usage_rows:
+        usage_counts[row.server.id] = usage_counts.get(row.server.id, 0) + 1
+    for server in server_rows:
+        server.usage_count = usage_counts.get(server.id, 0)
+
+    # Rating aggregates follow from the generated ratings, as
+    # ServerRating.save would have maintained them
+    for row in rating_rows:
+        server = row.server
+        server.rating_sum += row.rating
+        server.rating_count += 1
+        setattr(server, f'rating_{row.rating}_count', getattr(server, f'rating_{row.rating}_count') + 1)
+    for server in server_rows:
+        server.rating = server.rating_sum / server.rating_count if server.rating_count else 0.0
+
+    with transaction.atomic():
+        User.objects.bulk_create(user_rows, batch_size=batch_size)
+        UserPreference.objects.bulk_create(preference_rows, batch_size=batch_size)
+        Server.objects.bulk_create(server_rows, batch_size=batch_size)
+        ServerCapability.objects.bulk_create(capability_rows, batch_size=batch_size)
+        CapabilityParameter.objects.bulk_create(parameter_rows, batch_size=batch_size)
+        with _explicit_timestamps(ServerUsage, 'created_at'):
+            ServerUsage.objects.bulk_create(usage_rows, batch_size=batch_size)
+        with _explicit_timestamps(ServerRating, 'created_at'):
+            ServerRating.objects.bulk_create(rating_rows, batch_size=batch_size)
+        RequestLog.objects.bulk_create(request_rows, batch_size=batch_size)
+        # Bulk inserts skip the signals that invalidate cached results
+        bump_version(CATALOG_VERSION)
+
+    return {
+        'users': len(user_rows),
+        'servers': len(server_rows),
+        'capabilities': len(capability_rows),
+        'parameters': len(parameter_rows),
+        'usage': len(usage_rows),
+        'ratings': len(rating_rows),
+        'requests': len(request_rows),
+    }
+
+
+def build_query_mix(endpoint, count, users, seed=42, search_modes=('keyword',)):
+    """
+    Draw ``count`` reproducible query parameter sets for ``endpoint``.
+
+    Search terms are drawn with a long-tailed distribution from the
+    generator's vocabulary, so some queries repeat as they would in
+    production. Recommendation queries are spread over ``users``.
+    """
+    rng = random.Random(f'{seed}-{endpoint}')
+    terms = DOMAINS + ACTIONS + OBJECTS
+    term_weights = _zipf_weights(len(terms), exponent=0.8)
+    queries = []
+
+    for _ in range(count):
+        if endpoint == 'search':
+            params = {
+                'q': ' '.join(rng.choices(terms, weights=term_weights, k=rng.choice((1, 1, 2)))),
+                'mode': rng.choice(search_modes),
+            }
+            if rng.random() < 0.2:
+                params['type'] = rng.choice(SERVER_TYPES)
+            if rng.random() < 0.1:
+                params['verified'] = 'true'
+            if rng.random() < 0.1:
+                params['facets'] = 'type,tags,verified'
+            if rng.random() < 0.2:
+                params['page'] = 2
+            queries.append((params, None))
+        elif endpoint == 'recommend':
+            queries.append(({'limit': rng.choice((5, 10))}, rng.choice(users)))
+        elif endpoint == 'popular':
+            params = {'period': rng.choice(('day', 'week', 'month', 'all_time'))}
+            if rng.random() < 0.3:
+                params['type'] = rng.choice(SERVER_TYPES)
+            queries.append((params, None))
+        else:
+            raise ValueError(f'Unknown benchmark endpoint: {endpoint}')
+
+    return queries
+
+
+def _summary(values):
+    """Percentile summary of a list of measurements."""
+    if not values:
+        return None
+    values = np.asarray(values, dtype=np.float64)
+    return {
+        'p50': round(float(np.percentile(values, 50)), 3),
+        'p95': round(float(np.percentile(values, 95)), 3),
+        'p99': round(float(np.percentile(values, 99)), 3),
+        'mean': round(float(values.mean()), 3),
+        'max': round(float(values.max()), 3),
+    }
+
+
+def run_benchmark(endpoints, iterations=200, warmup=20, seed=42, cold=False,
+                  search_modes=('keyword',)):
+    """
+    Replay a query mix against discovery views in-process.
+
+    Each request goes through the full DRF stack (parsing, validation,
+    serialization and rendering) with throttling disabled. Searches are
+    not recorded, so benchmark traffic never reaches the search history,
+    the query stats or the cache prewarm fed by them. With ``cold``
+    the result caches are invalidated before every request, which measures
+    the database path. Returns per-endpoint latency (milliseconds) and SQL
+    query count summaries.
+    """
+    # Imported here so the generator does not depend on the URL layer
+    from .views import PopularServersView, RecommendationsView, SearchView
+
+    views = {
+        'search': ('/api/discovery/search/', SearchView.as_view(throttle_classes=[], record_history=False)),
+        'recommend': ('/api/discovery/recommend/', RecommendationsView.as_view(throttle_classes=[])),
+        'popular': ('/api/discovery/popular/', PopularServersView.as_view(throttle_classes=[])),
+    }
+
+    users = list(User.objects.filter(email__endswith=f'@{SYNTHETIC_EMAIL_DOMAIN}').order_by('email'))
+    if 'recommend' in endpoints and not users:
+        raise ValueError('Recommendation benchmarks need a generated synthetic catalog')
+
+    factory = APIRequestFactory()
+    results = {}
+
+    for endpoint in endpoints:
+        path, view = views[endpoint]
+        queries = build_query_mix(endpoint, warmup + iterations, users, seed, search_modes)
+        latencies, query_counts, statuses = [], [], {}
+
+        for position, (params, user) in enumerate(queries):
+            if cold:
+                bump_version(CATALOG_VERSION)
+                if user is not None:
+                    bump_version(user_version(user.id))
+
+            request = factory.get(path, params, HTTP_HOST='localhost')
+            if user is not None:
+                force_authenticate(request, user=user)
+
+            with CaptureQueriesContext(connection) as captured:
+                started = time.perf_counter()
+                response = view(request)
+                response.render()
+                elapsed = (time.perf_counter() - started) * 1000
+
+            if position < warmup:
+                continue
+            latencies.append(elapsed)
+            query_counts.append(len(captured.captured_queries))
+            statuses[str(response.status_code)] = statuses.get(str(response.status_code), 0) + 1
+
+        results[endpoint] = {
+            'requests': len(latencies),
+            'status_codes': statuses,
+            'latency_ms': _summary(latencies),
+            'queries': _summary(query_counts),
+        }
+
+    return results
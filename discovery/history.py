@@ -0,0 +1,311 @@
+import json
+import logging
+import uuid
+from datetime import timedelta, timezone as dt_timezone
+from django.contrib.auth import get_user_model
+from django.db import InterfaceError, OperationalError, connection as db_connection, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from redis.exceptions import LockNotOwnedError
+from common.redis_client import get_redis_connection
+from .models import SearchHistory, SearchHistoryBatch, SearchQueryStats
+from .search import normalize_query
+
+logger = logging.getLogger('mcp_nexus')
+
+User = get_user_model()
+
+# Redis list holding searches that have not been written to the database yet
+SEARCH_HISTORY_BUFFER_KEY = 'discovery:search_history:buffer'
+
+# Searches taken by a flush; they stay here until the database has them, so
+# a flush that fails or dies is retried by the next one
+SEARCH_HISTORY_PROCESSING_KEY = 'discovery:search_history:processing'
+
+# Id the batch in the processing list is recorded under once written
+SEARCH_HISTORY_BATCH_KEY = 'discovery:search_history:batch'
+
+# Failed attempts at writing the batch in the processing list
+SEARCH_HISTORY_ATTEMPTS_KEY = 'discovery:search_history:attempts'
+
+# Consecutive flushes that could not reach the database, and a key that
+# exists while flushes are backing off after the last of them
+SEARCH_HISTORY_OUTAGES_KEY = 'discovery:search_history:outages'
+SEARCH_HISTORY_BACKOFF_KEY = 'discovery:search_history:backoff'
+
+# How long written batch ids are kept; far longer than a batch is retried
+SEARCH_HISTORY_BATCH_RETENTION = timedelta(days=1)
+
+# Held while a flush runs, since every flush works on the processing list
+SEARCH_HISTORY_LOCK_KEY = 'discovery:search_history:lock'
+
+# Largest value SearchHistory.results_count can hold
+MAX_RESULTS_COUNT = 2 ** 31 - 1
+
+# Adds a batch of per-query totals to the daily rollup
+UPSERT_QUERY_STATS_SQL = """
+INSERT INTO {stats} AS stats
+    (date, query, search_count, zero_result_count, cache_hit_count,
+     total_results, total_latency_ms, max_latency_ms)
+VALUES {values}
+ON CONFLICT (date, query) DO UPDATE SET
+    search_count = stats.search_count + EXCLUDED.search_count,
+    zero_result_count = stats.zero_result_count + EXCLUDED.zero_result_count,
+    cache_hit_count = stats.cache_hit_count + EXCLUDED.cache_hit_count,
+    total_results = stats.total_results + EXCLUDED.total_results,
+    total_latency_ms = stats.total_latency_ms + EXCLUDED.total_latency_ms,
+    max_latency_ms = GREATEST(stats.max_latency_ms, EXCLUDED.max_latency_ms)
+"""
+
+
+def record_search(user, query, filters, results_count, latency_ms=None, cache_hit=False):
+    """
+    Queue a search for the history table without touching the database.
+
+    Entries are appended to a Redis list and written in batches by the
+    flush_search_history task. If Redis is unavailable the entry is dropped;
+    history is best-effort and must never slow down or fail a search.
+    Anonymous searches (``user`` is None) only count towards the query stats.
+    """
+    entry = {
+        'user_id': str(user.id) if user is not None else None,
+        'query': query[:255],
+        'filters': filters,
+        'results_count': results_count,
+        'latency_ms': latency_ms,
+        'cache_hit': cache_hit,
+        'created_at': timezone.now().isoformat(),
+    }
+
+    try:
+        get_redis_connection().rpush(SEARCH_HISTORY_BUFFER_KEY, json.dumps(entry))
+    except Exception as e:
+        logger.warning(f"Could not buffer search history entry: {str(e)}")
+
+
+def aggregate_query_stats(entries):
+    """
+    Sum buffered search entries per day and normalized query.
+
+    Returns a list of value tuples in UPSERT_QUERY_STATS_SQL column order.
+    """
+    totals = {}
+    for entry in entries:
+        query = normalize_query(entry['query'])[:255]
+        if not query:
+            continue
+        day = entry['created_at'].astimezone(dt_timezone.utc).date()
+        latency = entry.get('latency_ms') or 0.0
+        row = totals.setdefault((day, query), [0, 0, 0, 0, 0.0, 0.0])
+        row[0] += 1
+        row[1] += 1 if entry['results_count'] == 0 else 0
+        row[2] += 1 if entry.get('cache_hit') else 0
+        row[3] += entry['results_count']
+        row[4] += latency
+        row[5] = max(row[5], latency)
+
+    return [(day, query, *row) for (day, query), row in totals.items()]
+
+
+def parse_history_entry(raw_entry):
+    """
+    Decode one buffered search and fit it to the history and stats tables.
+
+    The query is truncated to the column length and the other fields are
+    coerced to their column types. Returns None, after logging, for entries
+    that cannot be stored at all.
+    """
+    try:
+        entry = json.loads(raw_entry)
+        created_at = parse_datetime(entry['created_at'])
+        if created_at is None:
+            raise ValueError('invalid created_at')
+        if timezone.is_naive(created_at):
+            created_at = timezone.make_aware(created_at, dt_timezone.utc)
+        filters = entry.get('filters') or {}
+        if not isinstance(filters, dict):
+            raise ValueError('filters must be an object')
+        latency_ms = entry.get('latency_ms')
+
+        return {
+            'user_id': str(uuid.UUID(entry['user_id'])) if entry.get('user_id') else None,
+            'query': str(entry['query'])[:255],
+            'filters': filters,
+            'results_count': min(max(int(entry['results_count']), 0), MAX_RESULTS_COUNT),
+            'latency_ms': float(latency_ms) if latency_ms is not None else None,
+            'cache_hit': bool(entry.get('cache_hit')),
+            'created_at': created_at,
+        }
+    except (AttributeError, KeyError, TypeError, ValueError):
+        logger.warning(f"Dropping malformed search history entry: {raw_entry!r}")
+        return None
+
+
+def write_search_history(entries, batch_id=None):
+    """
+    Write parsed search entries to SearchHistory and the daily rollup.
+
+    Both tables are written in one transaction, so a failure leaves neither
+    changed. Entries for users deleted since the search was made only count
+    towards the rollup. With a ``batch_id``, the id is recorded in the same
+    transaction and a batch already recorded is skipped. Returns whether
+    the entries were written.
+    """
+    existing_user_ids = {
+        str(user_id) for user_id in User.objects.filter(
+            id__in={entry['user_id'] for entry in entries if entry['user_id']}
+        ).values_list('id', flat=True)
+    }
+
+    records = [
+        SearchHistory(
+            user_id=entry['user_id'],
+            query=entry['query'],
+            filters=entry['filters'],
+            results_count=entry['results_count'],
+            latency_ms=entry['latency_ms'],
+            created_at=entry['created_at']
+        )
+        for entry in entries
+        if entry['user_id'] in existing_user_ids
+    ]
+    stats = aggregate_query_stats(entries)
+
+    with transaction.atomic():
+        if batch_id is not None:
+            _, created = SearchHistoryBatch.objects.get_or_create(batch_id=batch_id)
+            if not created:
+                return False
+        SearchHistory.objects.bulk_create(records)
+        if stats:
+            with db_connection.cursor() as cursor:
+                cursor.execute(
+                    UPSERT_QUERY_STATS_SQL.format(
+                        stats=SearchQueryStats._meta.db_table,
+                        values=', '.join(['(%s, %s, %s, %s, %s, %s, %s, %s)'] * len(stats))
+                    ),
+                    [value for row in stats for value in row]
+                )
+    return True
+
+
+def _write_batch(connection, entries, batch_id, max_attempts):
+    """
+    Write the batch in the processing list, falling back to single entries.
+
+    Database connection errors are raised as they are, without counting an
+    attempt or dropping anything.
+    """
+    try:
+        write_search_history(entries, batch_id)
+    except (InterfaceError, OperationalError):
+        raise
+    except Exception:
+        attempts = connection.incr(SEARCH_HISTORY_ATTEMPTS_KEY)
+        if attempts < max_attempts:
+            raise
+
+        logger.error(
+            f"Writing {len(entries)} search history entries failed {attempts} times, "
+            f"writing them one at a time",
+            exc_info=True
+        )
+        dropped = 0
+        for index, entry in enumerate(entries):
+            try:
+                write_search_history([entry], f'{batch_id}:{index}')
+            except (InterfaceError, OperationalError):
+                raise
+            except Exception as e:
+                dropped += 1
+                logger.warning(f"Dropping search history entry that could not be written: {str(e)}")
+        if dropped:
+            logger.error(f"Dropped {dropped} search history entries that could not be written")
+
+
+def flush_search_history(batch_size=1000, max_attempts=5, max_backoff=300):
+    """
+    Move one batch of buffered searches into the SearchHistory table.
+
+    Entries are moved one by one with ``LMOVE`` into a processing list and
+    stay there until they are written, so a flush that fails or dies
+    leaves its batch for the next one, which retries it before taking new
+    entries. The batch is written under an id kept in Redis until the
+    list is cleared, so a batch written by a flush that died before
+    clearing it is not counted again. After ``max_attempts`` failed
+    attempts the batch is written entry by entry and the entries that still
+    fail are dropped. Failing to reach the database is not held against the
+    batch; flushes are skipped instead, for a delay that doubles with every
+    consecutive failure up to ``max_backoff`` seconds. Returns the number
+    of entries taken from the buffer, or 0 if another flush is running or
+    flushes are backing off.
+    """
+    connection = get_redis_connection()
+    if connection.exists(SEARCH_HISTORY_BACKOFF_KEY):
+        return 0
+    lock = connection.lock(SEARCH_HISTORY_LOCK_KEY, timeout=300, blocking_timeout=0)
+    if not lock.acquire():
+        return 0
+
+    try:
+        raw_entries = connection.lrange(SEARCH_HISTORY_PROCESSING_KEY, 0, -1)
+        if not raw_entries:
+            pipeline = connection.pipeline(transaction=False)
+            for _ in range(batch_size):
+                pipeline.lmove(SEARCH_HISTORY_BUFFER_KEY, SEARCH_HISTORY_PROCESSING_KEY, 'LEFT', 'RIGHT')
+            raw_entries = [raw_entry for raw_entry in pipeline.execute() if raw_entry is not None]
+
+        if not raw_entries:
+            return 0
+
+        connection.set(SEARCH_HISTORY_BATCH_KEY, uuid.uuid4().hex, nx=True)
+        batch_id = connection.get(SEARCH_HISTORY_BATCH_KEY).decode()
+        entries = [entry for entry in map(parse_history_entry, raw_entries) if entry is not None]
+
+        try:
+            _write_batch(connection, entries, batch_id, max_attempts)
+        except (InterfaceError, OperationalError):
+            outages = connection.incr(SEARCH_HISTORY_OUTAGES_KEY)
+            connection.set(SEARCH_HISTORY_BACKOFF_KEY, 1, ex=min(2 ** outages, max_backoff))
+            raise
+
+        connection.delete(
+            SEARCH_HISTORY_PROCESSING_KEY, SEARCH_HISTORY_BATCH_KEY,
+            SEARCH_HISTORY_ATTEMPTS_KEY, SEARCH_HISTORY_OUTAGES_KEY
+        )
+        return len(raw_entries)
+    finally:
+        try:
+            lock.release()
+        except LockNotOwnedError:
+            logger.warning("Search history flush outlived its lock")
+
+
+def prune_search_history(history_days, stats_days, batch_size=10000):
+    """
+    Delete search history and query stats older than their retention windows.
+
+    History rows go in batches so no single statement holds locks on a large
+    part of the table. Their aggregates stay in SearchQueryStats until that
+    window passes too. Returns ``(history_deleted, stats_deleted)``.
+    """
+    now = timezone.now()
+    history_cutoff = now - timedelta(days=history_days)
+    history_deleted = 0
+
+    while True:
+        batch = list(
+            SearchHistory.objects.filter(created_at__lt=history_cutoff)
+            .order_by().values_list('id', flat=True)[:batch_size]
+        )
+        if not batch:
+            break
+        deleted, _ = SearchHistory.objects.filter(id__in=batch).delete()
+        history_deleted += deleted
+
+    stats_deleted, _ = SearchQueryStats.objects.filter(
+        date__lt=(now - timedelta(days=stats_days)).date()
+    ).delete()
+    SearchHistoryBatch.objects.filter(created_at__lt=now - SEARCH_HISTORY_BATCH_RETENTION).delete()
+
+    return history_deleted, stats_deleted
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+from discovery.popularity import BACKFILL_DAYS, update_server_popularity
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the daily usage buckets and popularity windows from recorded usage'
+
+    def add_arguments(self, parser): # type: ignore
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=BACKFILL_DAYS,
+            help='Days of buckets to re-aggregate (defaults to the whole month window)'
+        )
+
+    def handle(self, *args, **options): # type: ignore
+        days = max(1, options['days'])
+        changed = update_server_popularity(days)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt {days} days of usage buckets; popularity changed for {changed} servers"
+        ))
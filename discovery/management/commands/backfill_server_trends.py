@@ -0,0 +1,24 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from discovery.trending import backfill_server_trends
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the trending counters from recorded usage history'
+
+    def add_arguments(self, parser): # type: ignore
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=None,
+            help='Days of history to replay (defaults to ten slow half-lives)'
+        )
+
+    def handle(self, *args, **options): # type: ignore
+        # Older events have decayed below 0.1% of their weight
+        days = options['days'] or max(1, round(settings.TRENDING_SLOW_HALF_LIFE_HOURS * 10 / 24))
+        scored = backfill_server_trends(days)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Backfilled trend counters for {scored} servers from {days} days of history"
+        ))
@@ -0,0 +1,72 @@
+import json
+from django.core.management.base import BaseCommand, CommandError
+from discovery.benchmark import run_benchmark
+from servers.models import Server
+
+ENDPOINTS = ['search', 'recommend', 'popular']
+
+
+class Command(BaseCommand):
+    help = 'Measure discovery endpoint latency and SQL query counts in-process'
+
+    def add_arguments(self, parser): # type: ignore
+        parser.add_argument(
+            '--endpoints',
+            default=','.join(ENDPOINTS),
+            help=f'Comma-separated endpoints to benchmark ({", ".join(ENDPOINTS)})'
+        )
+        parser.add_argument('--iterations', type=int, default=200, help='Measured requests per endpoint')
+        parser.add_argument('--warmup', type=int, default=20, help='Unmeasured requests per endpoint')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed for the query mix')
+        parser.add_argument(
+            '--search-modes',
+            default='keyword',
+            help='Comma-separated search modes to mix (keyword, semantic, hybrid)'
+        )
+        parser.add_argument(
+            '--cold',
+            action='store_true',
+            help='Invalidate result caches before every request'
+        )
+        parser.add_argument('--output', help='Write the JSON report to this file instead of stdout')
+
+    def handle(self, *args, **options): # type: ignore
+        endpoints = [endpoint.strip() for endpoint in options['endpoints'].split(',') if endpoint.strip()]
+        unknown = set(endpoints) - set(ENDPOINTS)
+        if unknown:
+            raise CommandError(f'Unknown endpoints: {", ".join(sorted(unknown))}')
+
+        search_modes = tuple(mode.strip() for mode in options['search_modes'].split(',') if mode.strip())
+
+        try:
+            results = run_benchmark(
+                endpoints,
+                iterations=options['iterations'],
+                warmup=options['warmup'],
+                seed=options['seed'],
+                cold=options['cold'],
+                search_modes=search_modes,
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        # Only deterministic fields, so reports of identical runs compare equal
+        report = {
+            'config': {
+                'iterations': options['iterations'],
+                'warmup': options['warmup'],
+                'seed': options['seed'],
+                'cold': options['cold'],
+                'search_modes': list(search_modes),
+            },
+            'catalog': {'servers': Server.objects.count()},
+            'endpoints': results,
+        }
+        output = json.dumps(report, indent=2, sort_keys=True)
+
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                f.write(output + '\n')
+            self.stdout.write(self.style.SUCCESS(f"Wrote benchmark report to {options['output']}"))
+        else:
+            self.stdout.write(output)
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+from discovery.semantic import semantic_index
+
+
+class Command(BaseCommand):
+    help = 'Fit the semantic search model and rebuild the semantic index'
+
+    def handle(self, *args, **options): # type: ignore
+        # Waits for any running incremental update to finish
+        with semantic_index.lock():
+            manifest = semantic_index.build()
+
+        if manifest is None:
+            self.stdout.write(self.style.WARNING('Not enough servers to build the semantic index'))
+            return
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Built semantic index with {manifest['count']} servers "
+            f"and {manifest['dimensions']} dimensions in {semantic_index.index_dir}"
+        ))
@@ -0,0 +1,76 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from discovery.benchmark import delete_synthetic_catalog, generate_catalog
+from discovery.neighbors import rebuild_server_neighbors
+from discovery.popularity import update_server_popularity
+from discovery.semantic import semantic_index
+from discovery.trending import backfill_server_trends
+
+
+class Command(BaseCommand):
+    help = 'Generate a reproducible synthetic server registry for benchmarking'
+
+    def add_arguments(self, parser): # type: ignore
+        parser.add_argument('--servers', type=int, default=1000, help='Number of servers')
+        parser.add_argument('--users', type=int, default=500, help='Number of users')
+        parser.add_argument('--capabilities', type=int, default=5, help='Average capabilities per server')
+        parser.add_argument('--parameters', type=int, default=3, help='Average parameters per capability')
+        parser.add_argument('--usage', type=int, default=20, help='Average usage records per user')
+        parser.add_argument('--ratings', type=int, default=3, help='Average ratings per user')
+        parser.add_argument('--requests', type=int, default=50, help='Average request logs per server')
+        parser.add_argument('--days', type=int, default=60, help='Days of history to spread events over')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Rows per bulk insert')
+        parser.add_argument(
+            '--reset',
+            action='store_true',
+            help='Delete previously generated servers and users first'
+        )
+        parser.add_argument(
+            '--skip-derived',
+            action='store_true',
+            help='Do not rebuild popularity, trending, neighbour and semantic data'
+        )
+
+    def handle(self, *args, **options): # type: ignore
+        negative = [
+            name for name in ('servers', 'users', 'capabilities', 'parameters', 'usage', 'ratings', 'requests')
+            if options[name] < 0
+        ]
+        if negative:
+            raise CommandError(f'Counts cannot be negative: {", ".join(negative)}')
+        if options['days'] < 1 or options['batch_size'] < 1:
+            raise CommandError('--days and --batch-size must be at least 1')
+
+        if options['reset']:
+            deleted = delete_synthetic_catalog()
+            self.stdout.write(f'Deleted {deleted} synthetic rows')
+
+        counts = generate_catalog(
+            servers=options['servers'],
+            users=options['users'],
+            capabilities=options['capabilities'],
+            parameters=options['parameters'],
+            usage=options['usage'],
+            ratings=options['ratings'],
+            requests=options['requests'],
+            days=options['days'],
+            seed=options['seed'],
+            batch_size=options['batch_size'],
+        )
+        self.stdout.write(', '.join(f'{count} {label}' for label, count in counts.items()))
+
+        if not options['skip_derived']:
+            # Bulk inserts bypass the signals that keep derived tables current
+            update_server_popularity(settings.POPULARITY_REFRESH_DAYS + options['days'])
+            backfill_server_trends(options['days'])
+            rebuild_server_neighbors(
+                settings.RECOMMENDATION_NEIGHBORS,
+                settings.RECOMMENDATION_USAGE_WINDOW_DAYS,
+                settings.RECOMMENDATION_MIN_CO_USERS
+            )
+            with semantic_index.lock():
+                semantic_index.build()
+            self.stdout.write('Rebuilt derived discovery data')
+
+        self.stdout.write(self.style.SUCCESS('Generated synthetic catalog'))
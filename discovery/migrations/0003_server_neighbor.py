@@ -0,0 +1,30 @@
+# Generated by Django 5.1.7 on 2026-10-17 06:44
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('discovery', '0002_search_history_created_at'),
+        ('servers', '0004_capability_search_vector'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ServerNeighbor',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField()),
+                ('rank', models.PositiveSmallIntegerField()),
+                ('neighbor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='servers.server')),
+                ('server', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='neighbors', to='servers.server')),
+            ],
+            options={
+                'ordering': ['server', 'rank'],
+                'indexes': [models.Index(fields=['server', 'rank'], name='discovery_s_server__40ba44_idx')],
+                'unique_together': {('server', 'neighbor')},
+            },
+        ),
+    ]
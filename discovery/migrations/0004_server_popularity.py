@@ -0,0 +1,71 @@
+# Generated by Django 5.1.7 on 2026-10-17 06:48
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('discovery', '0003_server_neighbor'),
+        ('servers', '0004_capability_search_vector'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ServerDailyUsage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('usage_count', models.PositiveIntegerField(default=0)),
+                ('request_count', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'ordering': ['-date'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ServerPopularity',
+            fields=[
+                ('server', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='popularity', serialize=False, to='servers.server')),
+                ('day_count', models.PositiveIntegerField(default=0)),
+                ('week_count', models.PositiveIntegerField(default=0)),
+                ('month_count', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name_plural': 'Server popularity',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='serverusage',
+            index=models.Index(fields=['created_at'], name='discovery_s_created_09e44e_idx'),
+        ),
+        migrations.AddField(
+            model_name='serverdailyusage',
+            name='server',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_usage', to='servers.server'),
+        ),
+        migrations.AddIndex(
+            model_name='serverpopularity',
+            index=models.Index(fields=['-day_count'], name='popularity_day_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='serverpopularity',
+            index=models.Index(fields=['-week_count'], name='popularity_week_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='serverpopularity',
+            index=models.Index(fields=['-month_count'], name='popularity_month_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='serverdailyusage',
+            index=models.Index(fields=['date'], name='discovery_s_date_03ec9f_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='serverdailyusage',
+            unique_together={('server', 'date')},
+        ),
+    ]
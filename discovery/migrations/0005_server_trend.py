@@ -0,0 +1,29 @@
+# Generated by Django 5.1.7 on 2026-10-17 06:49
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('discovery', '0004_server_popularity'),
+        ('servers', '0004_capability_search_vector'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ServerTrend',
+            fields=[
+                ('server', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='trend', serialize=False, to='servers.server')),
+                ('fast_count', models.FloatField(default=0)),
+                ('slow_count', models.FloatField(default=0)),
+                ('last_event_at', models.DateTimeField()),
+                ('trend_score', models.FloatField(default=0)),
+                ('scored_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['-trend_score'], name='trend_score_idx')],
+            },
+        ),
+    ]
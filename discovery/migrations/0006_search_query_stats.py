@@ -0,0 +1,50 @@
+# Generated by Django 5.1.7 on 2026-10-17 06:53
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('discovery', '0005_server_trend'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchQueryStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('query', models.CharField(max_length=255)),
+                ('search_count', models.PositiveIntegerField(default=0)),
+                ('zero_result_count', models.PositiveIntegerField(default=0)),
+                ('cache_hit_count', models.PositiveIntegerField(default=0)),
+                ('total_results', models.BigIntegerField(default=0)),
+                ('total_latency_ms', models.FloatField(default=0)),
+                ('max_latency_ms', models.FloatField(default=0)),
+            ],
+            options={
+                'verbose_name_plural': 'Search query stats',
+                'ordering': ['-date', '-search_count'],
+            },
+        ),
+        migrations.AddField(
+            model_name='searchhistory',
+            name='latency_ms',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='searchhistory',
+            index=models.Index(fields=['created_at'], name='discovery_s_created_3884dc_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='searchquerystats',
+            index=models.Index(fields=['date', '-search_count'], name='discovery_s_date_16e2cf_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='searchquerystats',
+            unique_together={('date', 'query')},
+        ),
+    ]
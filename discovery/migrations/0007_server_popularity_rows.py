@@ -0,0 +1,24 @@
+# Generated by Django 5.1.7 on 2026-10-17 09:12
+
+from django.db import migrations
+
+
+# Every server gets a popularity row, so the popular servers listing can
+# inner join and sort on the indexed window columns.
+BACKFILL_SQL = """
+INSERT INTO discovery_serverpopularity (server_id, day_count, week_count, month_count, updated_at)
+SELECT id, 0, 0, 0, now() FROM servers_server
+ON CONFLICT (server_id) DO NOTHING;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('discovery', '0006_search_query_stats'),
+        ('servers', '0006_server_validation_status'),
+    ]
+
+    operations = [
+        migrations.RunSQL(BACKFILL_SQL, migrations.RunSQL.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.1.7 on 2026-10-17 07:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('discovery', '0007_server_popularity_rows'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchHistoryBatch',
+            fields=[
+                ('batch_id', models.CharField(max_length=64, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+            ],
+            options={
+                'verbose_name_plural': 'Search history batches',
+            },
+        ),
+    ]
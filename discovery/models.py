@@ -1,7 +1,9 @@
 import uuid
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth import get_user_model
 from django.contrib.postgres.fields import ArrayField
+from django.utils import timezone
+from servers.counters import increment_usage_count
 
 User = get_user_model()
 
@@ -14,7 +16,9 @@ class SearchHistory(models.Model):
     query = models.CharField(max_length=255)
     filters = models.JSONField(default=dict, blank=True)
     results_count = models.IntegerField()
-    created_at = models.DateTimeField(auto_now_add=True)
+    latency_ms = models.FloatField(null=True, blank=True)
+    # Not auto_now_add: entries are written in batches after the search happened
+    created_at = models.DateTimeField(default=timezone.now, editable=False)
 
     def __str__(self):
         return f"{self.user.email} - {self.query}"
@@ -24,9 +28,53 @@ class SearchHistory(models.Model):
         verbose_name_plural = "Search histories"
         indexes = [
             models.Index(fields=['user', '-created_at']),
+            models.Index(fields=['created_at']),
         ]
 
 
+class SearchQueryStats(models.Model):
+    """
+    Daily rollup of searches per normalized query, including anonymous ones.
+    """
+    date = models.DateField()
+    query = models.CharField(max_length=255)
+    search_count = models.PositiveIntegerField(default=0)
+    zero_result_count = models.PositiveIntegerField(default=0)
+    cache_hit_count = models.PositiveIntegerField(default=0)
+    # Sums, so batches can be added without reading the row first
+    total_results = models.BigIntegerField(default=0)
+    total_latency_ms = models.FloatField(default=0)
+    max_latency_ms = models.FloatField(default=0)
+
+    def __str__(self):
+        return f"{self.date} - {self.query}"
+
+    class Meta:
+        ordering = ['-date', '-search_count']
+        verbose_name_plural = "Search query stats"
+        unique_together = ['date', 'query']
+        indexes = [
+            models.Index(fields=['date', '-search_count']),
+        ]
+
+
+class SearchHistoryBatch(models.Model):
+    """
+    Buffered search batch already written to SearchHistory and SearchQueryStats.
+
+    Recorded in the same transaction as the batch, so a flush that dies
+    before clearing its batch from Redis does not count it twice.
+    """
+    batch_id = models.CharField(max_length=64, primary_key=True)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    def __str__(self):
+        return self.batch_id
+
+    class Meta:
+        verbose_name_plural = "Search history batches"
+
+
 class ServerUsage(models.Model):
     """
     Model to track user interactions with servers.
@@ -48,15 +96,18 @@ class ServerUsage(models.Model):
         indexes = [
             models.Index(fields=['user', '-created_at']),
             models.Index(fields=['server', '-created_at']),
+            models.Index(fields=['created_at']),
         ]
 
     def save(self, *args, **kwargs):
-        """Update server usage count when a new usage record is created."""
+        """Count new usage records towards the server's usage count."""
+        adding = self._state.adding
         super().save(*args, **kwargs)
 
-        # Increment server usage count
-        self.server.usage_count += 1
-        self.server.save(update_fields=['usage_count'])
+        if adding:
+            # Buffered and flushed in batches, so usage never locks the server row
+            server_id = self.server_id
+            transaction.on_commit(lambda: increment_usage_count(server_id))
 
 
 class UserPreference(models.Model):
@@ -80,4 +131,111 @@ class UserPreference(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
-        return f"{self.user.email} Preferences"
\ No newline at end of file
+        return f"{self.user.email} Preferences"
+
+class ServerNeighbor(models.Model):
+    """
+    Precomputed item-to-item similarity between two servers.
+
+    Rebuilt nightly from ServerUsage co-occurrence by the
+    compute_server_neighbors task. Each server keeps only its top
+    neighbours, ranked by cosine similarity.
+    """
+    server = models.ForeignKey('servers.Server', on_delete=models.CASCADE, related_name='neighbors')
+    neighbor = models.ForeignKey('servers.Server', on_delete=models.CASCADE, related_name='+')
+    score = models.FloatField()
+    rank = models.PositiveSmallIntegerField()
+
+    def __str__(self):
+        return f"{self.server_id} -> {self.neighbor_id} ({self.score:.3f})"
+
+    class Meta:
+        ordering = ['server', 'rank']
+        unique_together = ['server', 'neighbor']
+        indexes = [
+            models.Index(fields=['server', 'rank']),
+        ]
+
+
+class ServerDailyUsage(models.Model):
+    """
+    Per-server usage counts for one UTC day.
+
+    Maintained by the update_server_popularity task from ServerUsage and
+    RequestLog. Buckets older than the longest popularity window are removed.
+    """
+    server = models.ForeignKey('servers.Server', on_delete=models.CASCADE, related_name='daily_usage')
+    date = models.DateField()
+    usage_count = models.PositiveIntegerField(default=0)
+    request_count = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.server_id} - {self.date}"
+
+    class Meta:
+        ordering = ['-date']
+        unique_together = ['server', 'date']
+        indexes = [
+            models.Index(fields=['date']),
+        ]
+
+
+class ServerPopularity(models.Model):
+    """
+    Rolling-window usage totals for a server, summed from ServerDailyUsage.
+
+    The ``day`` window covers today and yesterday, ``week`` the last 7 days
+    plus today and ``month`` the last 30 days plus today.
+    """
+    server = models.OneToOneField(
+        'servers.Server',
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='popularity'
+    )
+    day_count = models.PositiveIntegerField(default=0)
+    week_count = models.PositiveIntegerField(default=0)
+    month_count = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.server_id} popularity"
+
+    class Meta:
+        verbose_name_plural = "Server popularity"
+        indexes = [
+            models.Index(fields=['-day_count'], name='popularity_day_idx'),
+            models.Index(fields=['-week_count'], name='popularity_week_idx'),
+            models.Index(fields=['-month_count'], name='popularity_month_idx'),
+        ]
+
+
+class ServerTrend(models.Model):
+    """
+    Exponentially decayed usage counters for a server.
+
+    ``fast_count`` and ``slow_count`` are event counts decayed with a short
+    and a long half-life, both as of ``last_event_at``. New events are
+    buffered in Redis; the periodic score_trending_servers task decays the
+    counters to its run time, adds the buffered events and refreshes
+    ``trend_score``, which compares the two rates.
+    """
+    server = models.OneToOneField(
+        'servers.Server',
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='trend'
+    )
+    fast_count = models.FloatField(default=0)
+    slow_count = models.FloatField(default=0)
+    last_event_at = models.DateTimeField()
+    trend_score = models.FloatField(default=0)
+    scored_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.server_id} trend ({self.trend_score:.2f})"
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['-trend_score'], name='trend_score_idx'),
+        ]
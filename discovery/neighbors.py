@@ -0,0 +1,126 @@
+import logging
+from datetime import timedelta
+import numpy as np
+from scipy import sparse
+from django.db import transaction
+from django.utils import timezone
+from common.cache import bump_version
+from servers.models import Server
+from .models import ServerNeighbor, ServerUsage
+
+logger = logging.getLogger('mcp_nexus')
+
+# Version group for cached data derived from the neighbour table
+NEIGHBORS_VERSION = 'neighbors'
+
+
+def build_usage_matrix(since=None):
+    """
+    Build a binary user x server matrix from successful usage records.
+
+    Returns ``(matrix, server_ids)`` where column ``j`` of the CSR matrix is
+    the server ``server_ids[j]``. Repeated use of a server by the same user
+    counts once.
+    """
+    usage = ServerUsage.objects.filter(successful=True)
+    if since is not None:
+        usage = usage.filter(created_at__gte=since)
+
+    pairs = np.array(
+        list(usage.order_by().values_list('user_id', 'server_id').distinct().iterator(chunk_size=10000)),
+        dtype=object
+    )
+    if len(pairs) == 0:
+        return sparse.csr_matrix((0, 0), dtype=np.float32), []
+
+    user_ids, user_index = np.unique(pairs[:, 0].astype(str), return_inverse=True)
+    server_ids, server_index = np.unique(pairs[:, 1].astype(str), return_inverse=True)
+
+    matrix = sparse.csr_matrix(
+        (np.ones(len(pairs), dtype=np.float32), (user_index, server_index)),
+        shape=(len(user_ids), len(server_ids))
+    )
+    return matrix, server_ids.tolist()
+
+
+def compute_neighbors(matrix, k, min_co_users=1):
+    """
+    Compute the top-``k`` cosine neighbours of every column of ``matrix``.
+
+    Pairs used together by fewer than ``min_co_users`` users are ignored, so
+    one shared user cannot produce a perfect similarity between two niche
+    servers. Returns a list of ``(column, neighbor_column, score)`` tuples.
+    """
+    if matrix.shape[1] == 0:
+        return []
+
+    # Co-occurrence counts; the diagonal holds each server's user count
+    co_users = (matrix.T @ matrix).tocsr()
+    user_counts = co_users.diagonal()
+    co_users.setdiag(0)
+    co_users.data[co_users.data < min_co_users] = 0
+    co_users.eliminate_zeros()
+
+    # cosine(i, j) = co_users(i, j) / sqrt(users(i) * users(j))
+    inverse_norms = sparse.diags(1.0 / np.sqrt(np.maximum(user_counts, 1)))
+    similarity = (inverse_norms @ co_users @ inverse_norms).tocsr()
+
+    neighbors = []
+    for column in range(similarity.shape[0]):
+        start, end = similarity.indptr[column], similarity.indptr[column + 1]
+        if start == end:
+            continue
+        scores = similarity.data[start:end]
+        columns = similarity.indices[start:end]
+        top = np.argpartition(scores, -k)[-k:] if len(scores) > k else np.arange(len(scores))
+        top = top[np.argsort(scores[top])[::-1]]
+        neighbors.extend((column, int(columns[i]), float(scores[i])) for i in top)
+
+    return neighbors
+
+
+def rebuild_server_neighbors(k, window_days=None, min_co_users=1):
+    """
+    Recompute the ServerNeighbor table from usage history.
+
+    The table is replaced in a single transaction, so readers see either the
+    previous or the new neighbours. Returns the number of rows written.
+    """
+    since = timezone.now() - timedelta(days=window_days) if window_days else None
+    matrix, server_ids = build_usage_matrix(since)
+    neighbors = compute_neighbors(matrix, k, min_co_users)
+
+    rows = []
+    current = None
+    rank = 0
+    for column, neighbor_column, score in neighbors:
+        if column != current:
+            current = column
+            rank = 0
+        rank += 1
+        rows.append(ServerNeighbor(
+            server_id=server_ids[column],
+            neighbor_id=server_ids[neighbor_column],
+            score=score,
+            rank=rank
+        ))
+
+    with transaction.atomic():
+        # Skip servers deleted while the matrix was being computed
+        existing = {
+            str(server_id) for server_id in
+            Server.objects.filter(id__in=server_ids).values_list('id', flat=True)
+        }
+        rows = [
+            row for row in rows
+            if str(row.server_id) in existing and str(row.neighbor_id) in existing
+        ]
+        ServerNeighbor.objects.all().delete()
+        ServerNeighbor.objects.bulk_create(rows, batch_size=5000)
+        bump_version(NEIGHBORS_VERSION)
+
+    logger.info(
+        f"Computed {len(rows)} server neighbours from {matrix.shape[0]} users "
+        f"and {matrix.shape[1]} servers"
+    )
+    return len(rows)
@@ -0,0 +1,151 @@
+import logging
+from datetime import datetime, time, timedelta, timezone as dt_timezone
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+from analytics.models import RequestLog
+from common.cache import CATALOG_VERSION, VersionedCache, bump_version
+from servers.models import Server
+from .models import ServerDailyUsage, ServerPopularity, ServerUsage
+
+logger = logging.getLogger('mcp_nexus')
+
+# Version group bumped whenever the popularity windows are refreshed
+POPULARITY_VERSION = 'popularity'
+
+# Popular server responses, invalidated by catalog and popularity changes
+popular_cache = VersionedCache(
+    'popular',
+    timeout=settings.POPULAR_CACHE_TIMEOUT,
+    versions=(CATALOG_VERSION, POPULARITY_VERSION)
+)
+
+# Popularity period -> number of days before today included in the window
+POPULARITY_WINDOWS = {
+    'day': 1,
+    'week': 7,
+    'month': 30,
+}
+
+# Buckets re-aggregated to fill every window: the month plus today
+BACKFILL_DAYS = POPULARITY_WINDOWS['month'] + 1
+
+# Popularity period -> ServerPopularity field
+POPULARITY_FIELDS = {
+    'day': 'day_count',
+    'week': 'week_count',
+    'month': 'month_count',
+}
+
+RESET_BUCKETS_SQL = """
+UPDATE {buckets} SET usage_count = 0, request_count = 0 WHERE date >= %(start_date)s
+"""
+
+# Re-aggregate the open day buckets from the raw event tables
+UPSERT_BUCKETS_SQL = """
+INSERT INTO {buckets} (server_id, date, usage_count, request_count)
+SELECT server_id, day, SUM(usage_count), SUM(request_count)
+FROM (
+    SELECT server_id, (created_at AT TIME ZONE 'UTC')::date AS day,
+           COUNT(*) AS usage_count, 0 AS request_count
+    FROM {usage}
+    WHERE created_at >= %(start)s
+    GROUP BY 1, 2
+    UNION ALL
+    SELECT server_id, (timestamp AT TIME ZONE 'UTC')::date AS day,
+           0 AS usage_count, COUNT(*) AS request_count
+    FROM {requests}
+    WHERE timestamp >= %(start)s
+    GROUP BY 1, 2
+) AS counts
+GROUP BY server_id, day
+ON CONFLICT (server_id, date) DO UPDATE SET
+    usage_count = EXCLUDED.usage_count,
+    request_count = EXCLUDED.request_count
+"""
+
+EXPIRE_BUCKETS_SQL = """
+DELETE FROM {buckets} WHERE date < %(month_start)s
+"""
+
+# Sum the remaining buckets into one row per server
+UPSERT_POPULARITY_SQL = """
+INSERT INTO {popularity} (server_id, day_count, week_count, month_count, updated_at)
+SELECT server.id,
+       COALESCE(SUM(bucket.usage_count + bucket.request_count) FILTER (WHERE bucket.date >= %(day_start)s), 0),
+       COALESCE(SUM(bucket.usage_count + bucket.request_count) FILTER (WHERE bucket.date >= %(week_start)s), 0),
+       COALESCE(SUM(bucket.usage_count + bucket.request_count), 0),
+       %(now)s
+FROM {servers} AS server
+LEFT JOIN {buckets} AS bucket
+    ON bucket.server_id = server.id AND bucket.date >= %(month_start)s
+GROUP BY server.id
+ON CONFLICT (server_id) DO UPDATE SET
+    day_count = EXCLUDED.day_count,
+    week_count = EXCLUDED.week_count,
+    month_count = EXCLUDED.month_count,
+    updated_at = EXCLUDED.updated_at
+WHERE ({popularity}.day_count, {popularity}.week_count, {popularity}.month_count)
+    IS DISTINCT FROM (EXCLUDED.day_count, EXCLUDED.week_count, EXCLUDED.month_count)
+"""
+
+
+def popular_cache_params(params):
+    """Build the normalized cache key parameters for a popular servers request."""
+    return {
+        'type': params.get('type') or '',
+        'period': params.get('period', 'week'),
+        'limit': params.get('limit', 10),
+    }
+
+
+def update_server_popularity(refresh_days=2):
+    """
+    Bring the daily usage buckets and popularity windows up to date.
+
+    Only the last ``refresh_days`` buckets are re-aggregated from ServerUsage
+    and RequestLog, which covers events that are logged late. Buckets that
+    have left the month window are deleted, and every server's window totals
+    are then summed from at most 31 buckets; only rows whose totals changed
+    are written. While there are no buckets yet (the first run after deploy)
+    the whole month window is backfilled instead. The whole update runs in
+    one transaction. Returns the number of servers whose totals changed.
+    """
+    if not ServerDailyUsage.objects.exists():
+        refresh_days = max(refresh_days, BACKFILL_DAYS)
+
+    now = timezone.now()
+    today = now.astimezone(dt_timezone.utc).date()
+    start_date = today - timedelta(days=refresh_days - 1)
+
+    tables = {
+        'buckets': ServerDailyUsage._meta.db_table,
+        'popularity': ServerPopularity._meta.db_table,
+        'usage': ServerUsage._meta.db_table,
+        'requests': RequestLog._meta.db_table,
+        'servers': Server._meta.db_table,
+    }
+    params = {
+        'now': now,
+        'start_date': start_date,
+        'start': datetime.combine(start_date, time.min, tzinfo=dt_timezone.utc),
+        'day_start': today - timedelta(days=POPULARITY_WINDOWS['day']),
+        'week_start': today - timedelta(days=POPULARITY_WINDOWS['week']),
+        'month_start': today - timedelta(days=POPULARITY_WINDOWS['month']),
+    }
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(RESET_BUCKETS_SQL.format(**tables), params)
+        cursor.execute(UPSERT_BUCKETS_SQL.format(**tables), params)
+        buckets = cursor.rowcount
+        cursor.execute(EXPIRE_BUCKETS_SQL.format(**tables), params)
+        expired = cursor.rowcount
+        cursor.execute(UPSERT_POPULARITY_SQL.format(**tables), params)
+        servers = cursor.rowcount
+        bump_version(POPULARITY_VERSION)
+
+    logger.info(
+        f"Updated {buckets} usage buckets, expired {expired} and changed "
+        f"popularity for {servers} servers"
+    )
+    return servers
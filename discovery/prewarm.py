@@ -0,0 +1,155 @@
+import logging
+import time
+from datetime import timedelta
+from django.conf import settings
+from django.db import connection
+from django.db.models import Sum
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from common.redis_client import get_redis_connection
+from .models import SearchQueryStats
+from .popularity import popular_cache, popular_cache_params
+from .search import search_cache, search_cache_params
+from .serializers import PopularServersParamsSerializer, SearchParamsSerializer
+from .views import PopularServersView, SearchView
+
+logger = logging.getLogger('mcp_nexus')
+
+# Held while a pre-warm runs, so at most one runs across all workers
+PREWARM_LOCK_KEY = 'discovery:cache_prewarm:lock'
+
+# Set while a pre-warm is queued, so bursts of changes queue a single run
+PREWARM_SCHEDULED_KEY = 'discovery:cache_prewarm:scheduled'
+
+# Popularity periods warmed with the default type filter and limit
+PREWARM_POPULAR_PERIODS = ['day', 'week', 'month', 'all_time']
+
+# Other sessions currently executing a statement against this database
+ACTIVE_CONNECTIONS_SQL = """
+SELECT count(*) FROM pg_stat_activity
+WHERE datname = current_database() AND state = 'active' AND pid <> pg_backend_pid()
+"""
+
+
+def top_search_queries(limit, days):
+    """Get the ``limit`` most searched normalized queries of the last ``days`` days."""
+    since = timezone.now().date() - timedelta(days=days - 1)
+    return list(
+        SearchQueryStats.objects.filter(date__gte=since)
+        .values('query')
+        .annotate(searches=Sum('search_count'))
+        .order_by('-searches', 'query')
+        .values_list('query', flat=True)[:limit]
+    )
+
+
+def database_busy():
+    """Check whether live traffic is keeping enough connections busy to back off."""
+    with connection.cursor() as cursor:
+        cursor.execute(ACTIVE_CONNECTIONS_SQL)
+        return cursor.fetchone()[0] >= settings.CACHE_PREWARM_MAX_ACTIVE_CONNECTIONS
+
+
+def _build_request(path, params):
+    """Build an anonymous API request equivalent to a client's first page request."""
+    factory = APIRequestFactory()
+    return Request(factory.get(path, params, HTTP_HOST=settings.CACHE_PREWARM_HOST, secure=True))
+
+
+def prewarm_jobs(queries):
+    """
+    Yield ``(cache, cache_params, compute)`` for every response to pre-warm.
+
+    Each ``compute`` builds the payload exactly as the view does on a cache
+    miss, so warmed entries are indistinguishable from ones cached by traffic.
+    """
+    popular_view = PopularServersView()
+    for period in PREWARM_POPULAR_PERIODS:
+        request = _build_request(reverse('popular'), {'period': period})
+        serializer = PopularServersParamsSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+        yield (
+            popular_cache,
+            popular_cache_params(params),
+            lambda request=request, params=params: popular_view.get_results(request, params)
+        )
+
+    search_view = SearchView()
+    for query in queries:
+        request = _build_request(reverse('search'), {'q': query})
+        serializer = SearchParamsSerializer(data=request.query_params)
+        if not serializer.is_valid():
+            continue
+        params = serializer.validated_data
+        yield (
+            search_cache,
+            search_cache_params(params, request),
+            lambda request=request, params=params: search_view.get_results(request, params)
+        )
+
+
+def warm_discovery_caches(query_limit, days):
+    """
+    Populate the search and popular servers caches ahead of traffic.
+
+    Warms the standard popularity periods and then the first result page of
+    the most searched queries, one at a time on a single connection. Entries
+    that are already cached are skipped. The run pauses between queries and
+    stops early once its time limit is reached or when the database is busy
+    with live requests. Returns the number of entries warmed, or None if
+    another pre-warm is already running.
+    """
+    lock = get_redis_connection().lock(
+        PREWARM_LOCK_KEY,
+        timeout=settings.CACHE_PREWARM_TIME_LIMIT * 2,
+        blocking_timeout=0
+    )
+    if not lock.acquire():
+        return None
+
+    try:
+        deadline = time.monotonic() + settings.CACHE_PREWARM_TIME_LIMIT
+        warmed = skipped = 0
+
+        for cache, cache_params, compute in prewarm_jobs(top_search_queries(query_limit, days)):
+            if cache.has(cache_params):
+                skipped += 1
+                continue
+
+            if time.monotonic() > deadline:
+                logger.info("Stopping cache pre-warm: time limit reached")
+                break
+            if database_busy():
+                logger.info("Stopping cache pre-warm: database is busy")
+                break
+
+            cache.set(cache_params, compute())
+            warmed += 1
+            time.sleep(settings.CACHE_PREWARM_PAUSE_SECONDS)
+
+        logger.info(f"Pre-warmed {warmed} cache entries ({skipped} already cached)")
+        return warmed
+    finally:
+        lock.release()
+
+
+def schedule_cache_prewarm(delay=None):
+    """
+    Queue a pre-warm to run after ``delay`` seconds.
+
+    Calls made while a run is already queued are ignored, so a burst of
+    catalog changes warms the caches once, after the burst.
+    """
+    delay = settings.CACHE_PREWARM_DELAY if delay is None else delay
+
+    try:
+        if not get_redis_connection().set(PREWARM_SCHEDULED_KEY, 1, nx=True, ex=max(delay, 1)):
+            return
+
+        from .tasks import prewarm_discovery_caches
+        prewarm_discovery_caches.apply_async(countdown=delay)
+    except Exception as e:
+        logger.warning(f"Could not schedule cache pre-warm: {str(e)}")
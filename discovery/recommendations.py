@@ -0,0 +1,95 @@
+from django.conf import settings
+from common.cache import CATALOG_VERSION, VersionedCache
+from servers.models import Server
+from .models import ServerNeighbor, ServerUsage, UserPreference
+from .neighbors import NEIGHBORS_VERSION
+
+# Number of most recent usage records whose servers seed neighbour scores
+RECENT_USAGE_LIMIT = 50
+
+# Neighbour scores of the user's recent servers are summed once in a CTE
+# and joined, rather than re-aggregated for every server in the catalog
+RECOMMEND_SQL = """
+WITH recent AS (
+    SELECT server_id FROM {usage}
+    WHERE user_id = %(user_id)s
+    ORDER BY created_at DESC
+    LIMIT %(recent_limit)s
+), neighbor_scores AS (
+    SELECT neighbor_id, SUM(score) AS score
+    FROM {neighbors}
+    WHERE server_id IN (SELECT server_id FROM recent)
+    GROUP BY neighbor_id
+)
+SELECT {columns},
+       COALESCE(neighbor_scores.score, 0) AS neighbor_score,
+       (SELECT COUNT(*) FROM unnest(%(tags)s::text[]) AS tag WHERE tag = ANY(server.tags)) AS tag_matches
+FROM {servers} AS server
+LEFT JOIN neighbor_scores ON neighbor_scores.neighbor_id = server.id
+WHERE NOT EXISTS (
+        SELECT 1 FROM {usage} WHERE user_id = %(user_id)s AND server_id = server.id
+    )
+  AND NOT EXISTS (
+        SELECT 1 FROM {excluded} WHERE userpreference_id = %(preferences_id)s AND server_id = server.id
+    )
+  AND server.validation_status <> %(invalid)s
+  AND (%(type)s::text IS NULL OR server.types @> ARRAY[%(type)s::varchar])
+ORDER BY neighbor_score DESC, tag_matches DESC, server.usage_count DESC, server.id
+LIMIT %(limit)s
+"""
+
+REASON_NEIGHBORS = "Used by people who use the same servers as you"
+REASON_TAGS = "Based on your preferred tags"
+REASON_POPULAR = "Popular among users"
+
+# Per-user recommendation lists; also keyed on the user's version group,
+# which is bumped by new usage records and preference changes
+recommendation_cache = VersionedCache(
+    'recommend',
+    timeout=settings.RECOMMENDATION_CACHE_TIMEOUT,
+    versions=(CATALOG_VERSION, NEIGHBORS_VERSION)
+)
+
+
+def recommend_servers(user, preferences, server_type=None, limit=5):
+    """
+    Rank servers for ``user`` in a single query.
+
+    Servers are ordered by neighbour score (similarity to the servers the
+    user recently used), then by the number of preferred tags they carry,
+    then by popularity. Servers the user has used or excluded are removed
+    with NOT EXISTS anti-joins and the limit is applied in SQL. Returns a
+    list of servers with ``recommendation_reason`` set.
+    """
+    tables = {
+        'usage': ServerUsage._meta.db_table,
+        'neighbors': ServerNeighbor._meta.db_table,
+        'excluded': UserPreference.excluded_servers.through._meta.db_table,
+        'servers': Server._meta.db_table,
+        # The stored search document is never serialized
+        'columns': ', '.join(
+            f'server.{field.column}' for field in Server._meta.concrete_fields
+            if field.name != 'search_vector'
+        ),
+    }
+    params = {
+        'user_id': user.pk,
+        'recent_limit': RECENT_USAGE_LIMIT,
+        'preferences_id': preferences.pk,
+        'tags': list(preferences.preferred_tags),
+        'invalid': Server.VALIDATION_INVALID,
+        'type': server_type or None,
+        'limit': limit,
+    }
+    recommendations = list(Server.objects.raw(RECOMMEND_SQL.format(**tables), params))
+
+    # Set here rather than in SQL, where the ranking expressions would be repeated
+    for server in recommendations:
+        if server.neighbor_score > 0:
+            server.recommendation_reason = REASON_NEIGHBORS
+        elif server.tag_matches > 0:
+            server.recommendation_reason = REASON_TAGS
+        else:
+            server.recommendation_reason = REASON_POPULAR
+
+    return recommendations
@@ -0,0 +1,323 @@
+from collections import defaultdict
+from django.conf import settings
+from django.contrib.postgres.search import SearchHeadline, SearchRank, TrigramWordSimilarity
+from django.db import connection
+from django.db.models import F, Max, Q
+from django.db.models.functions import Greatest
+from common.cache import VersionedCache
+from servers.models import Server, ServerCapability
+from .semantic import semantic_index
+
+# Fields that get a ts_headline excerpt in search results
+HIGHLIGHT_FIELDS = ['description']
+
+HIGHLIGHT_START_SEL = '<mark>'
+HIGHLIGHT_STOP_SEL = '</mark>'
+
+# Result pages for SearchView, invalidated whenever the catalog changes
+search_cache = VersionedCache('search', timeout=settings.SEARCH_CACHE_TIMEOUT)
+
+# Autocomplete responses, invalidated the same way but kept only briefly
+suggest_cache = VersionedCache('suggest', timeout=settings.SUGGEST_CACHE_TIMEOUT)
+
+# Reciprocal rank fusion constant for hybrid search; larger values flatten
+# the advantage of the top few results of either ranking
+HYBRID_RRF_K = 60
+
+# Facet name -> (grouping expression, join it needs) over the ``matches`` CTE
+# used by compute_facets. Array facets are unnested with LEFT JOINs so servers
+# without types or tags still count towards the other facets.
+FACETS = {
+    'type': ('facet_type.value', 'LEFT JOIN LATERAL unnest(matches.types) AS facet_type(value) ON true'),
+    'tags': ('facet_tag.value', 'LEFT JOIN LATERAL unnest(matches.tags) AS facet_tag(value) ON true'),
+    'verified': ('matches.verified', None),
+}
+
+# Prefixes shorter than this produce too few trigrams to be selective
+SUGGEST_MIN_PREFIX_LENGTH = 2
+
+# Distinct tags matching a prefix, ranked by word similarity. The row filter
+# uses the server_tags_trgm_idx expression index; the per-tag filter drops
+# the other tags of matching servers.
+TAG_SUGGESTIONS_SQL = """
+SELECT tag, MAX(word_similarity(%s, tag)) AS similarity
+FROM servers_server, unnest(tags) AS tag
+WHERE servers_tags_text(tags) %%> %s AND %s <%% tag
+GROUP BY tag
+ORDER BY similarity DESC, COUNT(*) DESC, tag
+LIMIT %s
+"""
+
+
+def normalize_query(query):
+    """Normalize a search query for caching and aggregation."""
+    return ' '.join(query.lower().split())
+
+
+def normalize_tags(tags):
+    """Normalize a comma-separated tag filter into a sorted list."""
+    if not tags:
+        return []
+    return sorted({tag.strip() for tag in tags.split(',') if tag.strip()})
+
+
+def normalize_prefix(prefix):
+    """Normalize an autocomplete prefix for matching and caching."""
+    return ' '.join(prefix.lower().split())
+
+
+def search_cache_params(params, request):
+    """
+    Build the normalized cache key parameters for a search request.
+
+    ``params`` are the validated SearchParamsSerializer values, with the
+    type already normalized, so the key matches the filter; paging comes
+    from the raw query string because the paginator reads it from there.
+    """
+    return {
+        'q': normalize_query(params['q']),
+        'type': params.get('type') or '',
+        'tags': normalize_tags(params.get('tags')),
+        'verified': params.get('verified'),
+        'mode': params['mode'],
+        'facets': params.get('facets', []),
+        'page': request.query_params.get('page', '1').strip(),
+        'limit': request.query_params.get('limit', '').strip(),
+        'highlight_fragments': params['highlight_fragments'],
+        'highlight_words': params['highlight_words'],
+    }
+
+
+def attach_highlights(servers, search_query, max_fragments=1, max_words=20):
+    """
+    Set a ``highlight`` dict on each server in ``servers``.
+
+    Excerpts are generated by ``ts_headline`` in a single query restricted to
+    the given servers, so highlighting cost depends on the page size rather
+    than on the number of matches. Fields without a match are omitted, and
+    no query is made when ``search_query`` is None.
+    """
+    servers = list(servers)
+    for server in servers:
+        server.highlight = {}
+
+    if not servers or search_query is None:
+        return servers
+
+    annotations = {
+        f'{field}_highlight': SearchHeadline(
+            field,
+            search_query,
+            config=settings.SEARCH_CONFIG,
+            start_sel=HIGHLIGHT_START_SEL,
+            stop_sel=HIGHLIGHT_STOP_SEL,
+            max_fragments=max_fragments,
+            max_words=max_words,
+            min_words=max(1, max_words // 3),
+            fragment_delimiter=' ... ',
+        )
+        for field in HIGHLIGHT_FIELDS
+    }
+
+    headlines = Server.objects.filter(
+        id__in=[server.id for server in servers]
+    ).order_by().annotate(**annotations).values('id', *annotations.keys())
+    headlines_by_id = {row['id']: row for row in headlines}
+
+    for server in servers:
+        row = headlines_by_id.get(server.id, {})
+        for field in HIGHLIGHT_FIELDS:
+            headline = row.get(f'{field}_highlight')
+            # ts_headline falls back to the start of the text when nothing matches
+            if headline and HIGHLIGHT_START_SEL in headline:
+                server.highlight[field] = headline
+
+    return servers
+
+
+def fuzzy_search_queryset(queryset, query):
+    """
+    Rank ``queryset`` by trigram word similarity to ``query``.
+
+    Used when full-text search finds nothing, typically because of a typo.
+    The ``%>`` filters are served by the name and provider trigram indexes.
+    """
+    return queryset.filter(
+        Q(name__trigram_word_similar=query) | Q(provider__trigram_word_similar=query)
+    ).annotate(
+        relevance_score=Greatest(
+            TrigramWordSimilarity(query, 'name'),
+            TrigramWordSimilarity(query, 'provider')
+        )
+    ).order_by('-relevance_score', 'name')
+
+
+def get_suggestions(prefix, limit):
+    """
+    Get autocomplete suggestions for ``prefix``.
+
+    Server names, providers, tags and capability names are each matched with
+    an index-backed trigram word similarity filter, then merged by similarity.
+    Returns a list of compact dicts with ``text`` and ``kind`` keys; server
+    suggestions also carry the server ``id`` and ``slug``.
+    """
+    if len(prefix) < SUGGEST_MIN_PREFIX_LENGTH:
+        return []
+
+    candidates = []
+
+    servers = Server.objects.filter(
+        name__trigram_word_similar=prefix
+    ).exclude(
+        validation_status=Server.VALIDATION_INVALID
+    ).annotate(
+        similarity=TrigramWordSimilarity(prefix, 'name')
+    ).order_by('-similarity', 'name').values('id', 'slug', 'name', 'similarity')[:limit]
+    for row in servers:
+        candidates.append((row['similarity'], {
+            'text': row['name'],
+            'kind': 'server',
+            'id': str(row['id']),
+            'slug': row['slug'],
+        }))
+
+    providers = Server.objects.filter(
+        provider__trigram_word_similar=prefix
+    ).values('provider').annotate(
+        similarity=Max(TrigramWordSimilarity(prefix, 'provider'))
+    ).order_by('-similarity', 'provider')[:limit]
+    for row in providers:
+        candidates.append((row['similarity'], {'text': row['provider'], 'kind': 'provider'}))
+
+    with connection.cursor() as cursor:
+        cursor.execute(TAG_SUGGESTIONS_SQL, [prefix, prefix, prefix, limit])
+        for tag, similarity in cursor.fetchall():
+            candidates.append((similarity, {'text': tag, 'kind': 'tag'}))
+
+    capabilities = ServerCapability.objects.filter(
+        name__trigram_word_similar=prefix
+    ).values('name').annotate(
+        similarity=Max(TrigramWordSimilarity(prefix, 'name'))
+    ).order_by('-similarity', 'name')[:limit]
+    for row in capabilities:
+        candidates.append((row['similarity'], {'text': row['name'], 'kind': 'capability'}))
+
+    # Stable sort keeps the server > provider > tag > capability order on ties
+    candidates.sort(key=lambda candidate: candidate[0], reverse=True)
+    return [suggestion for _, suggestion in candidates[:limit]]
+
+
+def semantic_ranking(queryset, query, search_query, hybrid=False):
+    """
+    Rank the servers in ``queryset`` by semantic similarity to ``query``.
+
+    Returns ``(server_id, score)`` pairs, best first, or None if no semantic
+    index has been built. The nearest neighbours come from the vector index
+    and the request's filters are then applied to them in a single query.
+    With ``hybrid``, the semantic and full-text rankings are merged with
+    reciprocal rank fusion, so scores are fused ranks, not similarities.
+    """
+    if not semantic_index.available():
+        return None
+
+    candidates = [
+        (server_id, score)
+        for server_id, score in semantic_index.search(query, settings.SEMANTIC_CANDIDATES)
+        if score >= settings.SEMANTIC_MIN_SCORE
+    ]
+    allowed = {
+        str(server_id) for server_id in queryset.filter(
+            id__in=[server_id for server_id, _ in candidates]
+        ).order_by().values_list('id', flat=True)
+    }
+    ranking = [(server_id, score) for server_id, score in candidates if server_id in allowed]
+
+    if not hybrid:
+        return ranking
+
+    keyword_ids = queryset.filter(
+        search_vector=search_query
+    ).annotate(
+        rank=SearchRank(F('search_vector'), search_query)
+    ).order_by('-rank').values_list('id', flat=True)[:settings.SEMANTIC_CANDIDATES]
+
+    fused = defaultdict(float)
+    for ids in ([server_id for server_id, _ in ranking], [str(server_id) for server_id in keyword_ids]):
+        for position, server_id in enumerate(ids, start=1):
+            fused[server_id] += 1.0 / (HYBRID_RRF_K + position)
+
+    return sorted(fused.items(), key=lambda item: item[1], reverse=True)
+
+
+def load_ranked_servers(queryset, ranking):
+    """
+    Fetch the servers of a ``(server_id, score)`` ranking in ranked order.
+
+    Each server gets the score as its ``relevance_score``.
+    """
+    servers = {
+        str(server_id): server
+        for server_id, server in queryset.in_bulk([server_id for server_id, _ in ranking]).items()
+    }
+
+    results = []
+    for server_id, score in ranking:
+        server = servers.get(server_id)
+        if server is not None:
+            server.relevance_score = score
+            results.append(server)
+
+    return results
+
+
+def compute_facets(queryset, facets):
+    """
+    Count the servers in ``queryset`` per value of each requested facet.
+
+    All facets are computed in one query: the match set becomes a CTE, array
+    fields are unnested and a GROUPING SETS aggregation produces one group
+    per facet value. COUNT(DISTINCT) keeps servers counted once per value
+    despite the row multiplication from unnesting several arrays.
+
+    Returns ``{facet: {value: count}}`` with values ordered by count.
+    """
+    if not facets:
+        return {}
+
+    match_sql, match_params = queryset.order_by().values(
+        'id', 'types', 'tags', 'verified'
+    ).query.sql_with_params()
+
+    columns = [FACETS[facet][0] for facet in facets]
+    joins = [FACETS[facet][1] for facet in facets if FACETS[facet][1]]
+
+    sql = f"""
+        WITH matches AS ({match_sql})
+        SELECT {', '.join(columns)},
+               {', '.join(f'GROUPING({column})' for column in columns)},
+               COUNT(DISTINCT matches.id)
+        FROM matches
+        {' '.join(joins)}
+        GROUP BY GROUPING SETS ({', '.join(f'({column})' for column in columns)})
+    """
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, match_params)
+        rows = cursor.fetchall()
+
+    counts = {facet: {} for facet in facets}
+    for row in rows:
+        values, grouping, count = row[:len(facets)], row[len(facets):-1], row[-1]
+        # GROUPING() is 0 for the column the row is grouped by
+        index = grouping.index(0)
+        value = values[index]
+        if value is None:
+            continue
+        if isinstance(value, bool):
+            value = 'true' if value else 'false'
+        counts[facets[index]][value] = count
+
+    return {
+        facet: dict(sorted(values.items(), key=lambda item: (-item[1], item[0])))
+        for facet, values in counts.items()
+    }
@@ -0,0 +1,331 @@
+import json
+import logging
+import os
+import threading
+import uuid
+import joblib
+import numpy as np
+from django.conf import settings
+from django.db.models import Prefetch
+from django.utils import timezone
+from sklearn.decomposition import TruncatedSVD
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import Normalizer
+from common.redis_client import get_redis_connection
+from servers.models import Server, ServerCapability
+
+logger = logging.getLogger('mcp_nexus')
+
+# The manifest names the model, vector and id files of the live index.
+# Writers create new files and then replace the manifest, so readers always
+# see a complete index.
+MANIFEST_NAME = 'manifest.json'
+
+# Serializes full builds and incremental updates across workers
+SEMANTIC_INDEX_LOCK_KEY = 'discovery:semantic_index:lock'
+
+# Redis set of server ids whose vectors need to be recomputed
+SEMANTIC_PENDING_KEY = 'discovery:semantic_index:pending'
+
+
+def server_documents(server_ids=None):
+    """
+    Yield ``(server_id, text)`` pairs for the semantic index.
+
+    A server's document combines its name, description and tags with the
+    names, descriptions and examples of its capabilities.
+    """
+    queryset = Server.objects.only(
+        'id', 'name', 'description', 'tags'
+    ).prefetch_related(
+        Prefetch(
+            'capabilities',
+            queryset=ServerCapability.objects.only('server_id', 'name', 'description', 'examples')
+        )
+    ).order_by('id')
+
+    if server_ids is not None:
+        queryset = queryset.filter(id__in=server_ids)
+
+    for server in queryset.iterator(chunk_size=500):
+        parts = [server.name, server.description, ' '.join(server.tags or [])]
+        for capability in server.capabilities.all():
+            parts.append(capability.name)
+            parts.append(capability.description)
+            parts.extend(capability.examples or [])
+        yield str(server.id), '\n'.join(part for part in parts if part)
+
+
+def _build_model():
+    """Create the TF-IDF -> LSA -> L2 normalization pipeline."""
+    return make_pipeline(
+        TfidfVectorizer(
+            stop_words='english',
+            sublinear_tf=True,
+            ngram_range=(1, 2),
+            max_features=50000,
+            dtype=np.float32
+        ),
+        TruncatedSVD(n_components=settings.SEMANTIC_DIMENSIONS, random_state=0),
+        Normalizer(copy=False)
+    )
+
+
+def _write_index(index_dir, ids, vectors, model=None, model_file=None, built_at=None):
+    """
+    Write a new index generation and make it live.
+
+    Either a freshly fitted ``model`` or the ``model_file`` of the current
+    generation must be given. Files that are no longer referenced are
+    removed; processes that still have them mapped keep a valid mapping.
+    """
+    os.makedirs(index_dir, exist_ok=True)
+    generation = uuid.uuid4().hex[:12]
+
+    if model is not None:
+        model_file = f'model-{generation}.joblib'
+        joblib.dump(model, os.path.join(index_dir, model_file))
+
+    vectors_file = f'vectors-{generation}.npy'
+    ids_file = f'ids-{generation}.npy'
+    np.save(os.path.join(index_dir, vectors_file), np.ascontiguousarray(vectors, dtype=np.float32))
+    np.save(os.path.join(index_dir, ids_file), np.asarray(ids, dtype='U36'))
+
+    now = timezone.now().isoformat()
+    manifest = {
+        'model': model_file,
+        'vectors': vectors_file,
+        'ids': ids_file,
+        'count': len(ids),
+        'dimensions': int(vectors.shape[1]) if len(ids) else 0,
+        'built_at': built_at or now,
+        'updated_at': now,
+    }
+
+    manifest_path = os.path.join(index_dir, MANIFEST_NAME)
+    tmp_path = f'{manifest_path}.{generation}.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f)
+    os.replace(tmp_path, manifest_path)
+
+    live_files = {MANIFEST_NAME, model_file, vectors_file, ids_file}
+    for name in os.listdir(index_dir):
+        if name not in live_files and not name.endswith('.tmp'):
+            try:
+                os.remove(os.path.join(index_dir, name))
+            except OSError as e:
+                logger.warning(f"Could not remove stale semantic index file {name}: {str(e)}")
+
+    return manifest
+
+
+class SemanticIndex:
+    """
+    Read side of the on-disk semantic index.
+
+    The vector matrix is memory-mapped, so it is shared between worker
+    processes through the page cache instead of being copied into each one.
+    The manifest is checked on every query and the index is reloaded when a
+    build or incremental update has replaced it.
+    """
+
+    def __init__(self, index_dir):
+        self.index_dir = index_dir
+        self._state = None
+        self._manifest_mtime = None
+        self._lock = threading.Lock()
+
+    def load(self):
+        """Get the current index state, or None if no index has been built."""
+        manifest_path = os.path.join(self.index_dir, MANIFEST_NAME)
+        try:
+            mtime = os.stat(manifest_path).st_mtime_ns
+        except FileNotFoundError:
+            self._state = None
+            self._manifest_mtime = None
+            return None
+
+        if mtime == self._manifest_mtime:
+            return self._state
+
+        with self._lock:
+            if mtime == self._manifest_mtime:
+                return self._state
+
+            try:
+                with open(manifest_path) as f:
+                    manifest = json.load(f)
+
+                previous = self._state
+                if previous is not None and previous['manifest']['model'] == manifest['model']:
+                    model = previous['model']
+                else:
+                    model = joblib.load(os.path.join(self.index_dir, manifest['model']))
+
+                self._state = {
+                    'manifest': manifest,
+                    'model': model,
+                    'ids': np.load(os.path.join(self.index_dir, manifest['ids'])),
+                    'vectors': np.load(os.path.join(self.index_dir, manifest['vectors']), mmap_mode='r'),
+                }
+                self._manifest_mtime = mtime
+            except Exception as e:
+                # Keep serving the previous generation
+                logger.error(f"Error loading semantic index: {str(e)}", exc_info=True)
+
+        return self._state
+
+    def available(self):
+        """Check whether an index has been built."""
+        state = self.load()
+        return state is not None and len(state['ids']) > 0
+
+    def embed(self, text, state=None):
+        """Project ``text`` into the index's vector space."""
+        state = state or self.load()
+        return state['model'].transform([text]).astype(np.float32)[0]
+
+    def search(self, query, k):
+        """
+        Get the ``k`` servers closest to ``query``.
+
+        Returns ``(server_id, score)`` pairs ordered by descending cosine
+        similarity. Scoring is one matrix-vector product over the mapped
+        matrix followed by a partial sort.
+        """
+        state = self.load()
+        if state is None or len(state['ids']) == 0:
+            return []
+
+        query_vector = self.embed(query, state)
+        if not query_vector.any():
+            # No query term is in the vocabulary
+            return []
+
+        scores = state['vectors'] @ query_vector
+        k = min(k, scores.shape[0])
+        top = np.argpartition(scores, -k)[-k:]
+        top = top[np.argsort(scores[top])[::-1]]
+
+        return list(zip(state['ids'][top].tolist(), scores[top].tolist()))
+
+    def build(self):
+        """
+        Fit a new model on every server and replace the index.
+
+        Returns the new manifest, or None if there are too few servers to fit
+        a model.
+        """
+        ids, texts = [], []
+        for server_id, text in server_documents():
+            ids.append(server_id)
+            texts.append(text)
+
+        if len(ids) < 2:
+            logger.info("Not enough servers to build the semantic index")
+            return None
+
+        model = _build_model()
+        vectorizer, svd, normalizer = (step for _, step in model.steps)
+
+        # Fit the vocabulary first so the SVD rank can be bounded by it
+        tfidf = vectorizer.fit_transform(texts)
+        svd.set_params(n_components=max(1, min(svd.n_components, tfidf.shape[0] - 1, tfidf.shape[1] - 1)))
+        vectors = normalizer.fit_transform(svd.fit_transform(tfidf))
+
+        return _write_index(self.index_dir, ids, vectors.astype(np.float32), model=model)
+
+    def update(self, server_ids):
+        """
+        Recompute the vectors of ``server_ids`` with the current model.
+
+        Servers that no longer exist are dropped from the index and new ones
+        are appended. The model is not refitted, so new vocabulary is only
+        picked up by the next full build. Returns the number of servers
+        processed, or None if no index has been built yet.
+        """
+        state = self.load()
+        if state is None:
+            return None
+
+        server_ids = {str(server_id) for server_id in server_ids}
+        ids, texts = [], []
+        for server_id, text in server_documents(server_ids):
+            ids.append(server_id)
+            texts.append(text)
+
+        keep = ~np.isin(state['ids'], list(server_ids))
+        new_ids = np.concatenate([state['ids'][keep], np.asarray(ids, dtype='U36')])
+        dimensions = state['vectors'].shape[1]
+        new_vectors = np.empty((new_ids.shape[0], dimensions), dtype=np.float32)
+        kept = int(keep.sum())
+        new_vectors[:kept] = state['vectors'][keep]
+        if texts:
+            new_vectors[kept:] = state['model'].transform(texts)
+
+        _write_index(
+            self.index_dir,
+            new_ids,
+            new_vectors,
+            model_file=state['manifest']['model'],
+            built_at=state['manifest']['built_at']
+        )
+        return len(server_ids)
+
+    def lock(self, blocking_timeout=None):
+        """Get the Redis lock that serializes writers."""
+        return get_redis_connection().lock(
+            SEMANTIC_INDEX_LOCK_KEY,
+            timeout=settings.SEMANTIC_INDEX_LOCK_TIMEOUT,
+            blocking_timeout=blocking_timeout
+        )
+
+
+semantic_index = SemanticIndex(settings.SEMANTIC_INDEX_DIR)
+
+
+def queue_semantic_update(*server_ids):
+    """Mark servers for the next incremental semantic index update."""
+    server_ids = [server_id for server_id in server_ids if server_id is not None]
+    if not server_ids:
+        return
+    try:
+        get_redis_connection().sadd(SEMANTIC_PENDING_KEY, *[str(server_id) for server_id in server_ids])
+    except Exception as e:
+        logger.warning(f"Could not queue semantic index update for {len(server_ids)} servers: {str(e)}")
+
+
+def update_semantic_index(batch_size=500):
+    """
+    Apply queued incremental updates to the semantic index.
+
+    Returns the number of servers updated. If another writer holds the lock
+    the queue is left alone for the next run.
+    """
+    connection = get_redis_connection()
+    lock = semantic_index.lock(blocking_timeout=0)
+    if not lock.acquire():
+        return 0
+
+    try:
+        server_ids = []
+        for server_id in connection.spop(SEMANTIC_PENDING_KEY, batch_size) or []:
+            try:
+                server_ids.append(str(uuid.UUID(server_id.decode())))
+            except ValueError:
+                # Retrying an id that is not a UUID would fail every later batch
+                logger.warning(f"Dropping invalid server id from the semantic update queue: {server_id!r}")
+        if not server_ids:
+            return 0
+
+        try:
+            updated = semantic_index.update(server_ids)
+        except Exception:
+            connection.sadd(SEMANTIC_PENDING_KEY, *server_ids)
+            raise
+
+        # Without an index there is nothing to update; the next build covers them
+        return updated or 0
+    finally:
+        lock.release()
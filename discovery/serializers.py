@@ -1,13 +1,21 @@
 from rest_framework import serializers
-from servers.models import Server
-from servers.serializers import ServerSummarySerializer
+from servers.models import Server, ServerCapability
+from servers.serializers import CapabilityParameterSerializer, ServerSummarySerializer
 from .models import SearchHistory, ServerUsage, UserPreference
 
+class ServerTypeField(serializers.CharField):
+    """
+    Server type filter, normalized once so the cache key and the database
+    filter always see the same value.
+    """
+    def to_internal_value(self, data):
+        return super().to_internal_value(data).lower()
+
 class SearchHistorySerializer(serializers.ModelSerializer):
     """Serializer for search history records."""
     class Meta:
         model = SearchHistory
-        fields = ['id', 'query', 'filters', 'results_count', 'created_at']
+        fields = ['id', 'query', 'filters', 'results_count', 'latency_ms', 'created_at']
         read_only_fields = fields
 
 class ServerUsageSerializer(serializers.ModelSerializer):
@@ -40,12 +48,83 @@ class ServerSearchResultSerializer(ServerSummarySerializer):
     class Meta(ServerSummarySerializer.Meta):
         fields = ServerSummarySerializer.Meta.fields + ['relevance_score', 'highlight']
 
+class TrendingServerSerializer(ServerSummarySerializer):
+    """Serializer for trending servers, extending the summary serializer with the trend score."""
+    trend_score = serializers.FloatField(read_only=True)
+
+    class Meta(ServerSummarySerializer.Meta):
+        fields = ServerSummarySerializer.Meta.fields + ['trend_score']
+
 class SearchParamsSerializer(serializers.Serializer):
     """Serializer for search parameters."""
     q = serializers.CharField(required=True, help_text="Search query")
-    type = serializers.CharField(required=False, help_text="Filter by server type")
+    type = ServerTypeField(required=False, help_text="Filter by server type")
     tags = serializers.CharField(required=False, help_text="Filter by tags (comma-separated)")
-    verified = serializers.BooleanField(required=False, help_text="Filter by verification status")
+    verified = serializers.BooleanField(required=False, allow_null=True, help_text="Filter by verification status")
+    mode = serializers.ChoiceField(
+        choices=['keyword', 'semantic', 'hybrid'],
+        default='keyword',
+        help_text="Ranking mode: full-text, vector similarity, or both fused"
+    )
+    facets = serializers.CharField(
+        required=False,
+        help_text="Facet counts to include (comma-separated: type, tags, verified)"
+    )
+    highlight_fragments = serializers.IntegerField(
+        min_value=1,
+        max_value=5,
+        default=1,
+        help_text="Maximum number of highlighted fragments per field"
+    )
+    highlight_words = serializers.IntegerField(
+        min_value=5,
+        max_value=100,
+        default=20,
+        help_text="Maximum number of words per highlighted fragment"
+    )
+
+    def validate_facets(self, value):
+        """Parse the facet list, keeping a stable order for caching."""
+        allowed = ['type', 'tags', 'verified']
+        facets = {facet.strip() for facet in value.split(',') if facet.strip()}
+        unknown = facets - set(allowed)
+        if unknown:
+            raise serializers.ValidationError(
+                f"Unknown facets: {', '.join(sorted(unknown))}. Allowed: {', '.join(allowed)}"
+            )
+        return [facet for facet in allowed if facet in facets]
+
+class CapabilitySearchResultSerializer(serializers.ModelSerializer):
+    """Serializer for capability search results, including the owning server."""
+    parameters = CapabilityParameterSerializer(many=True, read_only=True)
+    server = ServerSummarySerializer(read_only=True)
+    relevance_score = serializers.FloatField(read_only=True)
+
+    class Meta:
+        model = ServerCapability
+        fields = ['id', 'name', 'description', 'type', 'examples', 'parameters',
+                  'relevance_score', 'server']
+        read_only_fields = fields
+
+class CapabilitySearchParamsSerializer(serializers.Serializer):
+    """Serializer for capability search parameters."""
+    q = serializers.CharField(required=True, help_text="Search query")
+    type = serializers.CharField(required=False, help_text="Filter by capability type")
+    verified = serializers.BooleanField(required=False, allow_null=True, help_text="Filter by server verification status")
+
+class SuggestParamsSerializer(serializers.Serializer):
+    """Serializer for autocomplete parameters."""
+    prefix = serializers.CharField(
+        max_length=100,
+        trim_whitespace=True,
+        help_text="Text typed so far"
+    )
+    limit = serializers.IntegerField(
+        min_value=1,
+        max_value=20,
+        default=8,
+        help_text="Maximum number of suggestions to return"
+    )
 
 class ServerRecommendationSerializer(ServerSummarySerializer):
     """Serializer for server recommendations."""
@@ -54,9 +133,28 @@ class ServerRecommendationSerializer(ServerSummarySerializer):
     class Meta(ServerSummarySerializer.Meta):
         fields = ServerSummarySerializer.Meta.fields + ['recommendation_reason']
 
+class RecommendationParamsSerializer(serializers.Serializer):
+    """Serializer for recommendation request parameters."""
+    type = ServerTypeField(required=False, help_text="Filter by server type")
+    limit = serializers.IntegerField(
+        min_value=1,
+        max_value=50,
+        default=5,
+        help_text="Maximum number of recommendations"
+    )
+
+class AlsoUsedParamsSerializer(serializers.Serializer):
+    """Serializer for also-used request parameters."""
+    limit = serializers.IntegerField(
+        min_value=1,
+        max_value=50,
+        default=10,
+        help_text="Maximum number of servers to return"
+    )
+
 class PopularServersParamsSerializer(serializers.Serializer):
     """Serializer for popular servers request parameters."""
-    type = serializers.CharField(required=False, help_text="Filter by server type")
+    type = ServerTypeField(required=False, help_text="Filter by server type")
     period = serializers.ChoiceField(
         choices=['day', 'week', 'month', 'all_time'],
         default='week',
@@ -67,4 +165,46 @@ class PopularServersParamsSerializer(serializers.Serializer):
         max_value=50,
         default=10,
         help_text="Maximum number of servers to return"
-    )
\ No newline at end of file
+    )
+
+
+class TrendingServersParamsSerializer(serializers.Serializer):
+    """Serializer for trending servers request parameters."""
+    type = ServerTypeField(required=False, help_text="Filter by server type")
+    limit = serializers.IntegerField(
+        min_value=1,
+        max_value=50,
+        default=10,
+        help_text="Maximum number of servers to return"
+    )
+
+
+class SearchQueryStatsSerializer(serializers.Serializer):
+    """Serializer for per-query search statistics summed over a date range."""
+    query = serializers.CharField(read_only=True)
+    searches = serializers.IntegerField(read_only=True)
+    zero_results = serializers.IntegerField(read_only=True)
+    zero_result_rate = serializers.FloatField(read_only=True)
+    cache_hit_rate = serializers.FloatField(read_only=True)
+    avg_results = serializers.FloatField(read_only=True)
+    avg_latency_ms = serializers.FloatField(read_only=True)
+    peak_latency_ms = serializers.FloatField(read_only=True)
+
+
+class SearchQueryStatsParamsSerializer(serializers.Serializer):
+    """Serializer for search query statistics request parameters."""
+    days = serializers.IntegerField(
+        min_value=1,
+        max_value=365,
+        default=7,
+        help_text="Number of days to include, counting today"
+    )
+    sort = serializers.ChoiceField(
+        choices=['searches', 'zero_results', 'latency'],
+        default='searches',
+        help_text="Order by search count, zero-result count or average latency"
+    )
+    zero_results_only = serializers.BooleanField(
+        default=False,
+        help_text="Only include queries that returned no results at least once"
+    )
@@ -0,0 +1,109 @@
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_save, post_delete
+from django.dispatch import receiver
+from analytics.models import RequestLog
+from common.cache import CATALOG_VERSION, bump_version, user_version
+from servers.models import Server, ServerCapability
+from servers.signals import server_capabilities_changed, servers_bulk_created
+from verification.models import VerificationRequest
+from .models import ServerPopularity, ServerUsage, UserPreference
+from .prewarm import schedule_cache_prewarm
+from .semantic import queue_semantic_update
+from .trending import record_trend_event
+
+# Server fields that never affect discovery results
+COUNTER_FIELDS = {'usage_count'}
+
+
+@receiver([post_save, post_delete], sender=Server)
+def server_changed(sender, instance, update_fields=None, **kwargs):
+    """Invalidate cached discovery results when a server changes."""
+    if update_fields and set(update_fields) <= COUNTER_FIELDS:
+        return
+    bump_version(CATALOG_VERSION)
+    # Read now: a deleted instance has no pk by the time the transaction commits
+    server_id = instance.pk
+    transaction.on_commit(lambda: queue_semantic_update(server_id))
+    transaction.on_commit(schedule_cache_prewarm)
+
+
+@receiver(post_save, sender=Server)
+def server_created(sender, instance, created, **kwargs):
+    """Give a new server an empty popularity row to rank it by."""
+    if created:
+        ServerPopularity.objects.bulk_create(
+            [ServerPopularity(server=instance)], ignore_conflicts=True
+        )
+
+
+@receiver(servers_bulk_created)
+def servers_created_in_bulk(sender, servers, **kwargs):
+    """Invalidate cached discovery results after a bulk registration."""
+    bump_version(CATALOG_VERSION)
+    ServerPopularity.objects.bulk_create(
+        [ServerPopularity(server=server) for server in servers],
+        ignore_conflicts=True
+    )
+    server_ids = [server.pk for server in servers]
+    transaction.on_commit(lambda: queue_semantic_update(*server_ids))
+    transaction.on_commit(schedule_cache_prewarm)
+
+
+@receiver([post_save, post_delete], sender=ServerCapability)
+def capability_changed(sender, instance, **kwargs):
+    """Invalidate cached discovery results when a capability changes."""
+    bump_version(CATALOG_VERSION)
+    server_id = instance.server_id
+    transaction.on_commit(lambda: queue_semantic_update(server_id))
+    transaction.on_commit(schedule_cache_prewarm)
+
+
+@receiver(server_capabilities_changed)
+def capabilities_synced(sender, server, changes, **kwargs):
+    """Invalidate cached discovery results after a server's capabilities change."""
+    bump_version(CATALOG_VERSION)
+    server_id = server.pk
+    transaction.on_commit(lambda: queue_semantic_update(server_id))
+    transaction.on_commit(schedule_cache_prewarm)
+
+
+@receiver([post_save, post_delete], sender=VerificationRequest)
+def verification_changed(sender, instance, **kwargs):
+    """Invalidate cached discovery results when a verification status changes."""
+    bump_version(CATALOG_VERSION)
+    transaction.on_commit(schedule_cache_prewarm)
+
+
+@receiver([post_save, post_delete], sender=ServerUsage)
+def usage_changed(sender, instance, **kwargs):
+    """Invalidate a user's cached recommendations when they use a server."""
+    bump_version(user_version(instance.user_id))
+
+
+@receiver(post_save, sender=ServerUsage)
+@receiver(post_save, sender=RequestLog)
+def usage_event_recorded(sender, instance, created, **kwargs):
+    """Buffer new usage events for the server's trend counters."""
+    if not created:
+        return
+    occurred_at = instance.created_at if sender is ServerUsage else instance.timestamp
+    transaction.on_commit(lambda: record_trend_event(instance.server_id, occurred_at))
+
+
+@receiver(post_save, sender=UserPreference)
+def preferences_changed(sender, instance, **kwargs):
+    """Invalidate a user's cached recommendations when their preferences change."""
+    bump_version(user_version(instance.user_id))
+
+
+@receiver(m2m_changed, sender=UserPreference.excluded_servers.through)
+def excluded_servers_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    """Invalidate cached recommendations when excluded servers change."""
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+
+    if not reverse:
+        bump_version(user_version(instance.user_id))
+    elif pk_set:
+        for user_id in UserPreference.objects.filter(pk__in=pk_set).values_list('user_id', flat=True):
+            bump_version(user_version(user_id))
@@ -0,0 +1,154 @@
+import logging
+from celery import shared_task
+from celery.signals import worker_ready
+from django.conf import settings
+from django.utils import timezone
+from .history import (
+    flush_search_history as flush_search_history_buffer,
+    prune_search_history as delete_old_search_history
+)
+from .neighbors import rebuild_server_neighbors
+from .popularity import update_server_popularity as refresh_server_popularity
+from .prewarm import schedule_cache_prewarm, warm_discovery_caches
+from .semantic import semantic_index, update_semantic_index as apply_semantic_updates
+from .trending import flush_trend_events, score_trending_servers as refresh_trend_scores
+
+logger = logging.getLogger('mcp_nexus')
+
+@shared_task
+def flush_search_history():
+    """
+    Write buffered search history entries to the database in batches.
+    """
+    try:
+        batch_size = settings.SEARCH_HISTORY_FLUSH_BATCH_SIZE
+        total = 0
+
+        # Drain the buffer, bounded so one run cannot monopolize a worker
+        for _ in range(settings.SEARCH_HISTORY_FLUSH_MAX_BATCHES):
+            flushed = flush_search_history_buffer(
+                batch_size,
+                settings.SEARCH_HISTORY_FLUSH_MAX_ATTEMPTS,
+                settings.SEARCH_HISTORY_FLUSH_MAX_BACKOFF
+            )
+            total += flushed
+            if flushed < batch_size:
+                break
+
+        if total:
+            logger.info(f"Flushed {total} buffered search history entries")
+
+    except Exception as e:
+        logger.error(f"Error flushing search history: {str(e)}", exc_info=True)
+
+
+@shared_task
+def prune_search_history():
+    """
+    Delete search history and query stats past their retention windows.
+    """
+    try:
+        history_deleted, stats_deleted = delete_old_search_history(
+            settings.SEARCH_HISTORY_RETENTION_DAYS,
+            settings.SEARCH_QUERY_STATS_RETENTION_DAYS
+        )
+        logger.info(
+            f"Pruned {history_deleted} search history entries and "
+            f"{stats_deleted} daily query stats"
+        )
+
+    except Exception as e:
+        logger.error(f"Error pruning search history: {str(e)}", exc_info=True)
+
+
+@shared_task
+def rebuild_semantic_index():
+    """
+    Refit the semantic search model and rebuild the index from scratch.
+    """
+    try:
+        with semantic_index.lock():
+            manifest = semantic_index.build()
+
+        if manifest:
+            logger.info(f"Rebuilt semantic index with {manifest['count']} servers")
+
+    except Exception as e:
+        logger.error(f"Error rebuilding semantic index: {str(e)}", exc_info=True)
+
+
+@shared_task
+def update_semantic_index():
+    """
+    Recompute semantic index vectors for servers changed since the last run.
+    """
+    try:
+        updated = apply_semantic_updates(settings.SEMANTIC_UPDATE_BATCH_SIZE)
+
+        if updated:
+            logger.info(f"Updated {updated} servers in the semantic index")
+
+    except Exception as e:
+        logger.error(f"Error updating semantic index: {str(e)}", exc_info=True)
+
+
+@shared_task
+def compute_server_neighbors():
+    """
+    Recompute item-to-item server neighbours from usage co-occurrence.
+    """
+    try:
+        rebuild_server_neighbors(
+            k=settings.RECOMMENDATION_NEIGHBORS,
+            window_days=settings.RECOMMENDATION_USAGE_WINDOW_DAYS,
+            min_co_users=settings.RECOMMENDATION_MIN_CO_USERS
+        )
+
+    except Exception as e:
+        logger.error(f"Error computing server neighbours: {str(e)}", exc_info=True)
+
+
+@shared_task
+def update_server_popularity():
+    """
+    Refresh daily usage buckets and rolling popularity windows.
+    """
+    try:
+        refresh_server_popularity(settings.POPULARITY_REFRESH_DAYS)
+        # The refresh invalidated the cached popular servers responses
+        schedule_cache_prewarm()
+
+    except Exception as e:
+        logger.error(f"Error updating server popularity: {str(e)}", exc_info=True)
+
+
+@shared_task
+def score_trending_servers():
+    """
+    Apply buffered usage events to the decayed counters and recompute trend scores.
+    """
+    try:
+        now = timezone.now()
+        flush_trend_events(now)
+        refresh_trend_scores(now)
+
+    except Exception as e:
+        logger.error(f"Error scoring trending servers: {str(e)}", exc_info=True)
+
+
+@shared_task
+def prewarm_discovery_caches():
+    """
+    Populate the search and popular servers caches ahead of traffic.
+    """
+    try:
+        warm_discovery_caches(settings.CACHE_PREWARM_QUERIES, settings.CACHE_PREWARM_DAYS)
+
+    except Exception as e:
+        logger.error(f"Error pre-warming discovery caches: {str(e)}", exc_info=True)
+
+
+@worker_ready.connect
+def prewarm_on_worker_ready(**kwargs):
+    """Warm the caches after a deploy or restart, before traffic builds up."""
+    schedule_cache_prewarm(delay=0)
@@ -0,0 +1,250 @@
+import logging
+import math
+from datetime import timedelta
+import numpy as np
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+from analytics.models import RequestLog
+from common.redis_client import get_redis_connection
+from servers.models import Server
+from .models import ServerTrend, ServerUsage
+
+logger = logging.getLogger('mcp_nexus')
+
+# Redis hash of "server_id:minute" -> usage events not yet added to the
+# decayed counters; minute buckets keep the buffer small under heavy traffic
+# and are far finer than the half-lives
+TREND_EVENTS_PENDING_KEY = 'discovery:trend_events:pending'
+
+# Decays the stored counters to the later of the two timestamps and adds the
+# new counts, decayed by how far they lie before that point if they arrived
+# late. The decay constants follow the values, in the order they appear.
+# Servers deleted since their events were buffered are skipped.
+APPLY_EVENTS_SQL = """
+INSERT INTO {trends} AS trend (server_id, fast_count, slow_count, last_event_at, trend_score)
+SELECT events.server_id, events.fast_count, events.slow_count, events.last_event_at, 0
+FROM (VALUES {values}) AS events (server_id, fast_count, slow_count, last_event_at)
+JOIN {servers} AS server ON server.id = events.server_id
+ON CONFLICT (server_id) DO UPDATE SET
+    fast_count =
+        trend.fast_count * exp(-%s * GREATEST(extract(epoch FROM EXCLUDED.last_event_at - trend.last_event_at), 0))
+        + EXCLUDED.fast_count * exp(-%s * GREATEST(extract(epoch FROM trend.last_event_at - EXCLUDED.last_event_at), 0)),
+    slow_count =
+        trend.slow_count * exp(-%s * GREATEST(extract(epoch FROM EXCLUDED.last_event_at - trend.last_event_at), 0))
+        + EXCLUDED.slow_count * exp(-%s * GREATEST(extract(epoch FROM trend.last_event_at - EXCLUDED.last_event_at), 0)),
+    last_event_at = GREATEST(trend.last_event_at, EXCLUDED.last_event_at)
+"""
+
+# A decayed counter fed at a steady rate r converges to r / decay, so
+# count * decay estimates the recent event rate over each half-life
+SCORE_SQL = """
+UPDATE {trends} AS trend SET
+    trend_score = (rates.fast_rate - rates.slow_rate) / sqrt(rates.slow_rate + %(prior)s),
+    scored_at = %(now)s
+FROM (
+    SELECT server_id,
+           fast_count * exp(-%(fast_decay)s * GREATEST(extract(epoch FROM %(now)s - last_event_at), 0))
+               * %(fast_decay)s * 3600 AS fast_rate,
+           slow_count * exp(-%(slow_decay)s * GREATEST(extract(epoch FROM %(now)s - last_event_at), 0))
+               * %(slow_decay)s * 3600 AS slow_rate
+    FROM {trends}
+) AS rates
+WHERE rates.server_id = trend.server_id
+"""
+
+BACKFILL_EVENTS_SQL = """
+SELECT server_id, extract(epoch FROM %(now)s - created_at)
+FROM {usage}
+WHERE created_at >= %(since)s AND created_at <= %(now)s
+UNION ALL
+SELECT server_id, extract(epoch FROM %(now)s - timestamp)
+FROM {requests}
+WHERE timestamp >= %(since)s AND timestamp <= %(now)s
+"""
+
+
+def _decay_rates():
+    """Per-second decay constants for the fast and slow counters."""
+    return (
+        math.log(2) / (settings.TRENDING_FAST_HALF_LIFE_HOURS * 3600),
+        math.log(2) / (settings.TRENDING_SLOW_HALF_LIFE_HOURS * 3600),
+    )
+
+
+def _apply_trend_events(events, at, batch_size=1000):
+    """
+    Add decayed event counts to the stored counters.
+
+    ``events`` maps server ids to ``(fast_count, slow_count)`` as of
+    ``at``. Written with one upsert per batch, in a single transaction and
+    in server id order.
+    """
+    fast_decay, slow_decay = _decay_rates()
+    rows = sorted(events.items())
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        for start in range(0, len(rows), batch_size):
+            batch = rows[start:start + batch_size]
+            cursor.execute(
+                APPLY_EVENTS_SQL.format(
+                    trends=ServerTrend._meta.db_table,
+                    servers=Server._meta.db_table,
+                    values=', '.join(
+                        ['(%s::uuid, %s::double precision, %s::double precision, %s::timestamptz)'] * len(batch)
+                    )
+                ),
+                [value for server_id, (fast, slow) in batch for value in (server_id, fast, slow, at)]
+                + [fast_decay, fast_decay, slow_decay, slow_decay]
+            )
+
+
+def record_trend_event(server_id, occurred_at):
+    """
+    Count one usage event towards a server's trend without writing to the database.
+
+    The event is added to a Redis hash, bucketed by minute, and applied to
+    the decayed counters by the next flush_trend_events. If Redis is
+    unavailable the counters are updated directly. Failures are logged and
+    ignored so they never fail the caller.
+    """
+    minute = int(occurred_at.timestamp() // 60)
+    try:
+        get_redis_connection().hincrby(TREND_EVENTS_PENDING_KEY, f'{server_id}:{minute}', 1)
+        return
+    except Exception as e:
+        logger.warning(f"Could not buffer trend event for server {server_id}: {str(e)}")
+
+    try:
+        _apply_trend_events({str(server_id): (1.0, 1.0)}, occurred_at)
+    except Exception as e:
+        logger.warning(f"Could not record trend event for server {server_id}: {str(e)}")
+
+
+def flush_trend_events(now=None, batch_size=1000):
+    """
+    Apply the buffered usage events to the decayed counters as of ``now``.
+
+    The buffer is read and cleared in one Redis transaction, so concurrent
+    flushes never apply the same events. Each minute bucket is decayed from
+    its midpoint to ``now`` and the per-server sums are added with
+    ``_apply_trend_events``. If the database write fails the events are put
+    back for the next run. Returns the number of servers with buffered events.
+    """
+    now = now or timezone.now()
+    redis_connection = get_redis_connection()
+
+    pipeline = redis_connection.pipeline()
+    pipeline.hgetall(TREND_EVENTS_PENDING_KEY)
+    pipeline.delete(TREND_EVENTS_PENDING_KEY)
+    buckets, _ = pipeline.execute()
+
+    if not buckets:
+        return 0
+
+    fast_decay, slow_decay = _decay_rates()
+    events = {}
+    for field, count in buckets.items():
+        server_id, minute = field.decode().rsplit(':', 1)
+        age = max(now.timestamp() - (int(minute) * 60 + 30), 0)
+        fast_count, slow_count = events.get(server_id, (0.0, 0.0))
+        events[server_id] = (
+            fast_count + int(count) * math.exp(-fast_decay * age),
+            slow_count + int(count) * math.exp(-slow_decay * age),
+        )
+
+    try:
+        _apply_trend_events(events, now, batch_size)
+    except Exception:
+        # Put the events back so the next flush can retry them
+        pipeline = redis_connection.pipeline()
+        for field, count in buckets.items():
+            pipeline.hincrby(TREND_EVENTS_PENDING_KEY, field, int(count))
+        pipeline.execute()
+        raise
+
+    return len(events)
+
+
+def score_trending_servers(now=None):
+    """
+    Recompute every server's trend score as of ``now``.
+
+    The score is the difference between the short and long half-life event
+    rates (per hour), scaled by the square root of the long-term rate so a
+    jump from 1 to 5 events per hour outranks a jump from 100 to 104.
+    Returns the number of servers scored.
+    """
+    fast_decay, slow_decay = _decay_rates()
+    with connection.cursor() as cursor:
+        cursor.execute(SCORE_SQL.format(trends=ServerTrend._meta.db_table), {
+            'now': now or timezone.now(),
+            'fast_decay': fast_decay,
+            'slow_decay': slow_decay,
+            'prior': settings.TRENDING_PRIOR_RATE,
+        })
+        return cursor.rowcount
+
+
+def backfill_server_trends(days):
+    """
+    Rebuild all decayed counters from the last ``days`` of usage history.
+
+    Event ages are fetched in chunks and the decayed sums are computed per
+    chunk with numpy (``exp`` over the ages, ``bincount`` per server). The
+    table is then replaced in one transaction and rescored. Events recorded
+    while the backfill runs may be counted twice or not at all, so run it
+    when the counters need repair rather than routinely. Buffered events
+    are discarded, since the history being replayed already has them.
+    """
+    now = timezone.now()
+    try:
+        get_redis_connection().delete(TREND_EVENTS_PENDING_KEY)
+    except Exception as e:
+        logger.warning(f"Could not clear buffered trend events: {str(e)}")
+    fast_decay, slow_decay = _decay_rates()
+    totals = {}
+
+    with connection.cursor() as cursor:
+        cursor.execute(BACKFILL_EVENTS_SQL.format(
+            usage=ServerUsage._meta.db_table,
+            requests=RequestLog._meta.db_table
+        ), {'now': now, 'since': now - timedelta(days=days)})
+
+        while True:
+            rows = cursor.fetchmany(50000)
+            if not rows:
+                break
+
+            events = np.array(rows, dtype=object)
+            server_ids, server_index = np.unique(events[:, 0].astype(str), return_inverse=True)
+            ages = events[:, 1].astype(np.float64)
+
+            fast = np.bincount(server_index, weights=np.exp(-fast_decay * ages), minlength=len(server_ids))
+            slow = np.bincount(server_index, weights=np.exp(-slow_decay * ages), minlength=len(server_ids))
+
+            for server_id, fast_count, slow_count in zip(server_ids.tolist(), fast.tolist(), slow.tolist()):
+                previous = totals.get(server_id, (0.0, 0.0))
+                totals[server_id] = (previous[0] + fast_count, previous[1] + slow_count)
+
+    with transaction.atomic():
+        # Skip servers deleted while the history was being read
+        existing = {
+            str(server_id) for server_id in
+            Server.objects.filter(id__in=list(totals)).values_list('id', flat=True)
+        }
+        ServerTrend.objects.all().delete()
+        ServerTrend.objects.bulk_create([
+            ServerTrend(
+                server_id=server_id,
+                fast_count=fast_count,
+                slow_count=slow_count,
+                last_event_at=now
+            )
+            for server_id, (fast_count, slow_count) in totals.items()
+            if server_id in existing
+        ], batch_size=5000)
+        scored = score_trending_servers(now)
+
+    logger.info(f"Backfilled trend counters for {scored} servers from {days} days of history")
+    return scored
@@ -1,8 +1,14 @@
 from django.urls import path
 from .views import (
     SearchView,
+    SearchCacheStatsView,
+    SearchQueryStatsView,
+    SuggestView,
+    CapabilitySearchView,
     RecommendationsView,
+    AlsoUsedView,
     PopularServersView,
+    TrendingServersView,
     SearchHistoryView,
     ServerUsageHistoryView,
     ServerUsageCreateView,
@@ -11,8 +17,14 @@ from .views import (
 
 urlpatterns = [
     path('search/', SearchView.as_view(), name='search'),
+    path('search/cache/stats/', SearchCacheStatsView.as_view(), name='search-cache-stats'),
+    path('search/analytics/', SearchQueryStatsView.as_view(), name='search-analytics'),
+    path('capabilities/search/', CapabilitySearchView.as_view(), name='capability-search'),
+    path('suggest/', SuggestView.as_view(), name='suggest'),
     path('recommend/', RecommendationsView.as_view(), name='recommend'),
+    path('servers/<uuid:server_id>/also-used/', AlsoUsedView.as_view(), name='also-used'),
     path('popular/', PopularServersView.as_view(), name='popular'),
+    path('trending/', TrendingServersView.as_view(), name='trending'),
     path('history/search/', SearchHistoryView.as_view(), name='search-history'),
     path('history/usage/', ServerUsageHistoryView.as_view(), name='usage-history'),
     path('usage/', ServerUsageCreateView.as_view(), name='record-usage'),
@@ -1,20 +1,50 @@
+import time
 from datetime import timedelta
+from django.conf import settings
+from django.db.models import Avg, F, ExpressionWrapper, FloatField, Max, Prefetch, Sum, fields
+from django.db.models.functions import Cast
+from django.contrib.postgres.search import SearchQuery, SearchRank
 from django.utils import timezone
-from django.db.models import Count, Avg, Q, F, ExpressionWrapper, fields
-from django.contrib.postgres.search import SearchVector, SearchQuery, SearchRank
 from rest_framework import status, views, generics, permissions
+from rest_framework.throttling import ScopedRateThrottle
 from rest_framework.response import Response
 from drf_spectacular.utils import extend_schema, OpenApiParameter
-from servers.models import Server
-from .models import SearchHistory, ServerUsage, UserPreference
+from common.cache import user_version
+from common.pagination import KeysetPagination
+from servers.models import Server, ServerCapability, CapabilityParameter
+from .models import SearchHistory, SearchQueryStats, ServerNeighbor, ServerUsage, UserPreference
+from .history import record_search
+from .popularity import POPULARITY_FIELDS, popular_cache, popular_cache_params
+from .recommendations import recommend_servers, recommendation_cache
+from .search import (
+    attach_highlights,
+    compute_facets,
+    fuzzy_search_queryset,
+    get_suggestions,
+    load_ranked_servers,
+    normalize_prefix,
+    search_cache,
+    search_cache_params,
+    semantic_ranking,
+    suggest_cache
+)
 from .serializers import (
     SearchHistorySerializer,
+    SearchQueryStatsSerializer,
+    SearchQueryStatsParamsSerializer,
     ServerUsageSerializer,
     ServerUsageCreateSerializer,
     UserPreferenceSerializer,
     ServerSearchResultSerializer,
     SearchParamsSerializer,
+    CapabilitySearchResultSerializer,
+    CapabilitySearchParamsSerializer,
+    SuggestParamsSerializer,
     ServerRecommendationSerializer,
+    RecommendationParamsSerializer,
+    AlsoUsedParamsSerializer,
+    TrendingServerSerializer,
+    TrendingServersParamsSerializer,
     PopularServersParamsSerializer
 )
 
@@ -24,6 +54,10 @@ class SearchView(views.APIView):
     """
     permission_classes = [permissions.AllowAny]
 
+    # Whether searches are queued for history and query stats; in-process
+    # benchmarks turn it off through as_view(record_history=False)
+    record_history = True
+
     @extend_schema(
         summary="Search for MCP servers",
         description="Advanced semantic search for discovering MCP servers based on capabilities, functionality, and other criteria.",
@@ -32,24 +66,65 @@ class SearchView(views.APIView):
             OpenApiParameter(name='type', description='Filter by server type', required=False, type=str),
             OpenApiParameter(name='tags', description='Filter by tags (comma-separated)', required=False, type=str),
             OpenApiParameter(name='verified', description='Filter by verification status', required=False, type=bool),
+            OpenApiParameter(name='mode', description='Ranking mode: keyword (default), semantic or hybrid', required=False, type=str),
+            OpenApiParameter(name='facets', description='Facet counts to include (comma-separated: type, tags, verified)', required=False, type=str),
             OpenApiParameter(name='page', description='Page number', required=False, type=int),
             OpenApiParameter(name='limit', description='Results per page', required=False, type=int),
+            OpenApiParameter(name='highlight_fragments', description='Maximum number of highlighted fragments per field', required=False, type=int),
+            OpenApiParameter(name='highlight_words', description='Maximum number of words per highlighted fragment', required=False, type=int),
         ],
         responses={200: ServerSearchResultSerializer(many=True)}
     )
     def get(self, request):
+        started = time.perf_counter()
+
         # Validate search parameters
         serializer = SearchParamsSerializer(data=request.query_params)
         serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+
+        # Serve repeated queries from the result cache
+        cache_params = search_cache_params(params, request)
+        payload = search_cache.get(cache_params)
+        cache_status = 'HIT'
+
+        if payload is None:
+            cache_status = 'MISS'
+            payload = self.get_results(request, params)
+            search_cache.set(cache_params, payload)
+
+        # Queue the search for history and query stats; never waits on the database
+        if self.record_history:
+            record_search(
+                request.user if request.user.is_authenticated else None,
+                query=params['q'],
+                filters={
+                    'type': params.get('type'),
+                    'tags': params.get('tags'),
+                    'verified': params.get('verified')
+                },
+                results_count=payload.get('pagination', {}).get('total', len(payload['data'])),
+                latency_ms=round((time.perf_counter() - started) * 1000, 3),
+                cache_hit=(cache_status == 'HIT')
+            )
+
+        response = Response(payload)
+        response['X-Cache'] = cache_status
+        return response
 
+    def get_results(self, request, params):
+        """Run the search and return the serialized response payload."""
         # Get search parameters
-        query = serializer.validated_data.get('q')
-        server_type = serializer.validated_data.get('type')
-        tags = serializer.validated_data.get('tags')
-        verified = serializer.validated_data.get('verified')
+        query = params.get('q')
+        server_type = params.get('type')
+        tags = params.get('tags')
+        verified = params.get('verified')
 
-        # Start with all servers
-        queryset = Server.objects.all()
+        # Start with all servers whose URL has not failed validation (the
+        # stored search document is never serialized)
+        queryset = Server.objects.defer('search_vector').exclude(
+            validation_status=Server.VALIDATION_INVALID
+        )
 
         # Apply filters
         if server_type:
@@ -63,56 +138,238 @@ class SearchView(views.APIView):
         if verified is not None:
             queryset = queryset.filter(verified=verified)
 
-        # Perform full-text search
-        search_vector = SearchVector('name', weight='A') + \
-                       SearchVector('description', weight='B') + \
-                       SearchVector('provider', weight='C') + \
-                       SearchVector('tags', weight='D')
+        from common.pagination import StandardResultsSetPagination
+        paginator = StandardResultsSetPagination()
+        search_query = SearchQuery(query, config=settings.SEARCH_CONFIG)
+        mode = params['mode']
+        fuzzy = False
+        ranking = None
+
+        if mode != 'keyword':
+            ranking = semantic_ranking(queryset, query, search_query, hybrid=(mode == 'hybrid'))
+            if ranking is None:
+                # No semantic index has been built yet
+                mode = 'keyword'
+
+        if ranking is not None:
+            # Paginate the ranked ids and load only the servers on the page
+            page = paginator.paginate_queryset(ranking, request)
+            results = load_ranked_servers(queryset, page if page is not None else ranking)
+            matches = queryset.filter(id__in=[server_id for server_id, _ in ranking])
+        else:
+            # Perform full-text search against the stored, GIN-indexed search vector
+            matches = queryset.filter(search_vector=search_query)
+
+            # Fall back to trigram similarity when the query matches nothing,
+            # e.g. because of a typo
+            fuzzy = not matches.exists()
+            if fuzzy:
+                queryset = fuzzy_search_queryset(queryset, query)
+            else:
+                queryset = matches.annotate(
+                    relevance_score=SearchRank(F('search_vector'), search_query)
+                ).order_by('-relevance_score')
+
+            matches = queryset
+            page = paginator.paginate_queryset(queryset, request)
+            results = page if page is not None else queryset
+
+        # Highlight only the rows that are actually returned; fuzzy matches
+        # share no lexemes with the query, so there is nothing to highlight
+        results = attach_highlights(
+            results,
+            None if fuzzy else search_query,
+            max_fragments=params['highlight_fragments'],
+            max_words=params['highlight_words']
+        )
+
+        serializer = ServerSearchResultSerializer(results, many=True, context={'request': request})
+        if page is not None:
+            payload = paginator.get_paginated_response(serializer.data).data
+        else:
+            payload = {'data': serializer.data}
+
+        payload['mode'] = mode
+        payload['fuzzy'] = fuzzy
+        if params.get('facets'):
+            # Counts cover the whole match set, not just this page
+            payload['facets'] = compute_facets(matches, params['facets'])
+        return payload
+
+
+class CapabilitySearchView(views.APIView):
+    """
+    API view for searching individual server capabilities.
+    """
+    permission_classes = [permissions.AllowAny]
+    keyset_ordering = ('-relevance_score', 'id')
+
+    @extend_schema(
+        summary="Search for capabilities",
+        description="Full-text search over capability names, descriptions, examples and parameter names. Each result includes its server.",
+        parameters=[
+            OpenApiParameter(name='q', description='Search query', required=True, type=str),
+            OpenApiParameter(name='type', description='Filter by capability type', required=False, type=str),
+            OpenApiParameter(name='verified', description='Filter by server verification status', required=False, type=bool),
+            OpenApiParameter(name='cursor', description='Cursor from the previous page', required=False, type=str),
+            OpenApiParameter(name='limit', description='Results per page', required=False, type=int),
+        ],
+        responses={200: CapabilitySearchResultSerializer(many=True)}
+    )
+    def get(self, request):
+        serializer = CapabilitySearchParamsSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+
+        search_query = SearchQuery(params['q'], config=settings.SEARCH_CONFIG)
+
+        # The owning server is joined in; parameters take one extra query per page
+        queryset = ServerCapability.objects.select_related('server').defer(
+            'search_vector', 'server__search_vector'
+        ).prefetch_related(
+            Prefetch('parameters', queryset=CapabilityParameter.objects.order_by('name'))
+        ).filter(search_vector=search_query).exclude(
+            server__validation_status=Server.VALIDATION_INVALID
+        )
 
-        search_query = SearchQuery(query)
+        if params.get('type'):
+            queryset = queryset.filter(type=params['type'])
 
+        if params.get('verified') is not None:
+            queryset = queryset.filter(server__verified=params['verified'])
+
+        # ts_rank is a float4; as float8 the cursor position round-trips exactly
         queryset = queryset.annotate(
-            search=search_vector,
-            relevance_score=SearchRank(search_vector, search_query)
-        ).filter(search=search_query).order_by('-relevance_score')
-
-        # Extract highlights
-        highlight_fields = ['description']
-        for server in queryset:
-            server.highlight = {}
-            for field in highlight_fields:
-                text = getattr(server, field)
-                # Simple highlight implementation - in production, use a more sophisticated method
-                if text and query.lower() in text.lower():
-                    start = max(0, text.lower().find(query.lower()) - 50)
-                    end = min(len(text), text.lower().find(query.lower()) + len(query) + 50)
-                    highlighted = f"...{text[start:end]}..."
-                    server.highlight[field] = highlighted
-
-        # Record search in history if user is authenticated
-        if request.user.is_authenticated:
-            SearchHistory.objects.create(
-                user=request.user,
-                query=query,
-                filters={
-                    'type': server_type,
-                    'tags': tags,
-                    'verified': verified
-                },
-                results_count=queryset.count()
-            )
+            relevance_score=Cast(SearchRank(F('search_vector'), search_query), FloatField())
+        )
+
+        paginator = KeysetPagination()
+        page = paginator.paginate_queryset(queryset, request, view=self)
+        serializer = CapabilitySearchResultSerializer(page, many=True, context={'request': request})
+        return paginator.get_paginated_response(serializer.data)
+
+
+class SuggestView(views.APIView):
+    """
+    API view for search-as-you-type suggestions.
+
+    Kept separate from SearchView so each keystroke costs a few trigram index
+    lookups (or a cache hit) rather than a full ranked search. Requests are
+    not authenticated and are throttled per client on their own scope.
+    """
+    authentication_classes = []
+    permission_classes = [permissions.AllowAny]
+    throttle_classes = [ScopedRateThrottle]
+    throttle_scope = 'suggest'
+
+    @extend_schema(
+        summary="Autocomplete search input",
+        description="Suggest server names, providers, tags and capability names matching a prefix. Tolerates typos.",
+        parameters=[
+            OpenApiParameter(name='prefix', description='Text typed so far', required=True, type=str),
+            OpenApiParameter(name='limit', description='Maximum number of suggestions', required=False, type=int),
+        ],
+        responses={200: {
+            "type": "object",
+            "properties": {
+                "prefix": {"type": "string"},
+                "suggestions": {"type": "array", "items": {"type": "object"}}
+            }
+        }}
+    )
+    def get(self, request):
+        serializer = SuggestParamsSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        prefix = normalize_prefix(serializer.validated_data['prefix'])
+        limit = serializer.validated_data['limit']
+
+        cache_params = {'prefix': prefix, 'limit': limit}
+        payload = suggest_cache.get(cache_params)
+        cache_status = 'HIT'
+
+        if payload is None:
+            cache_status = 'MISS'
+            payload = {'prefix': prefix, 'suggestions': get_suggestions(prefix, limit)}
+            suggest_cache.set(cache_params, payload)
+
+        response = Response(payload)
+        response['X-Cache'] = cache_status
+        return response
+
+
+class SearchCacheStatsView(views.APIView):
+    """
+    API view for inspecting the search result cache.
+    """
+    permission_classes = [permissions.IsAdminUser]
+
+    @extend_schema(
+        summary="Get search cache statistics",
+        description="Get hit/miss counters for the search result cache (admin only)."
+    )
+    def get(self, request):
+        return Response(search_cache.stats())
+
+
+class SearchQueryStatsView(views.APIView):
+    """
+    API view for browsing aggregated search queries.
+    """
+    permission_classes = [permissions.IsAdminUser]
+
+    # Sort option -> ordering of the aggregated rows
+    ORDERINGS = {
+        'searches': ('-searches', 'query'),
+        'zero_results': ('-zero_results', '-searches', 'query'),
+        'latency': ('-avg_latency_ms', 'query'),
+    }
+
+    @extend_schema(
+        summary="Get search query statistics",
+        description=(
+            "Get normalized search queries with their search count, zero-result "
+            "rate, cache hit rate, average result count and latency, summed over "
+            "the last few days (admin only)."
+        ),
+        parameters=[
+            OpenApiParameter(name='days', description='Number of days to include, counting today', required=False, type=int),
+            OpenApiParameter(name='sort', description='Sort order', required=False, type=str, enum=['searches', 'zero_results', 'latency']),
+            OpenApiParameter(name='zero_results_only', description='Only include queries that returned no results at least once', required=False, type=bool),
+            OpenApiParameter(name='page', description='Page number', required=False, type=int),
+            OpenApiParameter(name='limit', description='Results per page', required=False, type=int),
+        ],
+        responses={200: SearchQueryStatsSerializer(many=True)}
+    )
+    def get(self, request):
+        serializer = SearchQueryStatsParamsSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+
+        since = timezone.now().date() - timedelta(days=params['days'] - 1)
+        queryset = SearchQueryStats.objects.filter(date__gte=since).values('query').annotate(
+            searches=Sum('search_count'),
+            zero_results=Sum('zero_result_count'),
+            cache_hits=Sum('cache_hit_count'),
+            results=Sum('total_results'),
+            latency=Sum('total_latency_ms'),
+            peak_latency_ms=Max('max_latency_ms'),
+        ).annotate(
+            zero_result_rate=Cast(F('zero_results'), FloatField()) / F('searches'),
+            cache_hit_rate=Cast(F('cache_hits'), FloatField()) / F('searches'),
+            avg_results=Cast(F('results'), FloatField()) / F('searches'),
+            avg_latency_ms=F('latency') / F('searches'),
+        )
+
+        if params['zero_results_only']:
+            queryset = queryset.filter(zero_results__gt=0)
+
+        queryset = queryset.order_by(*self.ORDERINGS[params['sort']])
 
-        # Paginate results
         from common.pagination import StandardResultsSetPagination
         paginator = StandardResultsSetPagination()
         page = paginator.paginate_queryset(queryset, request)
-
-        if page is not None:
-            serializer = ServerSearchResultSerializer(page, many=True, context={'request': request})
-            return paginator.get_paginated_response(serializer.data)
-
-        serializer = ServerSearchResultSerializer(queryset, many=True, context={'request': request})
-        return Response({'data': serializer.data})
+        serializer = SearchQueryStatsSerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
 
 
 class RecommendationsView(views.APIView):
@@ -131,73 +388,72 @@ class RecommendationsView(views.APIView):
         responses={200: ServerRecommendationSerializer(many=True)}
     )
     def get(self, request):
-        # Get parameters
-        server_type = request.query_params.get('type')
-        limit = int(request.query_params.get('limit', 5))
-
-        # Get user preferences
-        try:
-            preferences = UserPreference.objects.get(user=request.user)
-        except UserPreference.DoesNotExist:
-            preferences = UserPreference.objects.create(user=request.user)
-
-        # Get servers the user has interacted with
-        used_server_ids = ServerUsage.objects.filter(
-            user=request.user
-        ).values_list('server_id', flat=True).distinct()
-
-        # Get servers with the same tags as the user's preferred tags
-        tag_based = []
-        if preferences.preferred_tags:
-            tag_query = Q()
-            for tag in preferences.preferred_tags:
-                tag_query |= Q(tags__contains=[tag])
-
-            tag_based = Server.objects.filter(tag_query)
-
-            if server_type:
-                tag_based = tag_based.filter(types__contains=[server_type])
+        # Validate parameters
+        serializer = RecommendationParamsSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        server_type = serializer.validated_data.get('type')
+        limit = serializer.validated_data['limit']
 
-            # Exclude servers the user has already used
-            tag_based = tag_based.exclude(id__in=used_server_ids)
+        # Serve from the user's cache until they use a server or change preferences
+        cache_params = {'type': server_type or '', 'limit': limit}
+        versions = (user_version(request.user.id),)
+        payload = recommendation_cache.get(cache_params, versions)
+        cache_status = 'HIT'
 
-            # Exclude servers the user has explicitly excluded
-            tag_based = tag_based.exclude(id__in=preferences.excluded_servers.all())
+        if payload is None:
+            cache_status = 'MISS'
 
-            # Annotate with recommendation reason
-            for server in tag_based:
-                server.recommendation_reason = "Based on your preferred tags"
+            # Get user preferences
+            preferences, _ = UserPreference.objects.get_or_create(user=request.user)
 
-        # Get popular servers the user hasn't used yet
-        popular = Server.objects.order_by('-usage_count')
+            recommendations = recommend_servers(
+                request.user,
+                preferences,
+                server_type=server_type,
+                limit=limit
+            )
 
-        if server_type:
-            popular = popular.filter(types__contains=[server_type])
+            serializer = ServerRecommendationSerializer(recommendations, many=True, context={'request': request})
+            payload = {'data': serializer.data}
+            recommendation_cache.set(cache_params, payload, versions)
 
-        # Exclude servers the user has already used
-        popular = popular.exclude(id__in=used_server_ids)
+        response = Response(payload)
+        response['X-Cache'] = cache_status
+        return response
 
-        # Exclude servers the user has explicitly excluded
-        popular = popular.exclude(id__in=preferences.excluded_servers.all())
 
-        # Annotate with recommendation reason
-        for server in popular:
-            server.recommendation_reason = "Popular among users"
+class AlsoUsedView(views.APIView):
+    """
+    API view for servers that users of a given server also use.
+    """
+    permission_classes = [permissions.AllowAny]
 
-        # Combine recommendations, prioritizing tag-based
-        recommendations = list(tag_based)
+    @extend_schema(
+        summary="Get servers also used with a server",
+        description="Get servers most often used by the same users as the given server, from neighbours precomputed nightly.",
+        parameters=[
+            OpenApiParameter(name='limit', description='Maximum number of servers to return', required=False, type=int),
+        ],
+        responses={200: ServerRecommendationSerializer(many=True)}
+    )
+    def get(self, request, server_id):
+        serializer = AlsoUsedParamsSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
 
-        # Add popular servers until we reach the limit
-        for server in popular:
-            if len(recommendations) >= limit:
-                break
-            if server not in recommendations:
-                recommendations.append(server)
+        # One indexed lookup on (server, rank), joined to the neighbour servers
+        neighbors = ServerNeighbor.objects.filter(
+            server_id=server_id
+        ).select_related('neighbor').defer(
+            'neighbor__search_vector'
+        ).order_by('rank')[:serializer.validated_data['limit']]
 
-        # Limit to requested number
-        recommendations = recommendations[:limit]
+        servers = []
+        for neighbor in neighbors:
+            server = neighbor.neighbor
+            server.recommendation_reason = "Users of this server also use this"
+            servers.append(server)
 
-        serializer = ServerRecommendationSerializer(recommendations, many=True, context={'request': request})
+        serializer = ServerRecommendationSerializer(servers, many=True, context={'request': request})
         return Response({'data': serializer.data})
 
 
@@ -221,49 +477,43 @@ class PopularServersView(views.APIView):
         # Validate parameters
         serializer = PopularServersParamsSerializer(data=request.query_params)
         serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+
+        cache_params = popular_cache_params(params)
+        payload = popular_cache.get(cache_params)
+        cache_status = 'HIT'
+
+        if payload is None:
+            cache_status = 'MISS'
+            payload = self.get_results(request, params)
+            popular_cache.set(cache_params, payload)
+
+        response = Response(payload)
+        response['X-Cache'] = cache_status
+        return response
 
+    def get_results(self, request, params):
+        """Rank the servers and return the serialized response payload."""
         # Get parameters
-        server_type = serializer.validated_data.get('type')
-        period = serializer.validated_data.get('period', 'week')
-        limit = serializer.validated_data.get('limit', 10)
+        server_type = params.get('type')
+        period = params.get('period', 'week')
+        limit = params.get('limit', 10)
 
-        # Start with all servers
-        queryset = Server.objects.all()
+        # Start with all servers whose URL has not failed validation
+        queryset = Server.objects.defer('search_vector').exclude(
+            validation_status=Server.VALIDATION_INVALID
+        )
 
         # Apply type filter if provided
         if server_type:
             queryset = queryset.filter(types__contains=[server_type])
 
-        # Calculate popularity based on usage and ratings for the specified period
         if period != 'all_time':
-            period_start = None
-            if period == 'day':
-                period_start = timezone.now() - timedelta(days=1)
-            elif period == 'week':
-                period_start = timezone.now() - timedelta(days=7)
-            elif period == 'month':
-                period_start = timezone.now() - timedelta(days=30)
-
-            # Get usage counts for the period
-            recent_usage = ServerUsage.objects.filter(
-                created_at__gte=period_start
-            ).values('server').annotate(
-                recent_count=Count('id')
-            )
-
-            # Create a mapping of server_id to recent usage count
-            usage_dict = {u['server']: u['recent_count'] for u in recent_usage}
-
-            # Annotate servers with their recent usage count
-            for server in queryset:
-                server.recent_usage = usage_dict.get(server.id, 0)
-
-            # Sort by recent usage and rating
-            queryset = sorted(
-                queryset,
-                key=lambda s: (s.recent_usage, s.rating),
-                reverse=True
-            )
+            # Sort by the usage window maintained in ServerPopularity, then
+            # rating. Every server has a popularity row, so the filter only
+            # turns the join into an inner one the window index can serve
+            field = f'popularity__{POPULARITY_FIELDS[period]}'
+            queryset = queryset.filter(**{f'{field}__gte': 0}).order_by(f'-{field}', '-rating')
         else:
             # For all time, sort by total usage count and rating
             queryset = queryset.order_by('-usage_count', '-rating')
@@ -272,6 +522,49 @@ class PopularServersView(views.APIView):
         queryset = queryset[:limit]
 
         serializer = ServerSearchResultSerializer(queryset, many=True, context={'request': request})
+        return {'data': serializer.data}
+
+
+class TrendingServersView(views.APIView):
+    """
+    API view for getting MCP servers whose usage is accelerating.
+    """
+    permission_classes = [permissions.AllowAny]
+
+    @extend_schema(
+        summary="Get trending MCP servers",
+        description=(
+            "Get servers whose recent usage rate is rising fastest relative to "
+            "their long-term rate. Scores are refreshed every few minutes."
+        ),
+        parameters=[
+            OpenApiParameter(name='type', description='Filter by server type', required=False, type=str),
+            OpenApiParameter(name='limit', description='Maximum number of servers to return', required=False, type=int),
+        ],
+        responses={200: TrendingServerSerializer(many=True)}
+    )
+    def get(self, request):
+        serializer = TrendingServersParamsSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+
+        server_type = serializer.validated_data.get('type')
+        limit = serializer.validated_data['limit']
+
+        # Top-k read of the stored scores through the trend_score index
+        queryset = Server.objects.defer('search_vector').filter(
+            trend__trend_score__gt=0
+        ).exclude(
+            validation_status=Server.VALIDATION_INVALID
+        ).annotate(
+            trend_score=F('trend__trend_score')
+        )
+
+        if server_type:
+            queryset = queryset.filter(types__contains=[server_type])
+
+        queryset = queryset.order_by('-trend_score', 'id')[:limit]
+
+        serializer = TrendingServerSerializer(queryset, many=True, context={'request': request})
         return Response({'data': serializer.data})
 
 
@@ -294,7 +587,10 @@ class ServerUsageHistoryView(generics.ListAPIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
-        return ServerUsage.objects.filter(user=self.request.user)
+        # The serializer reads the server name of every record
+        return ServerUsage.objects.filter(user=self.request.user).select_related(
+            'server'
+        ).defer('server__search_vector')
 
 
 class ServerUsageCreateView(generics.CreateAPIView):
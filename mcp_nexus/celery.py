@@ -1,4 +1,5 @@
 import os
+from datetime import timedelta
 from celery import Celery
 from celery.schedules import crontab
 
@@ -36,6 +37,43 @@ app.conf.beat_schedule = {
         'task': 'webhooks.tasks.clean_old_webhook_deliveries',
         'schedule': crontab(hour=4, minute=0, day_of_week=2),  # Run at 4:00 AM every Tuesday
     },
+    'flush-search-history': {
+        'task': 'discovery.tasks.flush_search_history',
+        'schedule': timedelta(seconds=5),  # Run every 5 seconds
+        'options': {'expires': 5},
+    },
+    'prune-search-history-daily': {
+        'task': 'discovery.tasks.prune_search_history',
+        'schedule': crontab(hour=4, minute=30),  # Run at 4:30 AM
+    },
+    'flush-usage-counts': {
+        'task': 'servers.tasks.flush_usage_counts',
+        'schedule': timedelta(seconds=10),  # Run every 10 seconds
+        'options': {'expires': 10},
+    },
+    'update-semantic-index': {
+        'task': 'discovery.tasks.update_semantic_index',
+        'schedule': timedelta(seconds=30),  # Run every 30 seconds
+        'options': {'expires': 30},
+    },
+    'update-server-popularity': {
+        'task': 'discovery.tasks.update_server_popularity',
+        'schedule': timedelta(minutes=5),  # Run every 5 minutes
+        'options': {'expires': 300},
+    },
+    'score-trending-servers': {
+        'task': 'discovery.tasks.score_trending_servers',
+        'schedule': timedelta(minutes=5),  # Run every 5 minutes
+        'options': {'expires': 300},
+    },
+    'compute-server-neighbors-daily': {
+        'task': 'discovery.tasks.compute_server_neighbors',
+        'schedule': crontab(hour=0, minute=30),  # Run at 12:30 AM
+    },
+    'rebuild-semantic-index-daily': {
+        'task': 'discovery.tasks.rebuild_semantic_index',
+        'schedule': crontab(hour=5, minute=0),  # Run at 5:00 AM
+    },
 }
 
 
@@ -54,6 +54,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
 
     # Third-party apps
     'rest_framework',
@@ -134,10 +135,11 @@ else:
     }
 
 # Cache
+REDIS_URL = os.environ.get('REDIS_URL', 'redis://localhost:6379/0')
 CACHES = {
     'default': {
         'BACKEND': 'django.core.cache.backends.redis.RedisCache',
-        'LOCATION': os.environ.get('REDIS_URL', 'redis://localhost:6379/0'),
+        'LOCATION': REDIS_URL,
     }
 }
 
@@ -180,6 +182,10 @@ AUTH_PASSWORD_VALIDATORS = [
 # Authentication
 AUTH_USER_MODEL = 'authentication.User'
 
+# Paginated results above this many rows report the query planner's estimate
+# instead of an exact COUNT(*) (common.pagination.EstimatedCountPagination)
+PAGINATION_ESTIMATE_THRESHOLD = 100000
+
 # REST Framework
 REST_FRAMEWORK = { # type: ignore
     'DEFAULT_AUTHENTICATION_CLASSES': (
@@ -288,6 +294,94 @@ VERIFICATION_CHECK_INTERVAL = timedelta(hours=12)
 # Analytics settings
 ANALYTICS_RETENTION_DAYS = 90
 
+# Search settings
+# Text search configuration used for Server.search_vector. The database trigger
+# that maintains the column (servers migration 0002) uses the same value.
+SEARCH_CONFIG = 'english'
+# Seconds a cached search result page is kept; entries are also invalidated
+# whenever the catalog changes.
+SEARCH_CACHE_TIMEOUT = 300
+# Buffered search history is written by discovery.tasks.flush_search_history
+SEARCH_HISTORY_FLUSH_BATCH_SIZE = 1000
+SEARCH_HISTORY_FLUSH_MAX_BATCHES = 20
+# Failed flushes of one batch before it is written entry by entry and the
+# entries that still fail are dropped
+SEARCH_HISTORY_FLUSH_MAX_ATTEMPTS = 5
+# Flushes that cannot reach the database back off, doubling up to this many seconds
+SEARCH_HISTORY_FLUSH_MAX_BACKOFF = 300
+# Per-user search history is pruned daily by discovery.tasks.prune_search_history;
+# the daily per-query rollup (SearchQueryStats) is kept longer
+SEARCH_HISTORY_RETENTION_DAYS = 90
+SEARCH_QUERY_STATS_RETENTION_DAYS = 365
+# Autocomplete suggestions are short-lived; catalog changes also invalidate them
+SUGGEST_CACHE_TIMEOUT = 60
+# Popular server responses; popularity refreshes and catalog changes also
+# invalidate them
+POPULAR_CACHE_TIMEOUT = 300
+# Cache pre-warming (discovery.tasks.prewarm_discovery_caches) runs when a
+# worker starts and CACHE_PREWARM_DELAY seconds after catalog changes
+CACHE_PREWARM_QUERIES = 100
+CACHE_PREWARM_DAYS = 7
+CACHE_PREWARM_DELAY = 30
+CACHE_PREWARM_PAUSE_SECONDS = 0.05
+CACHE_PREWARM_TIME_LIMIT = 300
+# The run stops when this many other database sessions are executing queries
+CACHE_PREWARM_MAX_ACTIVE_CONNECTIONS = 10
+# Host used for absolute links (next_page_url) in pre-warmed responses
+CACHE_PREWARM_HOST = os.environ.get('CACHE_PREWARM_HOST', 'nanda-registry.com')
+
+# Semantic search index (discovery.semantic). It is rebuilt nightly and kept
+# current between builds by discovery.tasks.update_semantic_index.
+SEMANTIC_INDEX_DIR = os.environ.get('SEMANTIC_INDEX_DIR', os.path.join(BASE_DIR, 'var', 'semantic_index'))
+SEMANTIC_DIMENSIONS = 128
+# Nearest neighbours considered per query before filters and pagination
+SEMANTIC_CANDIDATES = 200
+# Cosine similarity below which a semantic match is discarded
+SEMANTIC_MIN_SCORE = 0.1
+SEMANTIC_UPDATE_BATCH_SIZE = 500
+SEMANTIC_INDEX_LOCK_TIMEOUT = 3600
+
+# Server API response cache (servers.cache)
+# Seconds cached server list pages and details are kept. Edits to servers,
+# capabilities, parameters, usage requirements and ratings invalidate them
+# immediately; usage_count is only refreshed when entries expire.
+SERVER_CACHE_TIMEOUT = 300
+
+# Bulk server registration (servers.bulk)
+# Largest batch accepted by POST /servers/bulk/; the import_servers command
+# splits larger files into batches of this size
+SERVER_BULK_MAX_ITEMS = 500
+
+# Server usage counters (servers.counters)
+# Usage events are counted in Redis and added to Server.usage_count by
+# servers.tasks.flush_usage_counts; this is the number of servers per UPDATE
+USAGE_COUNT_FLUSH_BATCH_SIZE = 1000
+
+# Recommendation settings
+# Neighbours kept per server by discovery.tasks.compute_server_neighbors
+RECOMMENDATION_NEIGHBORS = 20
+# Usage history considered when computing neighbours
+RECOMMENDATION_USAGE_WINDOW_DAYS = 180
+# Minimum number of shared users before two servers count as neighbours
+RECOMMENDATION_MIN_CO_USERS = 2
+# Seconds a user's recommendations are cached; new usage records and
+# preference changes also invalidate them
+RECOMMENDATION_CACHE_TIMEOUT = 600
+
+# Popularity settings
+# Most recent daily usage buckets re-aggregated by each popularity update, so
+# events logged late are still counted
+POPULARITY_REFRESH_DAYS = 2
+
+# Trending settings
+# Half-lives of the short- and long-term decayed usage counters compared by
+# discovery.tasks.score_trending_servers
+TRENDING_FAST_HALF_LIFE_HOURS = 6
+TRENDING_SLOW_HALF_LIFE_HOURS = 72
+# Events per hour added to the long-term rate before scaling, so servers with
+# almost no history need a real burst to start trending
+TRENDING_PRIOR_RATE = 1.0
+
 # API Rate Limiting
 REST_FRAMEWORK.update({ # type: ignore
     'DEFAULT_THROTTLE_CLASSES': [
@@ -299,5 +393,6 @@ REST_FRAMEWORK.update({ # type: ignore
         'user': '1000/hour',
         'register_server': '50/day',
         'verify_server': '100/day',
+        'suggest': '120/minute',
     }
 })
\ No newline at end of file
@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class ServersConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'servers'
+
+    def ready(self):
+        # Register cache invalidation signal handlers
+        from . import signals  # noqa: F401
@@ -0,0 +1,162 @@
+import logging
+from celery import group
+from django.db import IntegrityError, transaction
+from django.utils.text import slugify
+from .models import CapabilityParameter, Server, ServerCapability, UsageRequirements
+from .serializers import ServerBulkRegistrationSerializer
+from .signals import servers_bulk_created
+
+logger = logging.getLogger('mcp_nexus')
+
+# Inserts tried before giving up on a batch whose slugs keep being taken
+# by concurrent registrations
+BULK_INSERT_ATTEMPTS = 3
+
+
+def _error(index, errors):
+    return {'index': index, 'status': 'error', 'errors': errors}
+
+
+def validate_server_items(items):
+    """
+    Validate every item of a bulk registration before anything is written.
+
+    Returns ``(accepted, errors)``. ``accepted`` holds ``(index,
+    validated_data)`` pairs, each with its final slug. ``errors`` holds one
+    result per rejected item. Slugs are checked against each other and
+    against existing servers in a single query.
+    """
+    accepted = []
+    errors = []
+
+    for index, item in enumerate(items):
+        serializer = ServerBulkRegistrationSerializer(data=item)
+        if not serializer.is_valid():
+            errors.append(_error(index, serializer.errors))
+            continue
+        data = dict(serializer.validated_data)
+        data['slug'] = data.get('slug') or slugify(data['name'])
+        accepted.append((index, data))
+
+    taken = set(
+        Server.objects.filter(slug__in=[data['slug'] for _, data in accepted])
+        .values_list('slug', flat=True)
+    )
+
+    unique = []
+    for index, data in accepted:
+        if data['slug'] in taken:
+            errors.append(_error(index, {'slug': ['A server with this slug already exists.']}))
+            continue
+        taken.add(data['slug'])
+        unique.append((index, data))
+
+    return unique, errors
+
+
+def _build_rows(data, owner):
+    """Build the unsaved server, capability, parameter and requirement rows of one item."""
+    data.pop('contact_email', None)
+    capabilities_data = data.pop('capabilities', [])
+    usage_requirements_data = data.pop('usage_requirements', None)
+
+    server = Server(owner=owner, **data)
+    capabilities = []
+    parameters = []
+    for capability_data in capabilities_data:
+        parameters_data = capability_data.pop('parameters', [])
+        capability = ServerCapability(server=server, **capability_data)
+        capabilities.append(capability)
+        parameters.extend(
+            CapabilityParameter(capability=capability, **param_data)
+            for param_data in parameters_data
+        )
+
+    requirements = []
+    if usage_requirements_data:
+        requirements.append(UsageRequirements(server=server, **usage_requirements_data))
+
+    return server, capabilities, parameters, requirements
+
+
+def _insert_rows(rows):
+    """Insert the rows of every item with one bulk_create per table, in one transaction."""
+    servers = [server for _, (server, _, _, _) in rows]
+
+    with transaction.atomic():
+        Server.objects.bulk_create(servers)
+        ServerCapability.objects.bulk_create([row for _, item in rows for row in item[1]])
+        CapabilityParameter.objects.bulk_create([row for _, item in rows for row in item[2]])
+        UsageRequirements.objects.bulk_create([row for _, item in rows for row in item[3]])
+
+        # bulk_create sends no post_save, so dependent caches are told here
+        servers_bulk_created.send(sender=Server, servers=servers)
+
+        server_ids = [str(server.id) for server in servers]
+        transaction.on_commit(lambda: queue_verification(server_ids))
+
+
+def register_servers(items, owner):
+    """
+    Register a batch of servers owned by ``owner``.
+
+    Invalid items are reported and skipped; the valid ones are inserted
+    with one ``bulk_create`` per table inside a single transaction, and
+    their verification tasks are queued together once it commits. If a
+    concurrent registration takes one of the slugs after validation, the
+    insert is retried without the items whose slug is now taken. Returns
+    one result per item, in input order, each with its ``index`` and a
+    ``status`` of ``created`` (with the new ``id`` and ``slug``) or
+    ``error`` (with the validation ``errors``).
+    """
+    accepted, errors = validate_server_items(items)
+    rows = [(index, _build_rows(data, owner)) for index, data in accepted]
+
+    for _ in range(BULK_INSERT_ATTEMPTS):
+        if not rows:
+            break
+        try:
+            _insert_rows(rows)
+            break
+        except IntegrityError:
+            taken = set(
+                Server.objects.filter(slug__in=[item[0].slug for _, item in rows])
+                .values_list('slug', flat=True)
+            )
+            if not taken:
+                raise
+            errors.extend(
+                _error(index, {'slug': ['A server with this slug already exists.']})
+                for index, item in rows if item[0].slug in taken
+            )
+            rows = [(index, item) for index, item in rows if item[0].slug not in taken]
+    else:
+        errors.extend(
+            _error(index, {'non_field_errors': ['The server could not be saved, please retry.']})
+            for index, _ in rows
+        )
+        rows = []
+
+    if rows:
+        logger.info(f"Registered {len(rows)} servers in bulk for {owner.email}")
+
+    results = errors + [
+        {'index': index, 'status': 'created', 'id': str(item[0].id), 'slug': item[0].slug}
+        for index, item in rows
+    ]
+    return sorted(results, key=lambda result: result['index'])
+
+
+def queue_verification(server_ids):
+    """Queue the URL probe and initial verification of newly registered servers as one group."""
+    from verification.tasks import initiate_verification
+    from .tasks import validate_server_url
+
+    try:
+        group(
+            task.s(server_id)
+            for server_id in server_ids
+            for task in (validate_server_url, initiate_verification)
+        ).apply_async()
+    except Exception as e:
+        logger.error(f"Error queueing verification for {len(server_ids)} servers: {str(e)}", exc_info=True)
@@ -0,0 +1,69 @@
+from django.conf import settings
+from django.db.models import OuterRef, Subquery
+from django.db.models.functions import Greatest
+from common.cache import VersionedCache
+from .models import CapabilityParameter, Server, ServerCapability, ServerRating, UsageRequirements
+
+# Version group bumped whenever a change can affect server list pages
+SERVERS_VERSION = 'servers'
+
+
+def server_version(server_id):
+    """Name of the version group for one server's detail payload."""
+    return f'server:{server_id}'
+
+
+# Serialized server list pages, keyed by the full query string and base URL
+server_list_cache = VersionedCache(
+    'server_list',
+    timeout=settings.SERVER_CACHE_TIMEOUT,
+    versions=(SERVERS_VERSION,)
+)
+
+# Serialized server details without per-user or counter fields; callers
+# pass the server's own version group. The namespace carries the entry
+# format, bump it whenever the shape of cached entries changes.
+server_detail_cache = VersionedCache(
+    'server_detail:v2',
+    timeout=settings.SERVER_CACHE_TIMEOUT,
+    versions=()
+)
+
+
+def request_cache_params(request):
+    """
+    Build the normalized cache key parameters for a server API request.
+
+    The base URL is included because logo and pagination links are absolute.
+    """
+    return {
+        'base_url': request.build_absolute_uri('/'),
+        'query': {key: sorted(values) for key, values in request.query_params.lists()},
+    }
+
+
+def _latest_change(queryset):
+    """Subquery for the newest ``updated_at`` among a server's related rows."""
+    return Subquery(queryset.order_by('-updated_at').values('updated_at')[:1])
+
+
+def detail_validators(server_id):
+    """
+    Get what a conditional server detail request is answered from.
+
+    Returns the server's ``owner_id``, its ``updated_at`` and a
+    ``last_modified`` covering the capabilities, parameters, usage
+    requirements and ratings shown in the detail, in one query, or None if
+    the server does not exist. Deleting a related row moves the server's
+    ``updated_at`` forward (see ``servers.signals.touch_server``), so
+    ``last_modified`` covers deletions as well.
+    """
+    return Server.objects.filter(pk=server_id).annotate(
+        last_modified=Greatest(
+            'updated_at',
+            _latest_change(ServerCapability.objects.filter(server=OuterRef('pk'))),
+            _latest_change(CapabilityParameter.objects.filter(capability__server=OuterRef('pk'))),
+            _latest_change(UsageRequirements.objects.filter(server=OuterRef('pk'))),
+            _latest_change(ServerRating.objects.filter(server=OuterRef('pk'))),
+        )
+    ).values('owner_id', 'updated_at', 'last_modified').first()
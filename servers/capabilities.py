@@ -0,0 +1,133 @@
+from django.db.models import Q
+from django.utils import timezone
+from .models import CapabilityParameter, ServerCapability
+from .signals import touch_server
+
+# Columns compared and written when a capability or parameter is updated
+CAPABILITY_FIELDS = ['description', 'type', 'examples']
+PARAMETER_FIELDS = ['description', 'type', 'required', 'default']
+
+
+def _changed_fields(instance, data, fields):
+    """
+    Set the fields of ``instance`` that differ from ``data`` and return their names.
+
+    Fields missing from ``data`` are compared with their model default, as
+    they would be if the row were recreated from ``data``.
+    """
+    changed = []
+    for field in fields:
+        value = data[field] if field in data else instance._meta.get_field(field).get_default()
+        if getattr(instance, field) != value:
+            setattr(instance, field, value)
+            changed.append(field)
+    return changed
+
+
+def empty_changes():
+    """Change summary for a sync that changed nothing."""
+    return {
+        'capabilities': {'created': [], 'updated': [], 'deleted': []},
+        'parameters': {'created': [], 'updated': [], 'deleted': []},
+    }
+
+
+def has_changes(changes):
+    """Check whether a change summary records any change."""
+    return any(names for group in changes.values() for names in group.values())
+
+
+def sync_capabilities(server, capabilities_data):
+    """
+    Make a server's capabilities and parameters match ``capabilities_data``.
+
+    Capabilities are matched by name, and parameters by name within their
+    capability. Only the difference is written: one bulk statement per
+    table for each of the deletes, updates and inserts. Unchanged rows keep
+    their primary keys and are not touched. Returns a change summary
+    listing the names of the capabilities and parameters that were
+    created, updated or deleted. Parameters are named
+    ``capability.parameter``.
+
+    Deletes bypass the per-row ``post_delete`` receivers: the server is
+    touched once here, and the caller is expected to send
+    ``server_capabilities_changed`` for the cache and index updates.
+    """
+    changes = empty_changes()
+    now = timezone.now()
+    existing = {
+        capability.name: capability
+        for capability in ServerCapability.objects.filter(server=server).prefetch_related('parameters')
+    }
+
+    new_capabilities = []
+    updated_capabilities = []
+    new_parameters = []
+    updated_parameters = []
+    deleted_parameter_ids = []
+
+    for capability_data in capabilities_data:
+        capability_data = dict(capability_data)
+        parameters_data = capability_data.pop('parameters', [])
+        name = capability_data['name']
+        capability = existing.pop(name, None)
+
+        if capability is None:
+            capability = ServerCapability(server=server, **capability_data)
+            new_capabilities.append(capability)
+            changes['capabilities']['created'].append(name)
+            new_parameters.extend(
+                CapabilityParameter(capability=capability, **param_data)
+                for param_data in parameters_data
+            )
+            changes['parameters']['created'].extend(
+                f"{name}.{param_data['name']}" for param_data in parameters_data
+            )
+            continue
+
+        if _changed_fields(capability, capability_data, CAPABILITY_FIELDS):
+            capability.updated_at = now
+            updated_capabilities.append(capability)
+            changes['capabilities']['updated'].append(name)
+
+        parameters = {parameter.name: parameter for parameter in capability.parameters.all()}
+        for param_data in parameters_data:
+            parameter = parameters.pop(param_data['name'], None)
+            if parameter is None:
+                new_parameters.append(CapabilityParameter(capability=capability, **param_data))
+                changes['parameters']['created'].append(f"{name}.{param_data['name']}")
+            elif _changed_fields(parameter, param_data, PARAMETER_FIELDS):
+                parameter.updated_at = now
+                updated_parameters.append(parameter)
+                changes['parameters']['updated'].append(f"{name}.{parameter.name}")
+
+        for parameter in parameters.values():
+            deleted_parameter_ids.append(parameter.id)
+            changes['parameters']['deleted'].append(f"{name}.{parameter.name}")
+
+    # Capabilities left over were not in the payload
+    for name, capability in existing.items():
+        changes['capabilities']['deleted'].append(name)
+        changes['parameters']['deleted'].extend(
+            f"{name}.{parameter.name}" for parameter in capability.parameters.all()
+        )
+
+    if existing or deleted_parameter_ids:
+        deleted_capability_ids = [capability.id for capability in existing.values()]
+        parameters = CapabilityParameter.objects.filter(
+            Q(id__in=deleted_parameter_ids) | Q(capability_id__in=deleted_capability_ids)
+        )
+        parameters._raw_delete(parameters.db)
+        capabilities = ServerCapability.objects.filter(id__in=deleted_capability_ids)
+        capabilities._raw_delete(capabilities.db)
+        touch_server(server.pk)
+    if updated_capabilities:
+        ServerCapability.objects.bulk_update(updated_capabilities, CAPABILITY_FIELDS + ['updated_at'])
+    if updated_parameters:
+        CapabilityParameter.objects.bulk_update(updated_parameters, PARAMETER_FIELDS + ['updated_at'])
+    if new_capabilities:
+        ServerCapability.objects.bulk_create(new_capabilities)
+    if new_parameters:
+        CapabilityParameter.objects.bulk_create(new_parameters)
+
+    return changes
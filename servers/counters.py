@@ -0,0 +1,146 @@
+import logging
+from django.db import connection as db_connection, transaction
+from django.db.models import F
+from common.redis_client import get_redis_connection
+from .models import Server
+
+logger = logging.getLogger('mcp_nexus')
+
+# Redis hash of server id -> usage events not yet added to Server.usage_count
+USAGE_COUNTS_PENDING_KEY = 'servers:usage_counts:pending'
+
+# Pending counts claimed by a running flush, kept only so they stay visible
+# to pending_usage_counts until the database has them; they are never
+# applied from here
+USAGE_COUNTS_FLUSHING_KEY = 'servers:usage_counts:flushing'
+
+# Held while a flush runs so flushes do not overwrite each other's claim
+USAGE_COUNTS_LOCK_KEY = 'servers:usage_counts:lock'
+
+# Adds a batch of pending counts to their servers in one statement
+FLUSH_USAGE_COUNTS_SQL = """
+UPDATE {servers} AS server
+SET usage_count = server.usage_count + pending.delta
+FROM (VALUES {values}) AS pending (server_id, delta)
+WHERE server.id = pending.server_id
+"""
+
+
+def increment_usage_count(server_id, amount=1):
+    """
+    Count usage of a server without writing to its row.
+
+    The increment is added to a Redis hash and applied to
+    ``Server.usage_count`` by the next flush. If Redis is unavailable the
+    row is incremented directly, so no usage is lost.
+    """
+    try:
+        get_redis_connection().hincrby(USAGE_COUNTS_PENDING_KEY, str(server_id), amount)
+    except Exception as e:
+        logger.warning(f"Could not buffer usage count for server {server_id}: {str(e)}")
+        Server.objects.filter(pk=server_id).update(usage_count=F('usage_count') + amount)
+
+
+def pending_usage_counts(server_ids):
+    """
+    Get the usage not yet flushed for each server, as ``{server_id: count}``.
+
+    Includes counts taken by a flush that is still running. Servers without
+    pending usage are left out; if Redis is unavailable the result is empty.
+    """
+    server_ids = [str(server_id) for server_id in server_ids]
+    if not server_ids:
+        return {}
+
+    try:
+        pipeline = get_redis_connection().pipeline()
+        pipeline.hmget(USAGE_COUNTS_PENDING_KEY, server_ids)
+        pipeline.hmget(USAGE_COUNTS_FLUSHING_KEY, server_ids)
+        pending, flushing = pipeline.execute()
+    except Exception as e:
+        logger.warning(f"Could not read pending usage counts: {str(e)}")
+        return {}
+
+    counts = {}
+    for server_id, buffered, taken in zip(server_ids, pending, flushing):
+        count = int(buffered or 0) + int(taken or 0)
+        if count:
+            counts[server_id] = count
+    return counts
+
+
+def current_usage_count(server_id):
+    """
+    Get a server's usage count as stored plus what is still pending.
+
+    Reads only the counter column, for responses whose other fields are
+    served from the cache. Returns None if the server does not exist.
+    """
+    stored = Server.objects.filter(pk=server_id).values_list('usage_count', flat=True).first()
+    if stored is None:
+        return None
+    return stored + pending_usage_counts([server_id]).get(str(server_id), 0)
+
+
+def flush_usage_counts(batch_size=1000):
+    """
+    Add the pending usage counts to ``Server.usage_count``.
+
+    The pending hash is read and renamed out of the way in one Redis
+    transaction, so new usage keeps buffering and every count is claimed by
+    exactly one flush before it is written. The claimed counts are then
+    written with one ``UPDATE ... FROM (VALUES ...)`` statement per batch,
+    in a single transaction and in server id order. If the write fails the
+    counts are given back for the next flush; a flush that dies after
+    claiming loses its counts rather than having them applied twice.
+    Returns the number of servers updated, or None if another flush is
+    already running.
+    """
+    connection = get_redis_connection()
+    lock = connection.lock(USAGE_COUNTS_LOCK_KEY, timeout=300, blocking_timeout=0)
+    if not lock.acquire():
+        return None
+
+    try:
+        # Left by a flush that died; whether it was applied is unknown
+        connection.delete(USAGE_COUNTS_FLUSHING_KEY)
+        if not connection.exists(USAGE_COUNTS_PENDING_KEY):
+            return 0
+
+        pipeline = connection.pipeline()
+        pipeline.hgetall(USAGE_COUNTS_PENDING_KEY)
+        pipeline.rename(USAGE_COUNTS_PENDING_KEY, USAGE_COUNTS_FLUSHING_KEY)
+        claimed, _ = pipeline.execute()
+
+        counts = sorted(
+            (server_id.decode(), int(delta))
+            for server_id, delta in claimed.items()
+            if int(delta)
+        )
+
+        updated = 0
+        try:
+            with transaction.atomic(), db_connection.cursor() as cursor:
+                for start in range(0, len(counts), batch_size):
+                    batch = counts[start:start + batch_size]
+                    cursor.execute(
+                        FLUSH_USAGE_COUNTS_SQL.format(
+                            servers=Server._meta.db_table,
+                            values=', '.join(['(%s::uuid, %s::integer)'] * len(batch))
+                        ),
+                        [value for row in batch for value in row]
+                    )
+                    updated += cursor.rowcount
+        except Exception:
+            # Give the counts back so the next flush applies them
+            pipeline = connection.pipeline()
+            for server_id, delta in counts:
+                pipeline.hincrby(USAGE_COUNTS_PENDING_KEY, server_id, delta)
+            pipeline.delete(USAGE_COUNTS_FLUSHING_KEY)
+            pipeline.execute()
+            raise
+
+        connection.delete(USAGE_COUNTS_FLUSHING_KEY)
+        return updated
+    finally:
+        lock.release()
@@ -0,0 +1,73 @@
+import json
+import sys
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from servers.bulk import register_servers
+
+
+class Command(BaseCommand):
+    help = 'Register servers from a JSON array or NDJSON file, as POST /servers/bulk/ does'
+
+    def add_arguments(self, parser): # type: ignore
+        parser.add_argument('path', help='File to import, or - for standard input')
+        parser.add_argument('--owner', required=True, help='Email of the user who will own the servers')
+        parser.add_argument(
+            '--format',
+            choices=['json', 'ndjson'],
+            help='Input format (default: ndjson for .ndjson and .jsonl files, json otherwise)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=settings.SERVER_BULK_MAX_ITEMS,
+            help='Servers registered per transaction'
+        )
+
+    def handle(self, *args, **options): # type: ignore
+        try:
+            owner = get_user_model().objects.get(email=options['owner'])
+        except get_user_model().DoesNotExist:
+            raise CommandError(f"No user with email {options['owner']}")
+
+        path = options['path']
+        input_format = options['format'] or (
+            'ndjson' if path.endswith(('.ndjson', '.jsonl')) else 'json'
+        )
+        items = self.read_items(path, input_format)
+        batch_size = options['batch_size']
+
+        created = failed = 0
+        for start in range(0, len(items), batch_size):
+            for result in register_servers(items[start:start + batch_size], owner):
+                if result['status'] == 'created':
+                    created += 1
+                    continue
+                failed += 1
+                self.stderr.write(f"Item {start + result['index']}: {json.dumps(result['errors'])}")
+            self.stdout.write(f'Processed {min(start + batch_size, len(items))}/{len(items)} servers')
+
+        style = self.style.SUCCESS if not failed else self.style.WARNING
+        self.stdout.write(style(f'Registered {created} servers, {failed} failed'))
+
+    def read_items(self, path, input_format):
+        """Load the items to import from ``path``."""
+        try:
+            if path == '-':
+                content = sys.stdin.read()
+            else:
+                with open(path, encoding='utf-8') as handle:
+                    content = handle.read()
+        except OSError as e:
+            raise CommandError(f'Could not read {path}: {e}')
+
+        try:
+            if input_format == 'ndjson':
+                return [json.loads(line) for line in content.splitlines() if line.strip()]
+            items = json.loads(content)
+        except ValueError as e:
+            raise CommandError(f'Could not parse {path} as {input_format}: {e}')
+
+        if not isinstance(items, list):
+            raise CommandError('Expected a JSON array of servers')
+        return items
@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from servers.ratings import reconcile_rating_aggregates
+
+
+class Command(BaseCommand):
+    help = 'Recompute every server\'s rating sum, count, average and per-star histogram from its ratings'
+
+    def handle(self, *args, **options): # type: ignore
+        corrected = reconcile_rating_aggregates()
+        self.stdout.write(self.style.SUCCESS(f'Corrected rating aggregates for {corrected} servers'))
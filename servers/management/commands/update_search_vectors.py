@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+from django.db.models import F
+from servers.models import Server, ServerCapability
+
+
+class Command(BaseCommand):
+    help = 'Recompute the stored full-text search vectors for every server and capability'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Number of rows to update per statement'
+        )
+
+    def handle(self, *args, **options): # type: ignore
+        batch_size = options['batch_size']
+
+        for model, label in ((Server, 'servers'), (ServerCapability, 'capabilities')):
+            ids = list(model.objects.order_by('id').values_list('id', flat=True))
+            total = len(ids)
+
+            for start in range(0, total, batch_size):
+                batch = ids[start:start + batch_size]
+                # Touching an indexed column fires the table's search vector
+                # trigger, so the document definition lives in exactly one place.
+                model.objects.filter(id__in=batch).update(name=F('name'))
+                self.stdout.write(f'Updated {min(start + batch_size, total)}/{total} {label}')
+
+            self.stdout.write(self.style.SUCCESS(f'Rebuilt search vectors for {total} {label}'))
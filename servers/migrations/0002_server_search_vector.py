@@ -0,0 +1,54 @@
+# Generated by Django 5.1.7 on 2026-10-17 09:12
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+# The text search configuration must match settings.SEARCH_CONFIG.
+CREATE_TRIGGER_SQL = """
+CREATE OR REPLACE FUNCTION servers_server_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('english', coalesce(NEW.name, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(NEW.description, '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(NEW.provider, '')), 'C') ||
+        setweight(to_tsvector('english', coalesce(array_to_string(NEW.tags, ' '), '')), 'D');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER servers_server_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF name, description, provider, tags
+    ON servers_server
+    FOR EACH ROW EXECUTE FUNCTION servers_server_search_vector_update();
+"""
+
+DROP_TRIGGER_SQL = """
+DROP TRIGGER IF EXISTS servers_server_search_vector_trigger ON servers_server;
+DROP FUNCTION IF EXISTS servers_server_search_vector_update();
+"""
+
+# Touching an indexed column fires the trigger for existing rows.
+BACKFILL_SQL = "UPDATE servers_server SET name = name;"
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('servers', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='server',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunSQL(CREATE_TRIGGER_SQL, DROP_TRIGGER_SQL),
+        migrations.RunSQL(BACKFILL_SQL, migrations.RunSQL.noop),
+        migrations.AddIndex(
+            model_name='server',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='server_search_vector_idx'),
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.1.7 on 2026-10-17 10:05
+
+import django.contrib.postgres.indexes
+import servers.models
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+# array_to_string() is only STABLE, so it cannot be used in an index
+# expression directly. Tags are plain text, which makes this wrapper safe to
+# declare IMMUTABLE.
+CREATE_FUNCTION_SQL = """
+CREATE OR REPLACE FUNCTION servers_tags_text(varchar[]) RETURNS text AS $$
+    SELECT array_to_string($1, ' ');
+$$ LANGUAGE sql IMMUTABLE PARALLEL SAFE;
+"""
+
+DROP_FUNCTION_SQL = """
+DROP FUNCTION IF EXISTS servers_tags_text(varchar[]);
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('servers', '0002_server_search_vector'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.RunSQL(CREATE_FUNCTION_SQL, DROP_FUNCTION_SQL),
+        migrations.AddIndex(
+            model_name='server',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['name'], name='server_name_trgm_idx', opclasses=['gin_trgm_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='server',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['provider'], name='server_provider_trgm_idx', opclasses=['gin_trgm_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='server',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(servers.models.TagsText('tags'), name='gin_trgm_ops'), name='server_tags_trgm_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='servercapability',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['name'], name='capability_name_trgm_idx', opclasses=['gin_trgm_ops']),
+        ),
+    ]
@@ -0,0 +1,78 @@
+# Generated by Django 5.1.7 on 2026-10-17 11:20
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+# The text search configuration must match settings.SEARCH_CONFIG.
+CREATE_TRIGGERS_SQL = """
+CREATE OR REPLACE FUNCTION servers_capability_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('english', coalesce(NEW.name, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(NEW.description, '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(array_to_string(NEW.examples, ' '), '')), 'C') ||
+        setweight(to_tsvector('english', coalesce((
+            SELECT string_agg(name, ' ')
+            FROM servers_capabilityparameter
+            WHERE capability_id = NEW.id
+        ), '')), 'C');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER servers_capability_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF name, description, examples
+    ON servers_servercapability
+    FOR EACH ROW EXECUTE FUNCTION servers_capability_search_vector_update();
+
+-- Parameter changes touch the owning capability, which fires the trigger above.
+CREATE OR REPLACE FUNCTION servers_capabilityparameter_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        UPDATE servers_servercapability SET name = name WHERE id = OLD.capability_id;
+    END IF;
+    IF TG_OP = 'INSERT' OR (TG_OP = 'UPDATE' AND NEW.capability_id <> OLD.capability_id) THEN
+        UPDATE servers_servercapability SET name = name WHERE id = NEW.capability_id;
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER servers_capabilityparameter_search_vector_trigger
+    AFTER INSERT OR DELETE OR UPDATE OF name, capability_id
+    ON servers_capabilityparameter
+    FOR EACH ROW EXECUTE FUNCTION servers_capabilityparameter_search_vector_update();
+"""
+
+DROP_TRIGGERS_SQL = """
+DROP TRIGGER IF EXISTS servers_capabilityparameter_search_vector_trigger ON servers_capabilityparameter;
+DROP FUNCTION IF EXISTS servers_capabilityparameter_search_vector_update();
+DROP TRIGGER IF EXISTS servers_capability_search_vector_trigger ON servers_servercapability;
+DROP FUNCTION IF EXISTS servers_capability_search_vector_update();
+"""
+
+# Touching an indexed column fires the trigger for existing rows.
+BACKFILL_SQL = "UPDATE servers_servercapability SET name = name;"
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('servers', '0003_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='servercapability',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunSQL(CREATE_TRIGGERS_SQL, DROP_TRIGGERS_SQL),
+        migrations.RunSQL(BACKFILL_SQL, migrations.RunSQL.noop),
+        migrations.AddIndex(
+            model_name='servercapability',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='capability_search_vector_idx'),
+        ),
+    ]
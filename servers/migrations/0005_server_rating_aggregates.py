@@ -0,0 +1,76 @@
+# Generated by Django 5.1.7 on 2026-10-17 07:04
+
+from django.db import migrations, models
+
+
+# Servers without ratings keep the zero defaults.
+BACKFILL_SQL = """
+UPDATE servers_server AS server SET
+    rating_sum = grouped.rating_sum,
+    rating_count = grouped.rating_count,
+    rating_1_count = grouped.rating_1_count,
+    rating_2_count = grouped.rating_2_count,
+    rating_3_count = grouped.rating_3_count,
+    rating_4_count = grouped.rating_4_count,
+    rating_5_count = grouped.rating_5_count,
+    rating = grouped.rating_sum::double precision / grouped.rating_count
+FROM (
+    SELECT server_id,
+           sum(rating) AS rating_sum,
+           count(*) AS rating_count,
+           count(*) FILTER (WHERE rating = 1) AS rating_1_count,
+           count(*) FILTER (WHERE rating = 2) AS rating_2_count,
+           count(*) FILTER (WHERE rating = 3) AS rating_3_count,
+           count(*) FILTER (WHERE rating = 4) AS rating_4_count,
+           count(*) FILTER (WHERE rating = 5) AS rating_5_count
+    FROM servers_serverrating
+    GROUP BY server_id
+) AS grouped
+WHERE server.id = grouped.server_id;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('servers', '0004_capability_search_vector'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='server',
+            name='rating_1_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='server',
+            name='rating_2_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='server',
+            name='rating_3_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='server',
+            name='rating_4_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='server',
+            name='rating_5_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='server',
+            name='rating_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='server',
+            name='rating_sum',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunSQL(BACKFILL_SQL, migrations.RunSQL.noop),
+    ]
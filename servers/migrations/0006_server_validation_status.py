@@ -0,0 +1,29 @@
+# Generated by Django 5.1.7 on 2026-10-17 07:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('servers', '0005_server_rating_aggregates'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='server',
+            name='validation_message',
+            field=models.CharField(blank=True, max_length=255, null=True),
+        ),
+        # Existing servers passed the synchronous URL check at registration
+        migrations.AddField(
+            model_name='server',
+            name='validation_status',
+            field=models.CharField(choices=[('pending_validation', 'Pending Validation'), ('valid', 'Valid'), ('invalid', 'Invalid')], default='valid', max_length=20),
+        ),
+        migrations.AlterField(
+            model_name='server',
+            name='validation_status',
+            field=models.CharField(choices=[('pending_validation', 'Pending Validation'), ('valid', 'Valid'), ('invalid', 'Invalid')], default='pending_validation', max_length=20),
+        ),
+    ]
@@ -0,0 +1,88 @@
+# Generated by Django 5.1.7 on 2026-10-17 09:40
+
+from django.db import migrations
+
+
+# Parameter changes touch each affected capability once per statement, which
+# fires its search vector trigger. Triggers with transition tables can only
+# have one event and no column list, so updates that leave the name and
+# capability alone are filtered out by comparing the old and new rows.
+CREATE_TRIGGERS_SQL = """
+DROP TRIGGER IF EXISTS servers_capabilityparameter_search_vector_trigger ON servers_capabilityparameter;
+
+CREATE OR REPLACE FUNCTION servers_capabilityparameter_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE servers_servercapability SET name = name
+        WHERE id IN (SELECT capability_id FROM new_parameters);
+    ELSIF TG_OP = 'DELETE' THEN
+        UPDATE servers_servercapability SET name = name
+        WHERE id IN (SELECT capability_id FROM old_parameters);
+    ELSE
+        UPDATE servers_servercapability SET name = name
+        WHERE id IN (
+            SELECT capability_id FROM (
+                SELECT old_row.capability_id AS old_capability_id,
+                       new_row.capability_id AS new_capability_id
+                FROM old_parameters AS old_row
+                JOIN new_parameters AS new_row ON new_row.id = old_row.id
+                WHERE new_row.name IS DISTINCT FROM old_row.name
+                   OR new_row.capability_id <> old_row.capability_id
+            ) AS changed,
+            LATERAL (VALUES (old_capability_id), (new_capability_id)) AS affected (capability_id)
+        );
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER servers_capabilityparameter_search_vector_insert_trigger
+    AFTER INSERT ON servers_capabilityparameter
+    REFERENCING NEW TABLE AS new_parameters
+    FOR EACH STATEMENT EXECUTE FUNCTION servers_capabilityparameter_search_vector_update();
+
+CREATE TRIGGER servers_capabilityparameter_search_vector_update_trigger
+    AFTER UPDATE ON servers_capabilityparameter
+    REFERENCING OLD TABLE AS old_parameters NEW TABLE AS new_parameters
+    FOR EACH STATEMENT EXECUTE FUNCTION servers_capabilityparameter_search_vector_update();
+
+CREATE TRIGGER servers_capabilityparameter_search_vector_delete_trigger
+    AFTER DELETE ON servers_capabilityparameter
+    REFERENCING OLD TABLE AS old_parameters
+    FOR EACH STATEMENT EXECUTE FUNCTION servers_capabilityparameter_search_vector_update();
+"""
+
+# Restores the row-level trigger from 0004_capability_search_vector.
+DROP_TRIGGERS_SQL = """
+DROP TRIGGER IF EXISTS servers_capabilityparameter_search_vector_insert_trigger ON servers_capabilityparameter;
+DROP TRIGGER IF EXISTS servers_capabilityparameter_search_vector_update_trigger ON servers_capabilityparameter;
+DROP TRIGGER IF EXISTS servers_capabilityparameter_search_vector_delete_trigger ON servers_capabilityparameter;
+
+CREATE OR REPLACE FUNCTION servers_capabilityparameter_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        UPDATE servers_servercapability SET name = name WHERE id = OLD.capability_id;
+    END IF;
+    IF TG_OP = 'INSERT' OR (TG_OP = 'UPDATE' AND NEW.capability_id <> OLD.capability_id) THEN
+        UPDATE servers_servercapability SET name = name WHERE id = NEW.capability_id;
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER servers_capabilityparameter_search_vector_trigger
+    AFTER INSERT OR DELETE OR UPDATE OF name, capability_id
+    ON servers_capabilityparameter
+    FOR EACH ROW EXECUTE FUNCTION servers_capabilityparameter_search_vector_update();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('servers', '0006_server_validation_status'),
+    ]
+
+    operations = [
+        migrations.RunSQL(CREATE_TRIGGERS_SQL, DROP_TRIGGERS_SQL),
+    ]
@@ -1,11 +1,30 @@
 import uuid
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F, Value
+from django.db.models.functions import Cast, Coalesce, NullIf
 from django.contrib.auth import get_user_model
 from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import SearchVectorField
 from django.utils.text import slugify
 
 User = get_user_model()
 
+# Star values a rating can take
+RATING_STARS = range(1, 6)
+
+
+class TagsText(models.Func):
+    """
+    Space-separated tags as text.
+
+    Wraps the IMMUTABLE servers_tags_text() SQL function (servers migration
+    0003) so the expression can back a trigram index.
+    """
+    function = 'servers_tags_text'
+    output_field = models.TextField()
+
+
 class Server(models.Model):
     """
     Model representing an MCP server registered in the system.
@@ -16,6 +35,15 @@ class Server(models.Model):
         ('tool', 'Tool'),
     ]
 
+    VALIDATION_PENDING = 'pending_validation'
+    VALIDATION_VALID = 'valid'
+    VALIDATION_INVALID = 'invalid'
+    VALIDATION_STATUS_CHOICES = [
+        (VALIDATION_PENDING, 'Pending Validation'),
+        (VALIDATION_VALID, 'Valid'),
+        (VALIDATION_INVALID, 'Invalid'),
+    ]
+
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     name = models.CharField(max_length=255)
     slug = models.SlugField(max_length=255, unique=True)
@@ -43,8 +71,24 @@ class Server(models.Model):
     # Server verification status
     verified = models.BooleanField(default=False)
 
+    # Outcome of the URL reachability probe run after registration
+    validation_status = models.CharField(
+        max_length=20,
+        choices=VALIDATION_STATUS_CHOICES,
+        default=VALIDATION_PENDING
+    )
+    validation_message = models.CharField(max_length=255, blank=True, null=True)
+
     # Rating and usage stats
     rating = models.FloatField(default=0.0)
+    # Rating aggregates, maintained incrementally by ServerRating
+    rating_sum = models.PositiveIntegerField(default=0)
+    rating_count = models.PositiveIntegerField(default=0)
+    rating_1_count = models.PositiveIntegerField(default=0)
+    rating_2_count = models.PositiveIntegerField(default=0)
+    rating_3_count = models.PositiveIntegerField(default=0)
+    rating_4_count = models.PositiveIntegerField(default=0)
+    rating_5_count = models.PositiveIntegerField(default=0)
     uptime = models.FloatField(default=100.0)  # Percentage
     usage_count = models.PositiveIntegerField(default=0)
 
@@ -61,6 +105,11 @@ class Server(models.Model):
     last_checked = models.DateTimeField(auto_now_add=True)
     status_message = models.CharField(max_length=255, blank=True, null=True)
 
+    # Weighted full-text document (name A, description B, provider C, tags D).
+    # Maintained by the servers_server_search_vector_update trigger, so it is
+    # also correct for bulk_create() and queryset update() writes.
+    search_vector = SearchVectorField(null=True, editable=False)
+
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -74,6 +123,11 @@ class Server(models.Model):
             self.slug = slugify(self.name)
         super().save(*args, **kwargs)
 
+    @property
+    def rating_histogram(self):
+        """Number of ratings per star, from the stored aggregates."""
+        return {str(star): getattr(self, f'rating_{star}_count') for star in RATING_STARS}
+
     class Meta:
         ordering = ['-created_at']
         indexes = [
@@ -81,6 +135,11 @@ class Server(models.Model):
             models.Index(fields=['owner']),
             models.Index(fields=['verified']),
             models.Index(fields=['created_at']),
+            GinIndex(fields=['search_vector'], name='server_search_vector_idx'),
+            # Trigram indexes for autocomplete and fuzzy search
+            GinIndex(fields=['name'], name='server_name_trgm_idx', opclasses=['gin_trgm_ops']),
+            GinIndex(fields=['provider'], name='server_provider_trgm_idx', opclasses=['gin_trgm_ops']),
+            GinIndex(OpClass(TagsText('tags'), name='gin_trgm_ops'), name='server_tags_trgm_idx'),
         ]
 
 
@@ -107,6 +166,10 @@ class ServerCapability(models.Model):
         default=list
     )
 
+    # Maintained by a database trigger (servers migration 0004); includes the
+    # names of the capability's parameters
+    search_vector = SearchVectorField(null=True, editable=False)
+
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -118,6 +181,8 @@ class ServerCapability(models.Model):
         indexes = [
             models.Index(fields=['server', 'name']),
             models.Index(fields=['type']),
+            GinIndex(fields=['name'], name='capability_name_trgm_idx', opclasses=['gin_trgm_ops']),
+            GinIndex(fields=['search_vector'], name='capability_search_vector_idx'),
         ]
         unique_together = ['server', 'name']
 
@@ -194,14 +259,50 @@ class ServerRating(models.Model):
         return f"{self.server.name} - {self.user.email} - {self.rating}"
 
     def save(self, *args, **kwargs):
-        """Update the server's average rating when a new rating is added."""
-        super().save(*args, **kwargs)
-
-        # Update the server's average rating
-        ratings = self.server.ratings.all()
-        if ratings.exists():
-            self.server.rating = sum([r.rating for r in ratings]) / ratings.count()
-            self.server.save(update_fields=['rating'])
+        """Save the rating and apply the change to the server's rating aggregates."""
+        with transaction.atomic():
+            previous = None
+            if not self._state.adding:
+                # Lock the row so concurrent edits of one rating apply their deltas in turn
+                previous = ServerRating.objects.select_for_update().filter(
+                    pk=self.pk
+                ).values_list('rating', flat=True).first()
+
+            super().save(*args, **kwargs)
+            if previous != self.rating:
+                self.update_server_aggregates(self.server_id, removed=previous, added=self.rating)
+
+    @staticmethod
+    def update_server_aggregates(server_id, removed=None, added=None):
+        """
+        Apply one rating change to a server's stored aggregates.
+
+        ``removed`` is the star value leaving the aggregates and ``added``
+        the one entering them (either may be None). The server row is
+        updated with a single ``F()`` expression update, so concurrent votes
+        never overwrite each other and the cost does not depend on the
+        number of ratings.
+        """
+        sum_delta = (added or 0) - (removed or 0)
+        count_delta = (added is not None) - (removed is not None)
+        star_deltas = {}
+        for star, delta in ((removed, -1), (added, 1)):
+            if star in RATING_STARS:
+                star_deltas[star] = star_deltas.get(star, 0) + delta
+
+        Server.objects.filter(pk=server_id).update(
+            rating_sum=F('rating_sum') + sum_delta,
+            rating_count=F('rating_count') + count_delta,
+            rating=Coalesce(
+                Cast(F('rating_sum') + sum_delta, models.FloatField())
+                / NullIf(F('rating_count') + count_delta, 0),
+                Value(0.0)
+            ),
+            **{
+                f'rating_{star}_count': F(f'rating_{star}_count') + delta
+                for star, delta in star_deltas.items() if delta
+            }
+        )
 
     class Meta:
         ordering = ['-created_at']
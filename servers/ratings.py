@@ -0,0 +1,68 @@
+import logging
+from django.db import connection
+from .models import Server, ServerRating
+
+logger = logging.getLogger('mcp_nexus')
+
+# Recomputes every server's rating aggregates from one grouped scan of the
+# ratings, touching only the rows whose stored values have drifted
+RECONCILE_SQL = """
+UPDATE {servers} AS server SET
+    rating_sum = totals.rating_sum,
+    rating_count = totals.rating_count,
+    rating_1_count = totals.rating_1_count,
+    rating_2_count = totals.rating_2_count,
+    rating_3_count = totals.rating_3_count,
+    rating_4_count = totals.rating_4_count,
+    rating_5_count = totals.rating_5_count,
+    rating = totals.rating
+FROM (
+    SELECT server.id AS server_id,
+           COALESCE(grouped.rating_sum, 0) AS rating_sum,
+           COALESCE(grouped.rating_count, 0) AS rating_count,
+           COALESCE(grouped.rating_1_count, 0) AS rating_1_count,
+           COALESCE(grouped.rating_2_count, 0) AS rating_2_count,
+           COALESCE(grouped.rating_3_count, 0) AS rating_3_count,
+           COALESCE(grouped.rating_4_count, 0) AS rating_4_count,
+           COALESCE(grouped.rating_5_count, 0) AS rating_5_count,
+           COALESCE(grouped.rating_sum::double precision / grouped.rating_count, 0) AS rating
+    FROM {servers} AS server
+    LEFT JOIN (
+        SELECT server_id,
+               sum(rating) AS rating_sum,
+               count(*) AS rating_count,
+               count(*) FILTER (WHERE rating = 1) AS rating_1_count,
+               count(*) FILTER (WHERE rating = 2) AS rating_2_count,
+               count(*) FILTER (WHERE rating = 3) AS rating_3_count,
+               count(*) FILTER (WHERE rating = 4) AS rating_4_count,
+               count(*) FILTER (WHERE rating = 5) AS rating_5_count
+        FROM {ratings}
+        GROUP BY server_id
+    ) AS grouped ON grouped.server_id = server.id
+) AS totals
+WHERE server.id = totals.server_id
+  AND (server.rating, server.rating_sum, server.rating_count, server.rating_1_count, server.rating_2_count,
+       server.rating_3_count, server.rating_4_count, server.rating_5_count)
+      IS DISTINCT FROM
+      (totals.rating, totals.rating_sum, totals.rating_count, totals.rating_1_count, totals.rating_2_count,
+       totals.rating_3_count, totals.rating_4_count, totals.rating_5_count)
+"""
+
+
+def reconcile_rating_aggregates():
+    """
+    Recompute the stored rating aggregates of every server from its ratings.
+
+    The incremental updates keep the aggregates exact; this repairs them
+    after writes that bypass the model, such as raw SQL or bulk deletes of
+    stale instances. Returns the number of servers that were corrected.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(RECONCILE_SQL.format(
+            servers=Server._meta.db_table,
+            ratings=ServerRating._meta.db_table
+        ))
+        corrected = cursor.rowcount
+
+    logger.info(f"Reconciled rating aggregates, corrected {corrected} servers")
+    return corrected
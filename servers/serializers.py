@@ -1,6 +1,10 @@
 from rest_framework import serializers
+from django.db import transaction
 from django.utils.text import slugify
+from .capabilities import has_changes, sync_capabilities
+from .counters import pending_usage_counts
 from .models import Server, ServerCapability, CapabilityParameter, UsageRequirements, ServerRating
+from .signals import server_capabilities_changed
 
 class CapabilityParameterSerializer(serializers.ModelSerializer):
     """Serializer for capability parameters."""
@@ -16,6 +20,13 @@ class ServerCapabilitySerializer(serializers.ModelSerializer):
         model = ServerCapability
         fields = ['name', 'description', 'type', 'parameters', 'examples']
 
+    def validate_parameters(self, value):
+        """Validate that parameter names are unique within the capability."""
+        names = [parameter['name'] for parameter in value]
+        if len(names) != len(set(names)):
+            raise serializers.ValidationError("Parameter names must be unique")
+        return value
+
     def create(self, validated_data):
         """Create capability with nested parameters."""
         parameters_data = validated_data.pop('parameters', [])
@@ -66,6 +77,13 @@ class ServerSummarySerializer(serializers.ModelSerializer):
                 return request.build_absolute_uri(obj.logo.url)
         return None
 
+def validate_unique_capability_names(value):
+    """Reject capability lists that use a name twice; names are unique per server."""
+    names = [capability['name'] for capability in value]
+    if len(names) != len(set(names)):
+        raise serializers.ValidationError("Capability names must be unique")
+    return value
+
 class ServerRegistrationSerializer(serializers.ModelSerializer):
     """Serializer for server registration."""
     capabilities = ServerCapabilitySerializer(many=True, required=False)
@@ -77,14 +95,24 @@ class ServerRegistrationSerializer(serializers.ModelSerializer):
         fields = [
             'name', 'slug', 'description', 'provider', 'url', 'documentation_url',
             'types', 'tags', 'logo', 'capabilities', 'protocols', 'usage_requirements',
-            'contact_email'
+            'contact_email', 'validation_status'
         ]
+        read_only_fields = ['validation_status']
         extra_kwargs = {
             'slug': {'required': False},
         }
 
     def validate_url(self, value):
-        """Validate that the URL is a valid MCP server."""
+        """
+        Validate that the URL is a valid MCP server.
+
+        The check makes a blocking request, so it only runs here when the
+        client asks for synchronous validation; otherwise the server is
+        saved as pending and servers.tasks.validate_server_url probes it.
+        """
+        if not self.context.get('validate_sync'):
+            return value
+
         from common.utils import validate_mcp_server_url
 
         valid, response = validate_mcp_server_url(value)
@@ -92,6 +120,10 @@ class ServerRegistrationSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError(f"URL does not point to a valid MCP server: {response['error']}")
         return value
 
+    def validate_capabilities(self, value):
+        """Validate that capability names are unique within the server."""
+        return validate_unique_capability_names(value)
+
     def create(self, validated_data):
         """Create a server with nested capabilities and usage requirements."""
         contact_email = validated_data.pop('contact_email', None)
@@ -105,6 +137,10 @@ class ServerRegistrationSerializer(serializers.ModelSerializer):
         # Set the owner to the current user
         validated_data['owner'] = self.context['request'].user
 
+        # The URL was already probed when validating synchronously
+        if self.context.get('validate_sync'):
+            validated_data['validation_status'] = Server.VALIDATION_VALID
+
         # Create the server
         server = Server.objects.create(**validated_data)
 
@@ -122,6 +158,29 @@ class ServerRegistrationSerializer(serializers.ModelSerializer):
 
         return server
 
+class ServerBulkRegistrationSerializer(ServerRegistrationSerializer):
+    """
+    Serializer for one item of a bulk server registration.
+
+    Only validates; servers.bulk inserts the validated items together. The
+    blocking URL check and the per-item slug uniqueness query are left out:
+    each server gets a health check from its verification task, and slugs
+    are checked for the whole batch in one query.
+    """
+    class Meta(ServerRegistrationSerializer.Meta):
+        fields = [
+            'name', 'slug', 'description', 'provider', 'url', 'documentation_url',
+            'types', 'tags', 'capabilities', 'protocols', 'usage_requirements',
+            'contact_email'
+        ]
+        extra_kwargs = {
+            'slug': {'required': False, 'validators': []},
+        }
+
+    def validate_url(self, value):
+        """Accept the URL as is; verification checks it after import."""
+        return value
+
 class ServerUpdateSerializer(serializers.ModelSerializer):
     """Serializer for updating an existing server."""
     capabilities = ServerCapabilitySerializer(many=True, required=False)
@@ -136,41 +195,65 @@ class ServerUpdateSerializer(serializers.ModelSerializer):
             'contact_email'
         ]
 
+    def validate_capabilities(self, value):
+        """Validate that capability names are unique, since updates match them by name."""
+        return validate_unique_capability_names(value)
+
     def update(self, instance, validated_data):
-        """Update a server with nested capabilities and usage requirements."""
+        """
+        Update a server with nested capabilities and usage requirements.
+
+        Only what differs from the stored server is written; capabilities
+        and parameters are synced by name. ``self.changes`` is set to a
+        summary of what changed, empty when the payload matched. The server
+        row is locked and re-read first, so concurrent updates are applied
+        one after the other rather than diffed against the same state.
+        """
+        with transaction.atomic():
+            instance.refresh_from_db(from_queryset=Server.objects.select_for_update())
+            return self._update(instance, validated_data)
+
+    def _update(self, instance, validated_data):
+        """Apply ``validated_data`` to the locked ``instance``."""
+        validated_data.pop('contact_email', None)
         capabilities_data = validated_data.pop('capabilities', None)
         usage_requirements_data = validated_data.pop('usage_requirements', None)
+        changes = {}
 
         # Update the server fields
-        for key, value in validated_data.items():
-            setattr(instance, key, value)
-
-        instance.save()
-
-        # Update capabilities if provided
+        changed_fields = [key for key, value in validated_data.items() if getattr(instance, key) != value]
+        for key in changed_fields:
+            setattr(instance, key, validated_data[key])
+        if changed_fields:
+            instance.save(update_fields=changed_fields + ['updated_at'])
+            changes['fields'] = changed_fields
+
+        # Sync capabilities if provided
         if capabilities_data is not None:
-            # Delete existing capabilities
-            instance.capabilities.all().delete()
-
-            # Create new capabilities
-            for capability_data in capabilities_data:
-                parameters_data = capability_data.pop('parameters', [])
-                capability = ServerCapability.objects.create(server=instance, **capability_data)
-
-                for param_data in parameters_data:
-                    CapabilityParameter.objects.create(capability=capability, **param_data)
+            capability_changes = sync_capabilities(instance, capabilities_data)
+            if has_changes(capability_changes):
+                changes.update(capability_changes)
+                server_capabilities_changed.send(sender=Server, server=instance, changes=capability_changes)
 
         # Update usage requirements if provided
         if usage_requirements_data is not None:
             if hasattr(instance, 'usage_requirements'):
                 # Update existing usage requirements
-                for key, value in usage_requirements_data.items():
-                    setattr(instance.usage_requirements, key, value)
-                instance.usage_requirements.save()
+                requirements = instance.usage_requirements
+                changed_requirements = [
+                    key for key, value in usage_requirements_data.items() if getattr(requirements, key) != value
+                ]
+                for key in changed_requirements:
+                    setattr(requirements, key, usage_requirements_data[key])
+                if changed_requirements:
+                    requirements.save(update_fields=changed_requirements + ['updated_at'])
+                    changes['usage_requirements'] = changed_requirements
             else:
                 # Create new usage requirements
                 UsageRequirements.objects.create(server=instance, **usage_requirements_data)
+                changes['usage_requirements'] = list(usage_requirements_data)
 
+        self.changes = changes
         return instance
 
 class ServerDetailSerializer(serializers.ModelSerializer):
@@ -180,6 +263,7 @@ class ServerDetailSerializer(serializers.ModelSerializer):
     logo_url = serializers.SerializerMethodField()
     owner_email = serializers.SerializerMethodField()
     status = serializers.SerializerMethodField()
+    usage_count = serializers.SerializerMethodField()
 
     class Meta:
         model = Server
@@ -187,7 +271,8 @@ class ServerDetailSerializer(serializers.ModelSerializer):
             'id', 'name', 'slug', 'description', 'provider', 'url', 'documentation_url',
             'types', 'tags', 'logo_url', 'verified', 'rating', 'uptime', 'usage_count',
             'version', 'capabilities', 'protocols', 'usage_requirements', 'owner_email',
-            'is_active', 'last_checked', 'status', 'created_at', 'updated_at'
+            'is_active', 'last_checked', 'status', 'validation_status', 'validation_message',
+            'created_at', 'updated_at'
         ]
         read_only_fields = fields
 
@@ -199,11 +284,15 @@ class ServerDetailSerializer(serializers.ModelSerializer):
                 return request.build_absolute_uri(obj.logo.url)
         return None
 
+    def get_usage_count(self, obj):
+        """Get the usage count, including usage not yet flushed to the database."""
+        return obj.usage_count + pending_usage_counts([obj.id]).get(str(obj.id), 0)
+
     def get_owner_email(self, obj):
         """Get the email of the server owner."""
         # Only return the owner email if the request user is the owner
         request = self.context.get('request')
-        if request and request.user == obj.owner:
+        if request and request.user.pk == obj.owner_id:
             return obj.owner.email
         return None
 
@@ -0,0 +1,98 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import Signal, receiver
+from django.utils import timezone
+from common.cache import bump_version
+from .cache import SERVERS_VERSION, server_version
+from .models import CapabilityParameter, Server, ServerCapability, ServerRating, UsageRequirements
+
+# Server fields not worth invalidating cached payloads for; cached details
+# pick up new values when they expire
+COUNTER_FIELDS = {'usage_count'}
+
+# Sent inside the transaction of a bulk registration, which bypasses
+# post_save; ``servers`` is the list of servers created
+servers_bulk_created = Signal()
+
+# Sent inside the transaction of a capability sync, which writes with bulk
+# operations; ``server`` is the server and ``changes`` the sync's change summary
+server_capabilities_changed = Signal()
+
+
+@receiver([post_save, post_delete], sender=Server)
+def server_changed(sender, instance, update_fields=None, **kwargs):
+    """Invalidate cached list pages and the server's detail."""
+    if update_fields and set(update_fields) <= COUNTER_FIELDS:
+        return
+    bump_version(SERVERS_VERSION)
+    bump_version(server_version(instance.pk))
+
+
+@receiver([post_save, post_delete], sender=ServerCapability)
+@receiver([post_save, post_delete], sender=UsageRequirements)
+def server_part_changed(sender, instance, **kwargs):
+    """Invalidate the owning server's cached detail."""
+    bump_version(server_version(instance.server_id))
+
+
+@receiver([post_save, post_delete], sender=CapabilityParameter)
+def parameter_changed(sender, instance, **kwargs):
+    """Invalidate the cached detail of the server owning the parameter."""
+    server_id = ServerCapability.objects.filter(
+        pk=instance.capability_id
+    ).values_list('server_id', flat=True).first()
+    if server_id is not None:
+        bump_version(server_version(server_id))
+
+
+@receiver([post_save, post_delete], sender=ServerRating)
+def rating_changed(sender, instance, **kwargs):
+    """Invalidate payloads showing the server's rating."""
+    bump_version(SERVERS_VERSION)
+    bump_version(server_version(instance.server_id))
+
+
+def touch_server(server_id):
+    """
+    Move a server's ``updated_at`` forward after one of its related rows is deleted.
+
+    A deleted row leaves no ``updated_at`` behind, so without this the
+    detail's ``Last-Modified`` would not move and ``If-Modified-Since``
+    requests would be answered with a stale 304.
+    """
+    Server.objects.filter(pk=server_id).update(updated_at=timezone.now())
+
+
+@receiver(post_delete, sender=ServerCapability)
+@receiver(post_delete, sender=UsageRequirements)
+@receiver(post_delete, sender=ServerRating)
+def server_part_deleted(sender, instance, **kwargs):
+    """Record the deletion on the owning server."""
+    touch_server(instance.server_id)
+
+
+@receiver(post_delete, sender=CapabilityParameter)
+def parameter_deleted(sender, instance, **kwargs):
+    """Record the deletion on the server owning the parameter."""
+    server_id = ServerCapability.objects.filter(
+        pk=instance.capability_id
+    ).values_list('server_id', flat=True).first()
+    if server_id is not None:
+        touch_server(server_id)
+
+
+@receiver(post_delete, sender=ServerRating)
+def rating_deleted(sender, instance, **kwargs):
+    """Remove a deleted rating from the server's aggregates."""
+    ServerRating.update_server_aggregates(instance.server_id, removed=instance.rating)
+
+
+@receiver(server_capabilities_changed)
+def capabilities_synced(sender, server, changes, **kwargs):
+    """Invalidate the server's cached detail after its capabilities change."""
+    bump_version(server_version(server.pk))
+
+
+@receiver(servers_bulk_created)
+def servers_created_in_bulk(sender, servers, **kwargs):
+    """Invalidate cached list pages after a bulk registration."""
+    bump_version(SERVERS_VERSION)
@@ -0,0 +1,70 @@
+import logging
+import requests
+from celery import shared_task
+from celery.exceptions import Retry
+from django.conf import settings
+from django.db import transaction
+from common.utils import broadcast_status_update, validate_mcp_server_url
+from .counters import flush_usage_counts as apply_pending_usage_counts
+from .models import Server
+
+logger = logging.getLogger('mcp_nexus')
+
+@shared_task
+def flush_usage_counts():
+    """
+    Add buffered usage counts to the servers' usage_count column.
+    """
+    try:
+        updated = apply_pending_usage_counts(settings.USAGE_COUNT_FLUSH_BATCH_SIZE)
+
+        if updated:
+            logger.info(f"Flushed usage counts for {updated} servers")
+
+    except Exception as e:
+        logger.error(f"Error flushing usage counts: {str(e)}", exc_info=True)
+
+
+@shared_task(bind=True, max_retries=4)
+def validate_server_url(self, server_id):
+    """
+    Probe a newly registered server's URL and record the outcome.
+
+    Runs the reachability check that registration used to make inside the
+    request, then pushes the result to the status_updates channel group.
+    Connection errors and timeouts are retried with exponential backoff
+    (30s, 1, 2 and 4 minutes), so a server that is still starting is not
+    marked invalid; the last one is recorded as the outcome.
+    """
+    try:
+        server = Server.objects.get(id=server_id)
+        try:
+            valid, response = validate_mcp_server_url(server.url, raise_transient=True)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            if self.request.retries < self.max_retries:
+                raise self.retry(exc=e, countdown=30 * (2 ** self.request.retries))
+            valid, response = False, {'error': str(e)}
+
+        if valid:
+            server.validation_status = Server.VALIDATION_VALID
+            server.validation_message = response['message']
+        else:
+            server.validation_status = Server.VALIDATION_INVALID
+            server.validation_message = f"URL does not point to a valid MCP server: {response['error']}"[:255]
+        server.save(update_fields=['validation_status', 'validation_message', 'updated_at'])
+
+        update = {
+            'event': 'server.validation',
+            'server_id': str(server.id),
+            'validation_status': server.validation_status,
+            'message': server.validation_message,
+        }
+        transaction.on_commit(lambda: broadcast_status_update(update))
+        logger.info(f"Validated URL of server {server.name} (ID: {server.id}): {server.validation_status}")
+
+    except Retry:
+        raise
+    except Server.DoesNotExist:
+        logger.error(f"Server not found for URL validation: {server_id}")
+    except Exception as e:
+        logger.error(f"Error validating server URL: {str(e)}", exc_info=True)
@@ -1,16 +1,36 @@
+import uuid
+from django.conf import settings
+from django.http import Http404
 from django.shortcuts import get_object_or_404
-from django.db.models import Q
+from django.db import transaction
+from django.db.models import Prefetch, Q
 from rest_framework import viewsets, status, permissions, generics
 from rest_framework import filters as rest_filters
 from rest_framework.decorators import action
+from rest_framework.parsers import JSONParser
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
-from drf_spectacular.utils import extend_schema, extend_schema_view
-
-from .models import Server, ServerRating
+from drf_spectacular.utils import OpenApiParameter, extend_schema, extend_schema_view
+from common.cache import current_version_token
+from common.conditional import conditional_response, make_etag, set_validators
+from common.pagination import OptionalKeysetPagination
+from common.parsers import NDJSONParser
+
+from .bulk import register_servers
+from .cache import (
+    SERVERS_VERSION,
+    detail_validators,
+    request_cache_params,
+    server_detail_cache,
+    server_list_cache,
+    server_version
+)
+from .counters import current_usage_count
+from .models import Server, ServerCapability, ServerRating
 from .serializers import (
     ServerSummarySerializer,
     ServerRegistrationSerializer,
+    ServerBulkRegistrationSerializer,
     ServerUpdateSerializer,
     ServerDetailSerializer,
     ServerRatingSerializer,
@@ -42,7 +62,7 @@ class IsOwnerOrReadOnly(permissions.BasePermission):
             return True
 
         # Write permissions are only allowed to the owner
-        return obj.owner == request.user
+        return obj.owner_id == request.user.pk
 
 @extend_schema_view(
     list=extend_schema(
@@ -55,7 +75,15 @@ class IsOwnerOrReadOnly(permissions.BasePermission):
     ),
     create=extend_schema(
         summary="Register server",
-        description="Register a new MCP server in the decentralized registry."
+        description=(
+            "Register a new MCP server in the decentralized registry. The server is "
+            "saved with validation_status pending_validation and its URL is probed "
+            "in the background; the outcome is pushed to the status WebSocket. Pass "
+            "validate=sync to probe the URL within the request instead."
+        ),
+        parameters=[
+            OpenApiParameter(name='validate', description="Set to 'sync' to validate the URL before responding", required=False, type=str, enum=['sync']),
+        ]
     ),
     update=extend_schema(
         summary="Update server",
@@ -81,15 +109,16 @@ class ServerViewSet(viewsets.ModelViewSet):
     ordering_fields = ['name', 'created_at', 'rating', 'uptime']
     ordering = ['-created_at']
     lookup_field = 'id'
+    pagination_class = OptionalKeysetPagination
 
     def get_permissions(self):
         """
         Custom permissions:
-        - Create: Must be authenticated
+        - Create/Bulk: Must be authenticated
         - Update/Delete: Must be owner
         - List/Retrieve: Any user can access
         """
-        if self.action == 'create':
+        if self.action in ['create', 'bulk']:
             permission_classes = [permissions.IsAuthenticated]
         elif self.action in ['update', 'partial_update', 'destroy']:
             permission_classes = [permissions.IsAuthenticated, IsOwnerOrReadOnly]
@@ -104,8 +133,25 @@ class ServerViewSet(viewsets.ModelViewSet):
         - tags: Filter by tags
         - verified: Filter by verification status
         - search: Search by name, description, provider, and tags
+
+        Related objects are loaded up front for the serializer each action
+        uses, so the number of queries does not grow with the result size.
         """
-        queryset = Server.objects.all()
+        if self.action == 'list':
+            # The summary serializer only reads server columns. Servers whose
+            # URL failed validation are not listed; they can still be fetched
+            # by id, and their owners still see them under servers/me/
+            queryset = Server.objects.defer('search_vector').exclude(
+                validation_status=Server.VALIDATION_INVALID
+            )
+        elif self.action in ['retrieve', 'update', 'partial_update']:
+            queryset = Server.objects.defer('search_vector').select_related(
+                'owner', 'usage_requirements'
+            ).prefetch_related(
+                Prefetch('capabilities', queryset=ServerCapability.objects.prefetch_related('parameters'))
+            )
+        else:
+            queryset = Server.objects.all()
 
         # Get query parameters
         server_type = self.request.query_params.get('type')
@@ -127,6 +173,17 @@ class ServerViewSet(viewsets.ModelViewSet):
 
         return queryset
 
+    def get_keyset_ordering(self):
+        """
+        Keyset pagination follows the requested ``ordering``, with the id as
+        the tie-breaker so the ordering is unique.
+        """
+        if self.action != 'list':
+            # Nested lists such as ratings are ordered by creation time
+            return ['-created_at', 'id']
+        ordering = rest_filters.OrderingFilter().get_ordering(self.request, self.get_queryset(), self)
+        return [field for field in ordering if field.lstrip('-') != 'id'] + ['id']
+
     def get_serializer_class(self):
         """
         Return different serializers based on the action:
@@ -145,6 +202,102 @@ class ServerViewSet(viewsets.ModelViewSet):
             return ServerUpdateSerializer
         return ServerDetailSerializer
 
+    def list(self, request, *args, **kwargs):
+        """
+        List servers, serving repeated page requests from the cache.
+
+        The weak ETag follows the list version, so a client polling an
+        unchanged page gets a 304 without the page being rebuilt. Without
+        the version (the cache is down) no ETag is sent.
+        """
+        token = current_version_token(SERVERS_VERSION)
+        etag = make_etag(token, request.build_absolute_uri(), weak=True) if token else None
+        if etag:
+            not_modified = conditional_response(request, etag)
+            if not_modified is not None:
+                return not_modified
+
+        cache_params = request_cache_params(request)
+        payload = server_list_cache.get(cache_params)
+        cache_status = 'HIT'
+
+        if payload is None:
+            cache_status = 'MISS'
+            payload = super().list(request, *args, **kwargs).data
+            server_list_cache.set(cache_params, payload)
+
+        response = Response(payload)
+        response['X-Cache'] = cache_status
+        return set_validators(response, etag)
+
+    def retrieve(self, request, *args, **kwargs):
+        """
+        Get a server's details, serving the shared payload from the cache.
+
+        The cached payload never includes ``owner_email`` or ``usage_count``;
+        the owner email is filled in per request when the current user owns
+        the server, and the usage count is read fresh. Conditional
+        requests are answered from the server's validators before anything
+        is serialized. The usage count changes without moving
+        ``Last-Modified``, so only the ETag, which is weak and covers the
+        count, is checked; it is left out while the cache is down.
+        """
+        try:
+            server_id = str(uuid.UUID(str(self.kwargs[self.lookup_field])))
+        except ValueError:
+            return super().retrieve(request, *args, **kwargs)
+
+        cache_params = {**request_cache_params(request), 'id': server_id}
+        versions = (server_version(server_id),)
+        entry = server_detail_cache.get(cache_params, versions)
+        cache_status = 'HIT'
+
+        if entry is None:
+            cache_status = 'MISS'
+            validators = detail_validators(server_id)
+            if validators is None:
+                raise Http404
+        else:
+            validators = entry['validators']
+
+        usage_count = current_usage_count(server_id)
+        if usage_count is None:
+            raise Http404
+
+        is_owner = request.user.is_authenticated and request.user.pk == validators['owner_id']
+        token = current_version_token(*versions)
+        etag = make_etag(
+            token, validators['updated_at'], usage_count,
+            request.build_absolute_uri(), is_owner, weak=True
+        ) if token else None
+        not_modified = conditional_response(request, etag)
+        if not_modified is not None:
+            return set_validators(not_modified, etag, validators['last_modified'])
+
+        if entry is None:
+            instance = self.get_object()
+            data = self.get_serializer(instance).data
+            entry = {
+                'payload': {**data, 'owner_email': None, 'usage_count': None},
+                'validators': validators,
+            }
+            server_detail_cache.set(cache_params, entry, versions)
+
+        payload = dict(entry['payload'])
+        payload['usage_count'] = usage_count
+        if is_owner:
+            payload['owner_email'] = request.user.email
+
+        response = Response(payload)
+        response['X-Cache'] = cache_status
+        return set_validators(response, etag, validators['last_modified'])
+
+    def get_serializer_context(self):
+        """Let clients such as CLIs opt in to validating the URL within the request."""
+        context = super().get_serializer_context()
+        context['validate_sync'] = self.request.query_params.get('validate') == 'sync'
+        return context
+
     def perform_create(self, serializer):
         """Create a new server and perform initial verification checks."""
         serializer.save()
@@ -154,18 +307,85 @@ class ServerViewSet(viewsets.ModelViewSet):
         server = serializer.instance
         initiate_verification.delay(str(server.id))
 
+        # Probe the URL outside the request; the result is pushed to status_updates
+        if server.validation_status == Server.VALIDATION_PENDING:
+            from .tasks import validate_server_url
+            server_id = str(server.id)
+            transaction.on_commit(lambda: validate_server_url.delay(server_id))
+
+    def perform_update(self, serializer):
+        """Update a server and notify webhooks of what changed, if anything."""
+        serializer.save()
+
+        if serializer.changes:
+            from webhooks.tasks import trigger_webhooks_for_event
+            payload = {'server_id': str(serializer.instance.id), 'changes': serializer.changes}
+            transaction.on_commit(lambda: trigger_webhooks_for_event.delay('server.updated', payload))
+
+    @extend_schema(
+        summary="Register servers in bulk",
+        description=(
+            "Register a JSON array or NDJSON stream of servers in one request. "
+            "Every item is validated before anything is written; valid items are "
+            "created together and invalid ones are reported per item. Responds "
+            "201 when all items are created, 207 when some fail and 400 when none "
+            "are created."
+        ),
+        request=ServerBulkRegistrationSerializer(many=True)
+    )
+    @action(detail=False, methods=['post'], parser_classes=[JSONParser, NDJSONParser])
+    def bulk(self, request):
+        """
+        Register a batch of servers owned by the current user.
+        """
+        items = request.data
+        if not isinstance(items, list) or not items:
+            return Response(
+                {"message": "Expected a non-empty JSON array or NDJSON stream of servers"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if len(items) > settings.SERVER_BULK_MAX_ITEMS:
+            return Response(
+                {"message": f"At most {settings.SERVER_BULK_MAX_ITEMS} servers can be registered at once"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        results = register_servers(items, request.user)
+        created = sum(1 for result in results if result['status'] == 'created')
+
+        if created == len(results):
+            response_status = status.HTTP_201_CREATED
+        elif created:
+            response_status = status.HTTP_207_MULTI_STATUS
+        else:
+            response_status = status.HTTP_400_BAD_REQUEST
+
+        return Response(
+            {'data': results, 'created': created, 'failed': len(results) - created},
+            status=response_status
+        )
+
     @action(detail=True, methods=['get'], permission_classes=[permissions.AllowAny])
     def ratings(self, request, id=None):
         """
         Get all ratings for a specific server.
+
+        The response includes a summary with the average, the count and the
+        per-star histogram, read from the server's stored aggregates.
         """
         server = self.get_object()
-        ratings = server.ratings.all()
+        ratings = server.ratings.select_related('user').order_by('-created_at', 'id')
 
         page = self.paginate_queryset(ratings)
         if page is not None:
             serializer = ServerRatingSerializer(page, many=True)
-            return self.get_paginated_response(serializer.data)
+            response = self.get_paginated_response(serializer.data)
+            response.data['summary'] = {
+                'average': server.rating,
+                'count': server.rating_count,
+                'histogram': server.rating_histogram,
+            }
+            return response
 
         serializer = ServerRatingSerializer(ratings, many=True)
         return Response(serializer.data)
@@ -0,0 +1,48 @@
+from django.contrib.auth import get_user_model
+from servers.models import CapabilityParameter, Server, ServerCapability
+
+User = get_user_model()
+
+# Result caches are replaced by a dummy backend so every request takes the
+# database path the query budgets are about
+NO_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}}
+
+
+def create_user(label):
+    """Create a user whose email is derived from ``label``."""
+    return User.objects.create_user(email=f'{label}@example.com', password='password')
+
+
+def create_capabilities(server, count, parameters=2, start=0):
+    """Add ``count`` capabilities of ``parameters`` parameters each to ``server``."""
+    for capability_index in range(start, start + count):
+        capability = ServerCapability.objects.create(
+            server=server,
+            name=f'capability_{capability_index}',
+            description='Test capability',
+            type='tool'
+        )
+        for parameter_index in range(parameters):
+            CapabilityParameter.objects.create(
+                capability=capability,
+                name=f'parameter_{parameter_index}',
+                description='Test parameter',
+                type='string'
+            )
+
+
+def create_server(owner, label, capabilities=2, parameters=2, **fields):
+    """Create a server with ``capabilities`` capabilities of ``parameters`` parameters each."""
+    server = Server.objects.create(
+        owner=owner,
+        name=fields.pop('name', f'Server {label}'),
+        slug=f'server-{label}',
+        description=fields.pop('description', f'Test server {label}'),
+        provider='Test Provider',
+        url=f'https://{label}.example.com/mcp',
+        types=fields.pop('types', ['tool']),
+        tags=fields.pop('tags', ['test']),
+        **fields
+    )
+    create_capabilities(server, capabilities, parameters)
+    return server
@@ -0,0 +1,80 @@
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+from common.testing import QueryBudgetMixin
+from discovery.models import ServerNeighbor, ServerUsage, UserPreference
+from .factories import NO_CACHE, create_server, create_user
+
+
+@override_settings(CACHES=NO_CACHE)
+class DiscoveryQueryBudgetTests(QueryBudgetMixin, TestCase):
+    """The discovery endpoints run a fixed number of queries, whatever the data size."""
+
+    query_budgets = {
+        'usage-history': 2,
+        'search': 4,
+        'recommend': 2,
+    }
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = create_user('user')
+        self.owner = create_user('owner')
+        self.client.force_authenticate(self.user)
+
+    def test_usage_history(self):
+        records = []
+
+        def create_rows(count):
+            for _ in range(count):
+                server = create_server(self.owner, f'used-{len(records)}', capabilities=0)
+                records.append(ServerUsage.objects.create(user=self.user, server=server, response_time=42.0))
+
+        def request():
+            response = self.client.get('/api/v1/discovery/history/usage/')
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len(response.data['data']), len(records))
+
+        self.assertEndpointBudget('usage-history', create_rows, request)
+
+    def test_search(self):
+        servers = []
+
+        def create_rows(count):
+            for _ in range(count):
+                servers.append(create_server(
+                    self.owner,
+                    f'weather-{len(servers)}',
+                    name=f'Weather Forecast {len(servers)}',
+                    description='Fetch the weather forecast for any city.',
+                    tags=['weather']
+                ))
+
+        def request():
+            response = self.client.get('/api/v1/discovery/search/', {'q': 'weather', 'limit': 50})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len(response.data['data']), len(servers))
+
+        self.assertEndpointBudget('search', create_rows, request)
+
+    def test_recommendations(self):
+        UserPreference.objects.create(user=self.user, preferred_tags=['weather', 'maps'])
+        used = []
+
+        def create_rows(count):
+            # Each used server has a neighbour to recommend, plus one
+            # server that only matches the preferred tags
+            for _ in range(count):
+                index = len(used)
+                server = create_server(self.owner, f'used-{index}', capabilities=0)
+                neighbor = create_server(self.owner, f'neighbor-{index}', capabilities=0)
+                create_server(self.owner, f'tagged-{index}', capabilities=0, tags=['weather'])
+                ServerUsage.objects.create(user=self.user, server=server, response_time=42.0)
+                ServerNeighbor.objects.create(server=server, neighbor=neighbor, score=0.5, rank=1)
+                used.append(server)
+
+        def request():
+            response = self.client.get('/api/v1/discovery/recommend/', {'limit': 50})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len(response.data['data']), 2 * len(used))
+
+        self.assertEndpointBudget('recommend', create_rows, request)
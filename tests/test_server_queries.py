@@ -0,0 +1,73 @@
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+from common.testing import QueryBudgetMixin
+from servers.models import ServerRating
+from .factories import NO_CACHE, create_capabilities, create_server, create_user
+
+
+@override_settings(CACHES=NO_CACHE)
+class ServerQueryBudgetTests(QueryBudgetMixin, TestCase):
+    """The server endpoints run a fixed number of queries, whatever the data size."""
+
+    query_budgets = {
+        'server-list': 2,
+        'server-retrieve': 5,
+        'server-ratings': 3,
+    }
+
+    def setUp(self):
+        self.client = APIClient()
+        self.owner = create_user('owner')
+
+    def test_list(self):
+        servers = []
+
+        def create_rows(count):
+            for _ in range(count):
+                server = create_server(self.owner, f'listed-{len(servers)}')
+                ServerRating.objects.create(server=server, user=self.owner, rating=4)
+                servers.append(server)
+
+        def request():
+            response = self.client.get('/api/v1/servers/')
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len(response.data['data']), len(servers))
+
+        self.assertEndpointBudget('server-list', create_rows, request)
+
+    def test_retrieve(self):
+        server = create_server(self.owner, 'detail', capabilities=0)
+        self.client.force_authenticate(self.owner)
+        capabilities = [0]
+
+        def create_rows(count):
+            create_capabilities(server, count, parameters=3, start=capabilities[0])
+            capabilities[0] += count
+
+        def request():
+            response = self.client.get(f'/api/v1/servers/{server.id}/')
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.data['owner_email'], self.owner.email)
+            self.assertEqual(len(response.data['capabilities']), capabilities[0])
+
+        self.assertEndpointBudget('server-retrieve', create_rows, request)
+
+    def test_ratings(self):
+        server = create_server(self.owner, 'rated', capabilities=0)
+        ratings = []
+
+        def create_rows(count):
+            for _ in range(count):
+                ratings.append(ServerRating.objects.create(
+                    server=server,
+                    user=create_user(f'rater-{len(ratings)}'),
+                    rating=len(ratings) % 5 + 1
+                ))
+
+        def request():
+            response = self.client.get(f'/api/v1/servers/{server.id}/ratings/')
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.data['summary']['count'], len(ratings))
+            self.assertEqual(len(response.data['data']), len(ratings))
+
+        self.assertEndpointBudget('server-ratings', create_rows, request)
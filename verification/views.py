@@ -8,6 +8,8 @@ from django.http import HttpResponse
 from rest_framework import status, permissions, generics, views
 from rest_framework.response import Response
 from drf_spectacular.utils import extend_schema
+from common.conditional import conditional_response, make_etag, set_validators
+from common.pagination import EstimatedCountPagination
 from common.utils import check_server_health, extract_domain_from_url
 from servers.models import Server
 from servers.views import IsOwnerOrReadOnly
@@ -504,7 +506,13 @@ class VerificationBadgeView(views.APIView):
     def get(self, request, *args, **kwargs):
         # Get the server
         server_id = kwargs.get('server_id')
-        server = get_object_or_404(Server, id=server_id)
+        server = get_object_or_404(Server.objects.only('verified', 'updated_at'), id=server_id)
+
+        # The badge only depends on the verification status
+        etag = make_etag('badge', server.verified)
+        not_modified = conditional_response(request, etag, server.updated_at)
+        if not_modified is not None:
+            return not_modified
 
         # Generate SVG badge
         if server.verified:
@@ -535,7 +543,7 @@ class VerificationBadgeView(views.APIView):
         </svg>
         """
 
-        return HttpResponse(svg, content_type="image/svg+xml")
+        return set_validators(HttpResponse(svg, content_type="image/svg+xml"), etag, server.updated_at)
 
 
 class HealthCheckListView(generics.ListAPIView):
@@ -544,6 +552,8 @@ class HealthCheckListView(generics.ListAPIView):
     """
     serializer_class = HealthCheckSerializer
     permission_classes = [permissions.IsAuthenticated, IsOwnerOrReadOnly]
+    pagination_class = EstimatedCountPagination
+    keyset_ordering = ('-created_at', 'id')
 
     def get_queryset(self):
         server_id = self.kwargs.get('server_id')
@@ -552,4 +562,4 @@ class HealthCheckListView(generics.ListAPIView):
         # Check if the user is the server owner
         self.check_object_permissions(self.request, server)
 
-        return HealthCheck.objects.filter(server=server).order_by('-created_at')
\ No newline at end of file
+        return HealthCheck.objects.filter(server=server).order_by('-created_at', 'id')
\ No newline at end of file
@@ -4,6 +4,7 @@ from rest_framework import status, permissions, viewsets, generics, views
 from rest_framework.response import Response
 from rest_framework.decorators import action
 from drf_spectacular.utils import extend_schema, extend_schema_view
+from common.pagination import OptionalKeysetPagination
 
 from .models import Webhook, WebhookDelivery
 from .serializers import (
@@ -68,6 +69,8 @@ class WebhookViewSet(viewsets.ModelViewSet):
     """
     serializer_class = WebhookSerializer
     permission_classes = [permissions.IsAuthenticated, IsOwnerOrAdmin]
+    pagination_class = OptionalKeysetPagination
+    keyset_ordering = ('-created_at', 'id')
 
     def get_queryset(self):
         """Return webhooks owned by the current user."""
@@ -103,7 +106,7 @@ class WebhookViewSet(viewsets.ModelViewSet):
         Get delivery history for a webhook.
         """
         webhook = self.get_object()
-        deliveries = webhook.deliveries.all()
+        deliveries = webhook.deliveries.order_by('-created_at', 'id')
 
         page = self.paginate_queryset(deliveries)
         if page is not None: